@@ -1,13 +1,53 @@
-from fastapi import FastAPI, Query
-from .models import User, TestResult, TestProgress
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from .models import User, TestResult
 from .db import get_connection
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional
 import json
 from datetime import datetime
+import os
+import time
+from utils.metrics import REGISTRY, API_LATENCY, API_REQUESTS
+from utils.profiler import FORMATS, MAX_DURATION, ProfilerBusy, render_profile, sample_stacks
 
 app = FastAPI()
 
+@app.middleware("http")
+async def collect_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # шаблон маршрута, а не фактический путь — чтобы не плодить метки
+    route = request.scope.get("route")
+    path = getattr(route, "path", "unmatched")
+    API_REQUESTS.inc(method=request.method, path=path, status=response.status_code)
+    API_LATENCY.observe(time.perf_counter() - started, path=path)
+    return response
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return REGISTRY.render()
+
+@app.get("/debug/profile")
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=MAX_DURATION),
+    format: str = Query("collapsed"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """Сэмплирующий профайлер процесса API; доступен только с токеном из PROFILER_TOKEN."""
+    token = os.getenv("PROFILER_TOKEN")
+    if not token or x_admin_token != token:
+        raise HTTPException(status_code=403, detail="forbidden")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format: {', '.join(FORMATS)}")
+    try:
+        stacks = await run_in_threadpool(sample_stacks, seconds)
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="profiling already in progress")
+    media_type = "application/json" if format == "speedscope" else "text/plain"
+    return Response(render_profile(stacks, format), media_type=media_type)
+
 @app.post("/users/")
 def create_or_update_user(user: User):
     conn = get_connection()
@@ -74,6 +114,14 @@ def save_test_result(result: TestResult):
             details TEXT
         )
     """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS test_result_summary (
+            telegram_id BIGINT NOT NULL,
+            profile VARCHAR(255) NOT NULL,
+            tests INT UNSIGNED NOT NULL,
+            PRIMARY KEY (telegram_id, profile)
+        )
+    """)
     cursor.execute(
         """
         INSERT INTO test_results (telegram_id, finished_at, profile, score, details)
@@ -81,6 +129,14 @@ def save_test_result(result: TestResult):
         """,
         (result.telegram_id, result.finished_at, result.profile, result.score, result.details)
     )
+    # сводка для статистики бота (TestResultsManager.SUMMARY_BUMP) — в той же транзакции
+    cursor.execute(
+        """
+        INSERT INTO test_result_summary (telegram_id, profile, tests) VALUES (%s, COALESCE(%s, '-'), 1)
+        ON DUPLICATE KEY UPDATE tests = tests + 1
+        """,
+        (result.telegram_id, result.profile)
+    )
     conn.commit()
     cursor.close()
     conn.close()
@@ -96,67 +152,28 @@ def get_test_results(telegram_id: int = Query(...)):
     conn.close()
     return results
 
-@app.post("/test_progress/")
-def save_test_progress(progress: TestProgress):
-    conn = get_connection()
-    cursor = conn.cursor()
-    # Проверяем, есть ли уже прогресс для этого пользователя
-    cursor.execute("SELECT id FROM test_progress WHERE telegram_id=%s", (progress.telegram_id,))
-    row = cursor.fetchone()
-    if row:
-        # Обновляем
-        cursor.execute(
-            """
-            UPDATE test_progress SET current_scene=%s, all_scenes=%s, profile_scores=%s, profession_scores=%s, lang=%s, updated_at=NOW()
-            WHERE telegram_id=%s
-            """,
-            (
-                progress.current_scene,
-                progress.all_scenes,
-                progress.profile_scores,
-                progress.profession_scores,
-                progress.lang,
-                progress.telegram_id
-            )
-        )
-    else:
-        # Вставляем
-        cursor.execute(
-            """
-            INSERT INTO test_progress (telegram_id, current_scene, all_scenes, profile_scores, profession_scores, lang, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, NOW())
-            """,
-            (
-                progress.telegram_id,
-                progress.current_scene,
-                progress.all_scenes,
-                progress.profile_scores,
-                progress.profession_scores,
-                progress.lang
-            )
-        )
-    conn.commit()
-    cursor.close()
-    conn.close()
-    return {"status": "ok"}
-
+# Прогресс теста ведёт бот: заголовок сессии (test_sessions) и журнал ответов (test_answers),
+# см. TestProgressManager в database.py. API его только читает и закрывает сессию.
 @app.get("/test_progress/")
 def get_test_progress(telegram_id: int = Query(...)):
     conn = get_connection()
     cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM test_progress WHERE telegram_id=%s", (telegram_id,))
-    row = cursor.fetchone()
+    cursor.execute("SELECT * FROM test_sessions WHERE telegram_id=%s", (telegram_id,))
+    session = cursor.fetchone()
+    if session:
+        cursor.execute("SELECT scene_id, option_id FROM test_answers WHERE session_id=%s ORDER BY seq",
+                       (session["session_id"],))
+        session["answers"] = [[row["scene_id"], row["option_id"]] for row in cursor.fetchall()]
     cursor.close()
     conn.close()
-    if row:
-        return row
-    return {}
+    return session or {}
 
 @app.delete("/test_progress/")
 def delete_test_progress(telegram_id: int = Query(...)):
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("DELETE FROM test_progress WHERE telegram_id=%s", (telegram_id,))
+    # ответы остаются в журнале, как при TestProgressManager.delete_progress
+    cursor.execute("DELETE FROM test_sessions WHERE telegram_id=%s", (telegram_id,))
     conn.commit()
     cursor.close()
     conn.close()
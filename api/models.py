@@ -21,13 +21,3 @@ class TestResult(BaseModel):
     profile: Optional[str] = None
     score: Optional[int] = None
     details: Optional[str] = None  # JSON или текст с деталями
-
-class TestProgress(BaseModel):
-    id: Optional[int] = None
-    telegram_id: int
-    current_scene: int
-    all_scenes: str  # JSON-строка со всеми сценами
-    profile_scores: Optional[str] = None  # JSON-строка
-    profession_scores: Optional[str] = None  # JSON-строка
-    lang: Optional[str] = None
-    updated_at: Optional[str] = None  # ISO8601 datetime
\ No newline at end of file
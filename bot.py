@@ -6,25 +6,36 @@ from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 
 # Импорт обработчиков
-from handlers import commands, callbacks, messages, goals, materials, test, registration
+from handlers import admin, commands, callbacks, messages, goals, materials, test, registration
 from config import settings
-from database import db, UserManager, TestProgressManager, TestResultsManager
+from middlewares import register_middlewares, register_request_middlewares
+from utils.logging_config import setup_logging
+from utils.loop_watchdog import watchdog
+from utils.scene_reload import scene_reloader
+from utils.answer_log import answer_log
+from utils.persistence import persistence
+from utils.outcome_space import get_outcome_table
+from utils.metrics import register_fsm_metrics, start_metrics_server
+from database import db, UserManager, TestProgressManager, TestResultsManager, GoalManager
 
 # Загрузка переменных окружения
 load_dotenv()
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Инициализация бота и диспетчера
 bot = Bot(token=settings.BOT_TOKEN)
 storage = MemoryStorage()
 dp = Dispatcher(storage=storage)
+register_fsm_metrics(storage)
+
+# HTTP-сервер метрик (поднимается при старте)
+_metrics_runner = None
 
 
 # Регистрация обработчиков
 def register_handlers(dispatcher):
+    admin.register_handlers(dispatcher)
     commands.register_handlers(dispatcher)
     callbacks.register_handlers(dispatcher)
     goals.register_handlers(dispatcher)
@@ -35,20 +46,43 @@ def register_handlers(dispatcher):
 
 
 async def on_startup():
+    global _metrics_runner
     logger.info("Бот запущен")
-    # Здесь может быть дополнительная инициализация
+    if settings.METRICS_PORT:
+        _metrics_runner = await start_metrics_server(settings.METRICS_HOST, settings.METRICS_PORT)
+    watchdog.start()
+    scene_reloader.start()
+    await UserManager.create_tables()
+    await GoalManager.create_tables()
+    await TestProgressManager.create_tables()
+    await TestResultsManager.create_tables()
+    if settings.ADAPTIVE_TEST:
+        # таблица исходов читается один раз, до приёма апдейтов
+        get_outcome_table()
+    answer_log.start()
 
 
 async def on_shutdown():
     logger.info("Бот остановлен")
-    # Закрытие соединений, очистка ресурсов и т.д.
+    watchdog.stop()
+    scene_reloader.stop()
+    # дописываем накопленные результаты и ответы, пока пул БД ещё открыт
+    await persistence.drain()
+    await answer_log.stop()
+    if _metrics_runner is not None:
+        await _metrics_runner.cleanup()
 
 
 async def main():
+    # Логирование через очередь: запись в stdout/файл — в фоновом потоке
+    setup_logging()
+
     # Подключение к базе данных
     await db.connect()
 
-    # Регистрация обработчиков
+    # Регистрация middleware и обработчиков
+    register_middlewares(dp)
+    register_request_middlewares(bot)
     register_handlers(dp)
 
     # Установка хэндлеров для запуска и завершения
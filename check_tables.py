@@ -1,23 +1,18 @@
 import asyncio
 import aiomysql
 
+from database import db_params
+
 async def check_table_structure():
     print("🔍 Проверка структуры таблиц...")
     
     try:
-        connection = await aiomysql.connect(
-            host='turntable.proxy.rlwy.net',
-            port=11725,
-            user='root',
-            password='obyRyMEAMtDgJsSxGkontTXPZzwJdtFR',
-            db='railway',
-            charset='utf8mb4'
-        )
+        connection = await aiomysql.connect(**db_params, charset='utf8mb4')
         
         async with connection.cursor() as cursor:
             
             # Список таблиц для проверки
-            tables = ['users', 'test_progress', 'test_results', 'goals']
+            tables = ['users', 'test_sessions', 'test_answers', 'test_results', 'test_result_summary', 'goals']
             
             for table_name in tables:
                 print(f"\n📋 Таблица: {table_name}")
@@ -63,7 +58,7 @@ async def check_table_structure():
                     REFERENCED_TABLE_NAME, 
                     REFERENCED_COLUMN_NAME
                 FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE 
-                WHERE TABLE_SCHEMA = 'railway' 
+                WHERE TABLE_SCHEMA = DATABASE() 
                 AND REFERENCED_TABLE_NAME IS NOT NULL
             """)
             
@@ -98,24 +93,27 @@ async def check_compatibility():
             'class_letter', 'gender', 'birth_year', 'city', 
             'language', 'artifacts', 'opened_profiles'
         ],
-        'test_progress': [
-            'id', 'telegram_id', 'current_scene', 'all_scenes',
-            'profile_scores', 'profession_scores', 'lang', 'updated_at'
+        'test_sessions': [
+            'telegram_id', 'session_id', 'lang', 'gender', 'scene_version',
+            'branch', 'started_at', 'updated_at'
+        ],
+        'test_answers': [
+            'session_id', 'seq', 'scene_id', 'option_id', 'ts'
         ],
         'test_results': [
-            'id', 'telegram_id', 'finished_at', 'profile', 'score', 'details'
+            'id', 'telegram_id', 'finished_at', 'profile', 'score', 'details', 'session_id'
+        ],
+        'test_result_summary': [
+            'telegram_id', 'profile', 'tests'
+        ],
+        'goals': [
+            'id', 'telegram_id', 'title', 'description', 'deadline',
+            'priority', 'progress', 'created_at'
         ]
     }
     
     try:
-        connection = await aiomysql.connect(
-            host='turntable.proxy.rlwy.net',
-            port=11725,
-            user='root',
-            password='obyRyMEAMtDgJsSxGkontTXPZzwJdtFR',
-            db='railway',
-            charset='utf8mb4'
-        )
+        connection = await aiomysql.connect(**db_params, charset='utf8mb4')
         
         async with connection.cursor() as cursor:
             
@@ -21,7 +21,52 @@ class Settings(BaseSettings):
     # Настройки логирования
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: str = os.getenv("LOG_FILE", "bot.log")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json или text
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    LOG_DEBUG_SAMPLE_EVERY: int = int(os.getenv("LOG_DEBUG_SAMPLE_EVERY", 10))
     
+    # Защита от двойных нажатий и флуда
+    THROTTLE_RATE_LIMIT: float = float(os.getenv("THROTTLE_RATE_LIMIT", 3))
+    THROTTLE_BURST: int = int(os.getenv("THROTTLE_BURST", 5))
+    THROTTLE_DEDUP_WINDOW: float = float(os.getenv("THROTTLE_DEDUP_WINDOW", 1.5))
+
+    # Трассировка обработчиков
+    SLOW_UPDATE_THRESHOLD_MS: int = int(os.getenv("SLOW_UPDATE_THRESHOLD_MS", 1000))
+    LATENCY_WINDOW: int = int(os.getenv("LATENCY_WINDOW", 1000))
+
+    # Метрики Prometheus (0 — HTTP-эндпоинт бота отключён)
+    METRICS_HOST: str = os.getenv("METRICS_HOST", "0.0.0.0")
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", 9100))
+
+    # Сторож event loop (порог 0 — отключён)
+    LOOP_WATCHDOG_INTERVAL_MS: int = int(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", 100))
+    LOOP_BLOCK_THRESHOLD_MS: int = int(os.getenv("LOOP_BLOCK_THRESHOLD_MS", 250))
+
+    # Горячая перезагрузка сцен: период проверки файлов, сек (0 — отключена)
+    SCENE_RELOAD_INTERVAL: float = float(os.getenv("SCENE_RELOAD_INTERVAL", 10))
+
+    # Журнал ответов теста: период пакетной записи, мс, и размер пачки
+    ANSWER_LOG_FLUSH_MS: int = int(os.getenv("ANSWER_LOG_FLUSH_MS", 200))
+    ANSWER_LOG_BATCH: int = int(os.getenv("ANSWER_LOG_BATCH", 500))
+
+    # Адаптивный тест: персональная ветка заканчивается, как только первое место
+    # больше не может смениться (но не раньше ADAPTIVE_MIN_SCENES ответов в ветке)
+    ADAPTIVE_TEST: bool = os.getenv("ADAPTIVE_TEST", "False").lower() == "true"
+    ADAPTIVE_MIN_SCENES: int = int(os.getenv("ADAPTIVE_MIN_SCENES", 6))
+
+    # Кэш карточек результата теста (записей; 0 — без кэша)
+    RESULT_CARD_CACHE_SIZE: int = int(os.getenv("RESULT_CARD_CACHE_SIZE", 1024))
+    # Кэш экранов коллекции артефактов и карточек профиля (записей на каждый; 0 — без кэша)
+    VIEW_CACHE_SIZE: int = int(os.getenv("VIEW_CACHE_SIZE", 2048))
+    # Результатов на странице истории тестов (сообщение должно укладываться в 4096 символов)
+    STATS_PAGE_SIZE: int = int(os.getenv("STATS_PAGE_SIZE", 3))
+
+    # Хранилище: mysql (DATABASE_URL / MYSQL_*) или встроенная sqlite (локальные прогоны, бенчмарки).
+    # DB_LATENCY_MS — искусственная задержка каждого обращения sqlite, имитирует сетевой round trip
+    DB_BACKEND: str = os.getenv("DB_BACKEND", "mysql")
+    SQLITE_PATH: str = os.getenv("SQLITE_PATH", "data/skillpath.sqlite3")
+    DB_LATENCY_MS: float = float(os.getenv("DB_LATENCY_MS", 0))
+
     # Список администраторов (строка, парсится вручную)
     ADMIN_IDS: str = os.getenv("ADMIN_IDS", "")
      
@@ -1,15 +1,22 @@
 import aiomysql
 import asyncio
+import itertools
 import json
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import os
 from dotenv import load_dotenv
 import re
 import logging
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO)
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+
+from config import settings
+from utils.artifact_registry import get_artifact_registry
+from utils.metrics import DB_POOL_CONNECTIONS
+from utils.tracing import span, DB
+
 logger = logging.getLogger(__name__)
 
 # Загружаем переменные окружения
@@ -44,61 +51,260 @@ else:
         "db": os.getenv("MYSQL_DB")
     }
 
-class Database:
-    def __init__(self):
+class StorageBackend(ABC):
+    """
+    Хранилище за Database. Запросы приходят в диалекте MySQL с плейсхолдерами %s;
+    строки результата — словари. transaction() отдаёт курсор с async execute/fetchone/fetchall.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def connect(self) -> None:
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        ...
+
+    def pool_stats(self) -> Dict[tuple, int]:
+        return {}
+
+    @abstractmethod
+    async def execute(self, query: str, params: tuple = None) -> int:
+        ...
+
+    @abstractmethod
+    async def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        ...
+
+    @abstractmethod
+    async def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    async def fetch_all(self, query: str, params: tuple = None) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def transaction(self):
+        """Асинхронный контекстный менеджер транзакции"""
+
+
+class MySQLBackend(StorageBackend):
+    """MySQL через пул aiomysql"""
+
+    name = "mysql"
+
+    def __init__(self, params: Dict = None):
+        self.params = params or db_params
         self.pool = None
+        # корутины, ожидающие свободного соединения из пула
+        self.waiting = 0
+
+    def pool_stats(self) -> Dict[tuple, int]:
+        """Состояние пула для метрик"""
+        if self.pool is None:
+            return {("waiting",): self.waiting}
+        return {
+            ("size",): self.pool.size,
+            ("free",): self.pool.freesize,
+            ("in_use",): self.pool.size - self.pool.freesize,
+            ("waiting",): self.waiting,
+        }
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Соединение из пула с учётом очереди ожидания"""
+        self.waiting += 1
+        try:
+            conn = await self.pool.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
         
+    @asynccontextmanager
+    async def transaction(self):
+        """Курсор внутри транзакции: commit при выходе, rollback при исключении"""
+        async with self.acquire() as conn:
+            await conn.begin()
+            try:
+                async with conn.cursor(aiomysql.DictCursor) as cursor:
+                    yield cursor
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+
     async def connect(self):
         """Создание пула соединений с базой данных"""
+        self.pool = await aiomysql.create_pool(
+            host=self.params["host"],
+            port=self.params["port"],
+            user=self.params["user"],
+            password=self.params["password"],
+            db=self.params["db"],
+            charset='utf8mb4',
+            autocommit=True,
+            maxsize=10,
+            minsize=1
+        )
+
+    async def close(self):
+        """Закрытие пула соединений"""
+        if self.pool:
+            self.pool.close()
+            await self.pool.wait_closed()
+
+    async def execute(self, query: str, params: tuple = None) -> int:
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, params)
+                return cursor.rowcount
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(query, params_list)
+                return cursor.rowcount
+
+    async def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
+        async with self.acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(query, params)
+                return await cursor.fetchone()
+
+    async def fetch_all(self, query: str, params: tuple = None) -> List[Dict]:
+        async with self.acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(query, params)
+                return await cursor.fetchall()
+
+
+def create_backend(name: str = None) -> StorageBackend:
+    """Хранилище по имени (по умолчанию settings.DB_BACKEND): mysql или sqlite"""
+    name = name or settings.DB_BACKEND
+    if name == "mysql":
+        return MySQLBackend()
+    if name == "sqlite":
+        from utils.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(settings.SQLITE_PATH, latency=settings.DB_LATENCY_MS / 1000)
+    raise ValueError(f"Неизвестное хранилище DB_BACKEND={name!r} (mysql или sqlite)")
+
+
+class Database:
+    def __init__(self, backend: StorageBackend = None):
+        # хранилище выбирается при connect(), если не задано явно
+        self.backend = backend
+        DB_POOL_CONNECTIONS.set_function(self.pool_stats)
+
+    def pool_stats(self) -> Dict[tuple, int]:
+        """Состояние пула для метрик"""
+        return self.backend.pool_stats() if self.backend is not None else {}
+
+    def use(self, backend: StorageBackend) -> Optional[StorageBackend]:
+        """Подменяет хранилище (тесты, бенчмарки); возвращает прежнее"""
+        previous, self.backend = self.backend, backend
+        return previous
+
+    def transaction(self):
+        """Курсор внутри транзакции: commit при выходе, rollback при исключении"""
+        return self.backend.transaction()
+
+    async def connect(self):
+        """Подключение к хранилищу (пул соединений MySQL или встроенная SQLite)"""
+        if self.backend is None:
+            self.backend = create_backend()
         try:
-            self.pool = await aiomysql.create_pool(
-                host=db_params["host"],
-                port=db_params["port"],
-                user=db_params["user"],
-                password=db_params["password"],
-                db=db_params["db"],
-                charset='utf8mb4',
-                autocommit=True,
-                maxsize=10,
-                minsize=1
-            )
-            logger.info("✅ Подключение к базе данных установлено")
+            await self.backend.connect()
+            logger.info(f"✅ Подключение к базе данных установлено ({self.backend.name})")
         except Exception as e:
             logger.error(f"❌ Ошибка подключения к БД: {e}")
             raise
     
     async def close(self):
         """Закрытие пула соединений"""
-        if self.pool:
-            self.pool.close()
-            await self.pool.wait_closed()
+        if self.backend is not None:
+            await self.backend.close()
     
     async def execute_query(self, query: str, params: tuple = None):
         """Выполнение запроса без возврата данных"""
-        async with self.pool.acquire() as conn:
-            async with conn.cursor() as cursor:
-                await cursor.execute(query, params)
-                return cursor.rowcount
+        with span(DB, "execute_query"):
+            return await self.backend.execute(query, params)
     
+    async def execute_many(self, query: str, params_list: List[tuple]):
+        """Один запрос на пачку строк (INSERT ... VALUES разворачивается в многострочную вставку)"""
+        with span(DB, "execute_many"):
+            return await self.backend.execute_many(query, params_list)
+
     async def fetch_one(self, query: str, params: tuple = None):
         """Выполнение запроса с возвратом одной записи"""
-        async with self.pool.acquire() as conn:
-            async with conn.cursor(aiomysql.DictCursor) as cursor:
-                await cursor.execute(query, params)
-                return await cursor.fetchone()
+        with span(DB, "fetch_one"):
+            return await self.backend.fetch_one(query, params)
     
     async def fetch_all(self, query: str, params: tuple = None):
         """Выполнение запроса с возвратом всех записей"""
-        async with self.pool.acquire() as conn:
-            async with conn.cursor(aiomysql.DictCursor) as cursor:
-                await cursor.execute(query, params)
-                return await cursor.fetchall()
+        with span(DB, "fetch_all"):
+            return await self.backend.fetch_all(query, params)
 
 # Создаем глобальный экземпляр базы данных
 db = Database()
 
+def parse_json_list(value) -> list:
+    """Список из JSON-поля users (artifacts, opened_profiles); пустое или битое значение — пустой список"""
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = json.loads(value or '[]')
+    except (TypeError, ValueError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+# --- Версии сводки профиля ---
+# Счётчик записей этого процесса, меняющих карточку профиля (данные пользователя, артефакты, результаты).
+# Кэш карточек держит версию в ключе: любая такая запись делает старую карточку недостижимой.
+_profile_versions: Dict[int, int] = {}
+_profile_clock = itertools.count(1)
+
+
+def profile_version(telegram_id: int) -> int:
+    return _profile_versions.get(telegram_id, 0)
+
+
+def touch_profile(telegram_id: int) -> None:
+    _profile_versions[telegram_id] = next(_profile_clock)
+
+
 class UserManager:
     """Управление пользователями"""
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            telegram_id BIGINT UNIQUE,
+            fio VARCHAR(255),
+            school VARCHAR(255),
+            class_number INT,
+            class_letter VARCHAR(10),
+            gender VARCHAR(10),
+            birth_year INT,
+            city VARCHAR(255),
+            language VARCHAR(20),
+            artifacts TEXT,
+            opened_profiles TEXT
+        )
+        """,
+    )
+
+    @staticmethod
+    async def create_tables() -> None:
+        """Создание таблицы пользователей (если её нет)"""
+        for query in UserManager.SCHEMA:
+            await db.execute_query(query)
     
     @staticmethod
     async def create_user(telegram_id: int, fio: str, **kwargs) -> bool:
@@ -125,6 +331,7 @@ class UserManager:
         
         try:
             await db.execute_query(query, params)
+            touch_profile(telegram_id)
             logger.info(f"✅ Пользователь {telegram_id} создан")
             return True
         except Exception as e:
@@ -148,6 +355,9 @@ class UserManager:
             if key in ['fio', 'school', 'class_number', 'class_letter', 
                       'gender', 'birth_year', 'city', 'language', 'artifacts', 'opened_profiles']:
                 set_clauses.append(f"{key} = %s")
+                if isinstance(value, list):
+                    # JSON-поля artifacts и opened_profiles
+                    value = json.dumps(value, ensure_ascii=False)
                 params.append(value)
         
         if not set_clauses:
@@ -158,80 +368,100 @@ class UserManager:
         
         try:
             rows_affected = await db.execute_query(query, tuple(params))
+            touch_profile(telegram_id)
             return rows_affected > 0
         except Exception as e:
             logger.error(f"❌ Ошибка обновления пользователя: {e}")
             return False
 
 class TestProgressManager:
-    """Управление прогрессом тестирования"""
-    
-    @staticmethod
-    async def save_progress(telegram_id: int, current_scene: str, 
-                           all_scenes: List[str] = None, 
-                           profile_scores: Dict = None,
-                           profession_scores: Dict = None,
-                           lang: str = 'ru') -> bool:
-        """Сохранение прогресса тестирования"""
-        
-        # Проверяем, есть ли уже запись
-        existing = await db.fetch_one(
-            "SELECT id FROM test_progress WHERE telegram_id = %s", 
-            (telegram_id,)
+    """
+    Прогресс тестирования: заголовок сессии (test_sessions, одна строка на пользователя)
+    и журнал ответов (test_answers, только дозапись). Баллы не хранятся —
+    при возобновлении они восстанавливаются прогоном ответов через модель баллов.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS test_sessions (
+            telegram_id BIGINT PRIMARY KEY,
+            session_id CHAR(32) NOT NULL,
+            lang VARCHAR(8) NOT NULL,
+            gender VARCHAR(16),
+            scene_version VARCHAR(16),
+            branch VARCHAR(64),
+            started_at DATETIME NOT NULL,
+            updated_at DATETIME NOT NULL
         )
-        
-        all_scenes_json = json.dumps(all_scenes or [], ensure_ascii=False)
-        profile_scores_json = json.dumps(profile_scores or {}, ensure_ascii=False)
-        profession_scores_json = json.dumps(profession_scores or {}, ensure_ascii=False)
-        
-        if existing:
-            # Обновляем существующую запись
-            query = """
-            UPDATE test_progress 
-            SET current_scene = %s, all_scenes = %s, profile_scores = %s, 
-                profession_scores = %s, lang = %s, updated_at = NOW()
-            WHERE telegram_id = %s
-            """
-            params = (current_scene, all_scenes_json, profile_scores_json, 
-                     profession_scores_json, lang, telegram_id)
-        else:
-            # Создаем новую запись
-            query = """
-            INSERT INTO test_progress (telegram_id, current_scene, all_scenes, 
-                                     profile_scores, profession_scores, lang, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, NOW())
-            """
-            params = (telegram_id, current_scene, all_scenes_json, 
-                     profile_scores_json, profession_scores_json, lang)
-        
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS test_answers (
+            session_id CHAR(32) NOT NULL,
+            seq SMALLINT UNSIGNED NOT NULL,
+            scene_id INT NOT NULL,
+            option_id VARCHAR(16) NOT NULL,
+            ts DATETIME(3) NOT NULL,
+            PRIMARY KEY (session_id, seq)
+        )
+        """,
+    )
+
+    @staticmethod
+    async def create_tables() -> None:
+        """Создание таблиц прогресса (если их нет)"""
+        for query in TestProgressManager.SCHEMA:
+            await db.execute_query(query)
+
+    @staticmethod
+    async def save_session(telegram_id: int, session_id: str, lang: str, gender: str = None,
+                           scene_version: str = None, branch: str = None) -> bool:
+        """Начало сессии или смена ветки: одна строка на пользователя, одним запросом"""
+        query = """
+        INSERT INTO test_sessions (telegram_id, session_id, lang, gender, scene_version, branch,
+                                   started_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, NOW(), NOW())
+        ON DUPLICATE KEY UPDATE
+            started_at = IF(session_id = VALUES(session_id), started_at, NOW()),
+            session_id = VALUES(session_id), lang = VALUES(lang), gender = VALUES(gender),
+            scene_version = VALUES(scene_version), branch = VALUES(branch), updated_at = NOW()
+        """
+        params = (telegram_id, session_id, lang, gender, scene_version, branch)
         try:
             await db.execute_query(query, params)
             return True
         except Exception as e:
-            logger.error(f"❌ Ошибка сохранения прогресса: {e}")
+            logger.error(f"❌ Ошибка сохранения сессии теста: {e}")
             return False
-    
+
+    @staticmethod
+    async def append_answers(rows: List[tuple]) -> None:
+        """
+        Дозапись пачки ответов (session_id, seq, scene_id, option_id, ts).
+        Повтор той же пачки безопасен: (session_id, seq) — первичный ключ.
+        """
+        query = """
+        INSERT IGNORE INTO test_answers (session_id, seq, scene_id, option_id, ts)
+        VALUES (%s, %s, %s, %s, %s)
+        """
+        await db.execute_many(query, rows)
+
     @staticmethod
     async def get_progress(telegram_id: int) -> Optional[Dict]:
-        """Получение прогресса пользователя"""
-        query = "SELECT * FROM test_progress WHERE telegram_id = %s"
-        progress = await db.fetch_one(query, (telegram_id,))
-        
-        if progress:
-            # Парсим JSON поля
-            try:
-                progress['all_scenes'] = json.loads(progress['all_scenes'] or '[]')
-                progress['profile_scores'] = json.loads(progress['profile_scores'] or '{}')
-                progress['profession_scores'] = json.loads(progress['profession_scores'] or '{}')
-            except json.JSONDecodeError:
-                logger.error(f"❌ Ошибка парсинга JSON для пользователя {telegram_id}")
-        
-        return progress
-    
+        """Незавершённая сессия пользователя с ответами по порядку"""
+        session = await db.fetch_one("SELECT * FROM test_sessions WHERE telegram_id = %s", (telegram_id,))
+        if not session:
+            return None
+        rows = await db.fetch_all(
+            "SELECT scene_id, option_id FROM test_answers WHERE session_id = %s ORDER BY seq",
+            (session['session_id'],)
+        )
+        session['answers'] = [[row['scene_id'], row['option_id']] for row in rows]
+        return session
+
     @staticmethod
     async def delete_progress(telegram_id: int) -> bool:
-        """Удаление прогресса (при завершении теста)"""
-        query = "DELETE FROM test_progress WHERE telegram_id = %s"
+        """Закрытие сессии (при завершении теста); ответы остаются в журнале"""
+        query = "DELETE FROM test_sessions WHERE telegram_id = %s"
         try:
             rows_affected = await db.execute_query(query, (telegram_id,))
             return rows_affected > 0
@@ -240,8 +470,89 @@ class TestProgressManager:
             return False
 
 class TestResultsManager:
-    """Управление результатами тестов"""
-    
+    """
+    Управление результатами тестов. Рядом с test_results ведётся сводка test_result_summary
+    (число тестов по профилю на пользователя): статистика и профиль читают агрегаты из неё,
+    а историю — страницами по индексу (telegram_id, id).
+    Сводку увеличивают в той же транзакции, что и вставку результата: save_result, finalize_result
+    и POST /test_results/ в api/main.py; utils.rescore пересобирает её целиком. Результаты,
+    записанные в обход (вручную, старыми версиями API), create_tables находит при старте
+    по расхождению счётчиков и пересобирает сводку.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS test_results (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            telegram_id BIGINT,
+            finished_at DATETIME,
+            profile VARCHAR(255),
+            score INT,
+            details TEXT,
+            session_id CHAR(32),
+            INDEX idx_test_results_user (telegram_id, id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS test_result_summary (
+            telegram_id BIGINT NOT NULL,
+            profile VARCHAR(255) NOT NULL,
+            tests INT UNSIGNED NOT NULL,
+            PRIMARY KEY (telegram_id, profile)
+        )
+        """,
+    )
+    # таблица могла быть создана раньше без индексов и session_id: (запрос, код MySQL «уже есть»)
+    MIGRATIONS = (
+        ("CREATE INDEX idx_test_results_user ON test_results (telegram_id, id)", 1061),
+        ("ALTER TABLE test_results ADD COLUMN session_id CHAR(32)", 1060),
+        # одна строка результата на сессию — повтор finalize_result её не дублирует
+        ("CREATE UNIQUE INDEX uq_test_results_session ON test_results (session_id)", 1061),
+    )
+    SUMMARY_BUMP = """
+    INSERT INTO test_result_summary (telegram_id, profile, tests) VALUES (%s, %s, 1)
+    ON DUPLICATE KEY UPDATE tests = tests + 1
+    """
+    # сверка: сколько результатов учтено в сводке и сколько их на самом деле
+    SUMMARY_CHECK = """
+    SELECT (SELECT COUNT(*) FROM test_results WHERE telegram_id IS NOT NULL) AS results,
+           (SELECT COALESCE(SUM(tests), 0) FROM test_result_summary) AS summarized
+    """
+    # полная пересборка сводки по test_results (первый запуск, после пересчёта профилей)
+    SUMMARY_REBUILD = (
+        "DELETE FROM test_result_summary",
+        """
+        INSERT INTO test_result_summary (telegram_id, profile, tests)
+        SELECT telegram_id, COALESCE(profile, '-'), COUNT(*) FROM test_results
+        WHERE telegram_id IS NOT NULL
+        GROUP BY telegram_id, COALESCE(profile, '-')
+        """,
+    )
+
+    @staticmethod
+    async def create_tables() -> None:
+        """Создание таблиц результатов и сводки; сводка, разошедшаяся с test_results, пересобирается"""
+        for query in TestResultsManager.SCHEMA:
+            await db.execute_query(query)
+        for query, exists in TestResultsManager.MIGRATIONS:
+            try:
+                await db.execute_query(query)
+            except Exception as e:
+                if not e.args or e.args[0] != exists:
+                    raise
+        counts = await db.fetch_one(TestResultsManager.SUMMARY_CHECK)
+        if int(counts['results']) != int(counts['summarized']):
+            logger.warning(f"⚠️ Сводка результатов расходится с test_results "
+                           f"({counts['summarized']} из {counts['results']}), пересборка")
+            await TestResultsManager.rebuild_summary()
+
+    @staticmethod
+    async def rebuild_summary() -> None:
+        with span(DB, "rebuild_summary"):
+            async with db.transaction() as cursor:
+                for query in TestResultsManager.SUMMARY_REBUILD:
+                    await cursor.execute(query)
+
     @staticmethod
     async def save_result(telegram_id: int, profile: str, score: int, 
                          details: Dict = None) -> bool:
@@ -255,13 +566,63 @@ class TestResultsManager:
         params = (telegram_id, profile, score, details_json)
         
         try:
-            await db.execute_query(query, params)
+            async with db.transaction() as cursor:
+                await cursor.execute(query, params)
+                await cursor.execute(TestResultsManager.SUMMARY_BUMP, (telegram_id, profile))
+            touch_profile(telegram_id)
             logger.info(f"✅ Результат сохранен для пользователя {telegram_id}")
             return True
         except Exception as e:
             logger.error(f"❌ Ошибка сохранения результата: {e}")
             return False
     
+    @staticmethod
+    async def finalize_result(telegram_id: int, profile: str, score: int, details: Dict,
+                              artifact: str = None, opened_profile: str = None,
+                              session_id: str = None) -> bool:
+        """
+        Завершение теста одной транзакцией: строка результата, артефакт и открытый профиль
+        пользователя, закрытие сессии прогресса session_id.
+        Возвращает True, если артефакт получен впервые. Ошибки пробрасываются (повторяет вызывающий);
+        повтор уже записанной сессии ничего не меняет — результат уникален по session_id.
+        """
+        with span(DB, "finalize_result"):
+            async with db.transaction() as cursor:
+                await cursor.execute(
+                    "INSERT IGNORE INTO test_results (telegram_id, finished_at, profile, score, details, session_id) "
+                    "VALUES (%s, NOW(), %s, %s, %s, %s)",
+                    (telegram_id, profile, score, json.dumps(details or {}, ensure_ascii=False), session_id)
+                )
+                if cursor.rowcount == 0:
+                    # прошлая попытка закоммитилась, но подтверждение потерялось
+                    return False
+                await cursor.execute(
+                    "SELECT artifacts, opened_profiles FROM users WHERE telegram_id = %s FOR UPDATE",
+                    (telegram_id,)
+                )
+                user = await cursor.fetchone()
+                new_artifact = False
+                if user is not None:
+                    artifacts = parse_json_list(user['artifacts'])
+                    opened_profiles = parse_json_list(user['opened_profiles'])
+                    # артефакт мог быть получен под названием на другом языке
+                    new_artifact = bool(artifact) and not get_artifact_registry().owns(artifacts, artifact)
+                    if new_artifact:
+                        artifacts.append(artifact)
+                    if opened_profile and opened_profile not in opened_profiles:
+                        opened_profiles.append(opened_profile)
+                    await cursor.execute(
+                        "UPDATE users SET artifacts = %s, opened_profiles = %s WHERE telegram_id = %s",
+                        (json.dumps(artifacts, ensure_ascii=False),
+                         json.dumps(opened_profiles, ensure_ascii=False), telegram_id)
+                    )
+                await cursor.execute(TestResultsManager.SUMMARY_BUMP, (telegram_id, profile))
+                # только завершённую сессию: пользователь мог уже начать новую
+                await cursor.execute("DELETE FROM test_sessions WHERE telegram_id = %s AND session_id = %s",
+                                     (telegram_id, session_id))
+        touch_profile(telegram_id)
+        return new_artifact
+
     @staticmethod
     async def get_user_results(telegram_id: int) -> List[Dict]:
         """Получение всех результатов пользователя"""
@@ -282,6 +643,47 @@ class TestResultsManager:
         
         return results
     
+    @staticmethod
+    async def get_summary(telegram_id: int) -> Dict[str, int]:
+        """Число пройденных тестов по профилям, самые частые первыми"""
+        rows = await db.fetch_all(
+            "SELECT profile, tests FROM test_result_summary WHERE telegram_id = %s ORDER BY tests DESC, profile",
+            (telegram_id,)
+        )
+        return {row['profile']: row['tests'] for row in rows}
+
+    @staticmethod
+    async def get_results_page(telegram_id: int, limit: int, before_id: int = None,
+                               after_id: int = None) -> Tuple[List[Dict], bool]:
+        """
+        Страница истории, новые первыми: до limit результатов старше before_id
+        (или новее after_id, если он задан). Второе значение — есть ли ещё результаты
+        дальше в том же направлении. Читается limit + 1 строка по индексу, без OFFSET.
+        """
+        columns = "SELECT id, finished_at, profile, score, details FROM test_results"
+        if after_id is not None:
+            query = f"{columns} WHERE telegram_id = %s AND id > %s ORDER BY id LIMIT %s"
+            params = (telegram_id, after_id, limit + 1)
+        elif before_id is not None:
+            query = f"{columns} WHERE telegram_id = %s AND id < %s ORDER BY id DESC LIMIT %s"
+            params = (telegram_id, before_id, limit + 1)
+        else:
+            query = f"{columns} WHERE telegram_id = %s ORDER BY id DESC LIMIT %s"
+            params = (telegram_id, limit + 1)
+        with span(DB, "get_results_page"):
+            rows = await db.fetch_all(query, params)
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if after_id is not None:
+            rows.reverse()
+        for row in rows:
+            try:
+                row['details'] = json.loads(row['details'] or '{}')
+            except json.JSONDecodeError:
+                logger.error(f"❌ Ошибка парсинга JSON в get_results_page для пользователя {telegram_id}")
+                row['details'] = {}
+        return rows, more
+
     @staticmethod
     async def get_latest_result(telegram_id: int) -> Optional[Dict]:
         """Получение последнего результата пользователя"""
@@ -305,6 +707,28 @@ class TestResultsManager:
 class GoalManager:
     """Управление целями пользователя"""
 
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS goals (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            telegram_id BIGINT NOT NULL,
+            title VARCHAR(255),
+            description TEXT,
+            deadline VARCHAR(32),
+            priority INT,
+            progress INT DEFAULT 0,
+            created_at DATETIME,
+            INDEX idx_goals_user (telegram_id)
+        )
+        """,
+    )
+
+    @staticmethod
+    async def create_tables() -> None:
+        """Создание таблицы целей (если её нет)"""
+        for query in GoalManager.SCHEMA:
+            await db.execute_query(query)
+
     @staticmethod
     async def add_goal(telegram_id: int, title: str, description: str, deadline: str, priority: int) -> bool:
         """Добавить новую цель"""
@@ -0,0 +1,70 @@
+import asyncio
+import math
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import BufferedInputFile, Message
+
+from config import settings
+from utils.error_handler import handle_errors
+from utils.profiler import FORMATS, MAX_DURATION, ProfilerBusy, render_profile, sample_stacks
+from utils.tracing import latency_report
+
+router = Router()
+
+
+def is_admin(user_id: int) -> bool:
+    return user_id in settings.admin_ids or user_id == settings.ADMIN_ID
+
+
+@router.message(Command("latency"))
+@handle_errors
+async def cmd_latency(message: Message):
+    """Перцентили времени обработки по обработчикам (только для администраторов)."""
+    if not is_admin(message.from_user.id):
+        return
+    report = latency_report()
+    if not report:
+        await message.answer("Пока нет данных о задержках.")
+        return
+    lines = ["handler                         n     p50     p95     p99 (ms)"]
+    for name, stats in sorted(report.items(), key=lambda x: x[1]["p95_ms"], reverse=True):
+        lines.append(
+            f"{name[:30]:<30} {stats['count']:>5} {stats['p50_ms']:>7} {stats['p95_ms']:>7} {stats['p99_ms']:>7}"
+        )
+    await message.answer("<pre>" + "\n".join(lines) + "</pre>", parse_mode="HTML")
+
+
+@router.message(Command("profiler"))
+@handle_errors
+async def cmd_profiler(message: Message, command: CommandObject):
+    """
+    Сэмплирующий профайлер живого процесса: /profiler [секунды] [collapsed|speedscope].
+    Сэмплы снимаются в отдельном потоке, event loop продолжает обслуживать пользователей.
+    """
+    if not is_admin(message.from_user.id):
+        return
+    args = (command.args or "").split()
+    try:
+        seconds = float(args[0]) if args else 10.0
+    except ValueError:
+        seconds = math.nan
+    # nan и inf не проходят сравнение; границы — как у /debug/profile в API
+    if not 0 < seconds <= MAX_DURATION:
+        await message.answer(f"Использование: /profiler [секунды, до {MAX_DURATION:g}] [{'|'.join(FORMATS)}]")
+        return
+    fmt = args[1] if len(args) > 1 and args[1] in FORMATS else "collapsed"
+
+    await message.answer(f"Профилирую {seconds:g} с...")
+    try:
+        stacks = await asyncio.to_thread(sample_stacks, seconds)
+    except ProfilerBusy:
+        await message.answer("Профилирование уже запущено.")
+        return
+    extension = "speedscope.json" if fmt == "speedscope" else "collapsed.txt"
+    document = BufferedInputFile(render_profile(stacks, fmt).encode("utf-8"), filename=f"profile.{extension}")
+    await message.answer_document(document, caption=f"Сэмплов: {sum(stacks.values())}")
+
+
+def register_handlers(dispatcher):
+    dispatcher.include_router(router)
@@ -1,9 +1,9 @@
-from aiogram import Router, F
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 import json
 
 from utils.error_handler import handle_errors
+from utils.callback_data import callback_handler, callback_router
 from utils.messages import get_message, normalize_lang, get_user_lang
 from utils.keyboards import (
     get_main_keyboard,
@@ -16,8 +16,6 @@ from utils.states import RegistrationStates
 from utils.states import SettingsStates
 from database import UserManager
 
-router = Router()
-
 LANG_INLINE_KB = InlineKeyboardMarkup(
     inline_keyboard=[
         [InlineKeyboardButton(text="Русский", callback_data="lang_ru"),
@@ -25,7 +23,7 @@ LANG_INLINE_KB = InlineKeyboardMarkup(
     ]
 )
 
-@router.callback_query(F.data == "back_to_main")
+@callback_handler("back_to_main")
 @handle_errors
 async def back_to_main(callback: CallbackQuery):
     """Возврат в главное меню."""
@@ -39,7 +37,7 @@ async def back_to_main(callback: CallbackQuery):
     )
     await callback.answer()
 
-@router.callback_query(F.data == "goals_menu")
+@callback_handler("goals_menu")
 @handle_errors
 async def show_goals_menu(callback: CallbackQuery):
     """Показать меню целей."""
@@ -50,7 +48,7 @@ async def show_goals_menu(callback: CallbackQuery):
     )
     await callback.answer()
 
-@router.callback_query(F.data == "progress_menu")
+@callback_handler("progress_menu")
 @handle_errors
 async def show_progress_menu(callback: CallbackQuery):
     """Показать меню прогресса."""
@@ -61,7 +59,7 @@ async def show_progress_menu(callback: CallbackQuery):
     )
     await callback.answer()
 
-@router.callback_query(F.data == "materials_menu")
+@callback_handler("materials_menu")
 @handle_errors
 async def show_materials_menu(callback: CallbackQuery):
     """Показать меню материалов."""
@@ -72,7 +70,7 @@ async def show_materials_menu(callback: CallbackQuery):
     )
     await callback.answer()
 
-@router.callback_query(F.data == "settings_menu")
+@callback_handler("settings_menu")
 @handle_errors
 async def show_settings_menu(callback: CallbackQuery):
     """Показать меню настроек."""
@@ -83,7 +81,7 @@ async def show_settings_menu(callback: CallbackQuery):
     )
     await callback.answer()
 
-@router.callback_query(F.data == "change_language")
+@callback_handler("change_language")
 async def change_language_callback(callback: CallbackQuery, state: FSMContext):
     await callback.message.edit_text(
         "Выберите язык для использования в боте:",
@@ -92,7 +90,7 @@ async def change_language_callback(callback: CallbackQuery, state: FSMContext):
     await state.set_state(SettingsStates.waiting_for_language)
     await callback.answer()
 
-@router.callback_query(F.data.in_(["lang_ru", "lang_ky"]))
+@callback_handler("lang_ru", "lang_ky")
 async def set_language_callback(callback: CallbackQuery, state: FSMContext):
     lang = "ru" if callback.data == "lang_ru" else "ky"
     user_id = callback.from_user.id
@@ -103,13 +101,13 @@ async def set_language_callback(callback: CallbackQuery, state: FSMContext):
     await callback.message.answer(get_message("welcome", lang), reply_markup=get_main_keyboard(lang))
     await callback.answer()
 
-@router.callback_query(F.data == "update_main_menu")
+@callback_handler("update_main_menu")
 async def update_main_menu(callback: CallbackQuery):
     lang = await get_user_lang(callback.from_user.id)
     await callback.message.answer(get_message("welcome", lang), reply_markup=get_main_keyboard(lang))
     await callback.answer()
 
-@router.callback_query(F.data == "profile")
+@callback_handler("profile")
 async def show_profile(callback: CallbackQuery):
     user_id = callback.from_user.id
     lang = await get_user_lang(user_id)
@@ -152,4 +150,5 @@ async def show_profile(callback: CallbackQuery):
 
 def register_handlers(dispatcher):
     """Регистрация обработчиков."""
-    dispatcher.include_router(router)
\ No newline at end of file
+    # Все callback-запросы проходят через одну таблицу диспетчеризации по префиксу
+    dispatcher.include_router(callback_router)
\ No newline at end of file
@@ -1,5 +1,7 @@
-from aiogram import Router, F
-from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
+import logging
+
+from aiogram import Router
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 
@@ -9,14 +11,26 @@ from utils.keyboards import (
     get_progress_keyboard,
     get_materials_keyboard
 )
-from utils.messages import get_message, get_user_lang, format_test_stats
+from utils.messages import get_message, get_user_lang, user_lang, format_test_stats
 from utils.states import GoalStates, MaterialStates, NoteStates, ProfileStates, SettingsStates
 from utils.error_handler import handle_errors
-from database import UserManager, TestResultsManager
-from utils.artifacts import ARTIFACTS_BY_PROFESSION
+from utils.text_dispatch import text_handler, text_router
+from utils.callback_data import callback_handler, pack_callback, STATS_PAGE
+from utils.tracing import span, RENDER
+from utils.cache import LRUCache
+from config import settings
+from database import UserManager, TestResultsManager, parse_json_list, profile_version
+from utils.catalog import PROFILE_TRANSLATIONS
+from utils.artifact_registry import get_artifact_registry
+
+logger = logging.getLogger(__name__)
 
 router = Router()
 
+# Карточки профиля по (пользователь, язык, версия сводки, версия реестра артефактов);
+# запись данных пользователя меняет версию сводки — устаревшая карточка больше не находится
+profile_cards = LRUCache("profile_card", settings.VIEW_CACHE_SIZE)
+
 @router.message(Command("start"))
 @handle_errors
 async def cmd_start(message: Message):
@@ -46,7 +60,7 @@ async def cmd_start(message: Message):
         parse_mode="HTML"
     )
 
-@router.message(F.text.in_(["🎯 Мои цели", "🎯 Максаттарым"]))
+@text_handler("goals")
 @handle_errors
 async def show_goals_menu(message: Message):
     """Показать меню целей."""
@@ -57,7 +71,7 @@ async def show_goals_menu(message: Message):
         parse_mode="HTML"
     )
 
-@router.message(F.text.in_(["📊 Прогресс", "📊 Прогресс"]))
+@text_handler("progress")
 @handle_errors
 async def show_progress_menu(message: Message):
     """Показать меню прогресса."""
@@ -68,7 +82,7 @@ async def show_progress_menu(message: Message):
         parse_mode="HTML"
     )
 
-@router.message(F.text.in_(["📚 Материалы", "📚 Материалдар"]))
+@text_handler("materials")
 @handle_errors
 async def show_materials_menu(message: Message):
     """Показать меню материалов."""
@@ -79,7 +93,7 @@ async def show_materials_menu(message: Message):
         parse_mode="HTML"
     )
 
-@router.message(F.text.in_(["❓ Помощь", "❓ Жардам"]))
+@text_handler("help")
 @handle_errors
 async def show_help(message: Message):
     lang = await get_user_lang(message.from_user.id)
@@ -134,19 +148,64 @@ async def cmd_cancel(message: Message, state: FSMContext):
         reply_markup=get_main_keyboard()
     )
 
-@router.message(F.text.in_(["📊 Статистика", "📊 Статистика"]))
+# --- История тестов: страницы по ключу id, агрегаты — из сводки ---
+STATS_NEWER, STATS_OLDER = "n", "o"
+
+async def render_stats_page(user_id: int, lang: str, direction: str = None, cursor: int = None, page: int = 0):
+    """Текст и клавиатура страницы истории; (None, None), если показывать нечего."""
+    size = settings.STATS_PAGE_SIZE
+    summary = await TestResultsManager.get_summary(user_id)
+    if direction == STATS_NEWER:
+        results, has_newer = await TestResultsManager.get_results_page(user_id, size, after_id=cursor)
+        has_older = True
+    else:
+        results, has_older = await TestResultsManager.get_results_page(user_id, size, before_id=cursor)
+        has_newer = cursor is not None
+    if not results:
+        return None, None
+    page = max(page, 0)
+    pages = max(-(-sum(summary.values()) // size), page + 1)
+    with span(RENDER, "format_test_stats"):
+        text = format_test_stats(summary, results, lang, page, pages)
+    buttons = []
+    if has_newer and page > 0:
+        buttons.append(InlineKeyboardButton(
+            text=get_message("stats_newer", lang),
+            callback_data=pack_callback(STATS_PAGE, STATS_NEWER, results[0]['id'], page - 1)))
+    if has_older:
+        buttons.append(InlineKeyboardButton(
+            text=get_message("stats_older", lang),
+            callback_data=pack_callback(STATS_PAGE, STATS_OLDER, results[-1]['id'], page + 1)))
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[buttons]) if buttons else None
+    return text, keyboard
+
+@text_handler("stats")
 @handle_errors
 async def show_stats(message: Message):
     user_id = message.from_user.id
     lang = await get_user_lang(user_id)
-    results = await TestResultsManager.get_user_results(user_id)
-    if not results:
+    text, keyboard = await render_stats_page(user_id, lang)
+    if text is None:
         await message.answer(get_message("stats_none", lang))
         return
-    text = format_test_stats(results, lang)
-    await message.answer(text, parse_mode="HTML")
+    await message.answer(text, parse_mode="HTML", reply_markup=keyboard)
 
-@router.message(F.text.in_(["🌍 Сменить язык", "🌍 Тилди өзгөртүү"]))
+@callback_handler(STATS_PAGE)
+async def show_stats_page(callback: CallbackQuery, callback_args: list):
+    user_id = callback.from_user.id
+    lang = await get_user_lang(user_id)
+    direction, cursor, page = callback_args
+    text, keyboard = await render_stats_page(user_id, lang, direction, int(cursor), int(page))
+    if text is None:
+        # страница опустела (история изменилась) — возвращаемся к началу
+        text, keyboard = await render_stats_page(user_id, lang)
+    if text is None:
+        await callback.message.edit_text(get_message("stats_none", lang))
+    else:
+        await callback.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
+    await callback.answer()
+
+@text_handler("change_language")
 @handle_errors
 async def change_language_menu(message: Message, state: FSMContext):
     LANG_INLINE_KB = InlineKeyboardMarkup(
@@ -158,15 +217,33 @@ async def change_language_menu(message: Message, state: FSMContext):
     await message.answer("Выберите язык для использования в боте:", reply_markup=LANG_INLINE_KB)
     await state.set_state(SettingsStates.waiting_for_language)
 
-@router.message(F.text.in_(["👤 Профиль", "/profile"]))
+@text_handler("profile")
 @handle_errors
 async def show_profile(message: Message):
     user_id = message.from_user.id
-    lang = await get_user_lang(user_id)
+    # версия берётся до чтения данных: запись между ними оставит карточку под старой версией
+    version = profile_version(user_id)
     user = await UserManager.get_user(user_id)
+    lang = user_lang(user)
     if not user:
         await message.answer("Профиль не найден. Пожалуйста, пройдите регистрацию.")
         return
+    key = (user_id, lang, version, get_artifact_registry().version)
+    text = profile_cards.get(key)
+    if text is None:
+        summary = None
+        try:
+            summary = await TestResultsManager.get_summary(user_id)
+        except Exception as e:
+            logger.warning(f"Ошибка получения сводки тестов: {e}")
+        text = _build_profile_card(user, lang, summary or {})
+        # карточка без истории тестов неполная — её не запоминаем
+        if summary is not None:
+            profile_cards.put(key, text)
+    await message.answer(text, parse_mode="HTML")
+
+def _build_profile_card(user, lang, summary):
+    """HTML карточки профиля по строке пользователя и сводке его тестов (число тестов по профилям)."""
     # --- Получаем данные из локальной базы ---
     # db_data = db._read_db()
     # user_local = db_data.get('users', {}).get(str(user_id), {})
@@ -182,26 +259,16 @@ async def show_profile(message: Message):
     gender = get_field('gender')
     birth_year = get_field('birth_year')
     # --- Прогресс по артефактам ---
-    portals_local = set(user.get('portals', []) or [])
-    artifacts_api = set(user.get('artifacts', []) or [])
-    portals = portals_local.union(artifacts_api)
-    total_artifacts = 60 if len(ARTIFACTS_BY_PROFESSION) < 60 else len(ARTIFACTS_BY_PROFESSION)
+    registry = get_artifact_registry()
+    portals = registry.owned_ids(parse_json_list(user.get('portals')) + parse_json_list(user.get('artifacts')))
+    total_artifacts = max(60, len(registry))
     collected = len(portals)
     # Красивый прогресс-бар
     bar_len = 20
     filled = int(bar_len * collected / total_artifacts)
     progress_bar = f"{'🟩'*filled}{'⬜️'*(bar_len-filled)} {collected}/{total_artifacts}"
     # --- Уникальные профессии и тесты ---
-    unique_professions = set()
-    results = []
-    try:
-        results = await TestResultsManager.get_user_results(user_id)
-    except Exception as e:
-        print(f"[DEBUG] Ошибка получения тестов из API: {e}")
-    for r in results:
-        prof = r.get('profile')
-        if prof:
-            unique_professions.add(prof)
+    unique_professions = {prof for prof in summary if prof}
     # Ачивка за все артефакты
     all_collected = collected == total_artifacts
     achiev = "🏆" if all_collected else ""
@@ -234,31 +301,32 @@ async def show_profile(message: Message):
         'ky': "<i>Жаңы артефакттарды чогулт, порталдарды ач жана прогрессиӊ менен сыймыктан! Сен — өз жолуӊдун баатырысыӊ! 🦊</i>"
     }[lang]
     # --- Переводим уникальные профили для вывода ---
-    from handlers.test import PROFILE_TRANSLATIONS
     unique_professions_display = [PROFILE_TRANSLATIONS[lang].get(p, p) for p in unique_professions]
     # Формируем текст профиля
-    text_lines = [
-        profile_headers[lang],
-        "",
-        f"{labels['fio']}: <b>{fio}</b>",
-        f"{labels['school']}: <b>{school}</b>",
-        f"{labels['class']}: <b>{class_number}{class_letter}</b>",
-        f"{labels['city']}: <b>{city}</b>",
-        f"{labels['lang']}: <b>{language_human}</b>",
-        f"{labels['gender']}: <b>{gender_human}</b>",
-        f"{labels['birth_year']}: <b>{birth_year}</b>",
-        "",
-        f"{labels['artifacts']}: <b>{collected}/{total_artifacts}</b>  {achiev}",
-        f"{labels['progress']}: {progress_bar}",
-        f"{labels['professions']}: <b>{len(unique_professions_display)}</b>"
-    ]
-    if lang == 'ky' and unique_professions_display:
-        text_lines.append(f"<b>{', '.join(unique_professions_display)}</b>")
-    text_lines.append(f"{labels['tests']}: <b>{len(results)}</b>")
-    text_lines.append("")
-    text_lines.append(motivation)
-    text = "\n".join(text_lines)
-    await message.answer(text, parse_mode="HTML")
+    with span(RENDER, "show_profile"):
+        text_lines = [
+            profile_headers[lang],
+            "",
+            f"{labels['fio']}: <b>{fio}</b>",
+            f"{labels['school']}: <b>{school}</b>",
+            f"{labels['class']}: <b>{class_number}{class_letter}</b>",
+            f"{labels['city']}: <b>{city}</b>",
+            f"{labels['lang']}: <b>{language_human}</b>",
+            f"{labels['gender']}: <b>{gender_human}</b>",
+            f"{labels['birth_year']}: <b>{birth_year}</b>",
+            "",
+            f"{labels['artifacts']}: <b>{collected}/{total_artifacts}</b>  {achiev}",
+            f"{labels['progress']}: {progress_bar}",
+            f"{labels['professions']}: <b>{len(unique_professions_display)}</b>"
+        ]
+        if lang == 'ky' and unique_professions_display:
+            text_lines.append(f"<b>{', '.join(unique_professions_display)}</b>")
+        text_lines.append(f"{labels['tests']}: <b>{sum(summary.values())}</b>")
+        text_lines.append("")
+        text_lines.append(motivation)
+        return "\n".join(text_lines)
 
 def register_handlers(dispatcher):
-    dispatcher.include_router(router)
\ No newline at end of file
+    dispatcher.include_router(router)
+    # Кнопки reply-клавиатуры всех роутеров разбираются одной таблицей
+    dispatcher.include_router(text_router)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from datetime import datetime
@@ -7,11 +7,12 @@ from utils.states import GoalStates
 from utils.messages import format_goal, format_progress, get_message, get_user_lang
 from utils.keyboards import get_goals_keyboard
 from utils.error_handler import handle_errors
+from utils.callback_data import callback_handler
 from database import GoalManager
 
 router = Router()
 
-@router.callback_query(F.data == "add_goal")
+@callback_handler("add_goal")
 @handle_errors
 async def add_goal_start(callback: CallbackQuery, state: FSMContext):
     """Начать процесс добавления цели."""
@@ -112,7 +113,7 @@ async def process_goal_confirmation(message: Message, state: FSMContext):
         await message.answer(get_message("goal_cancelled", lang), reply_markup=get_goals_keyboard(lang))
     await state.clear()
 
-@router.callback_query(F.data == "list_goals")
+@callback_handler("list_goals")
 @handle_errors
 async def show_goals_list(callback: CallbackQuery):
     """Показать список целей."""
@@ -125,7 +126,7 @@ async def show_goals_list(callback: CallbackQuery):
             await callback.message.answer(format_goal(goal, lang))
     await callback.answer()
 
-@router.callback_query(F.data == "goals_stats")
+@callback_handler("goals_stats")
 @handle_errors
 async def show_goals_stats(callback: CallbackQuery):
     """Показать статистику по целям."""
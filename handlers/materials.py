@@ -1,4 +1,4 @@
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from datetime import datetime
@@ -7,10 +7,11 @@ from utils.states import MaterialStates
 from utils.messages import format_material, get_message, get_user_lang
 from utils.keyboards import get_materials_keyboard
 from utils.error_handler import handle_errors
+from utils.callback_data import callback_handler
 
 router = Router()
 
-@router.callback_query(F.data == "add_material")
+@callback_handler("add_material")
 @handle_errors
 async def add_material_start(callback: CallbackQuery, state: FSMContext):
     """Начать процесс добавления материала."""
@@ -99,7 +100,7 @@ async def process_material_confirmation(message: Message, state: FSMContext):
         await message.answer(get_message("material_cancelled", lang), reply_markup=get_materials_keyboard(lang))
     await state.clear()
 
-@router.callback_query(F.data == "my_materials")
+@callback_handler("my_materials")
 @handle_errors
 async def show_materials_list(callback: CallbackQuery):
     """Показать список материалов."""
@@ -115,7 +116,7 @@ async def show_materials_list(callback: CallbackQuery):
     
     await callback.answer()
 
-@router.callback_query(F.data == "search_materials")
+@callback_handler("search_materials")
 @handle_errors
 async def search_materials(callback: CallbackQuery, state: FSMContext):
     """Начать поиск материалов."""
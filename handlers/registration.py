@@ -155,7 +155,7 @@ async def reg_city(message: Message, state: FSMContext):
     else:
         msg = get_message("registration_error", lang) or get_message("registration_error", "ru")
         await message.answer(msg, reply_markup=None)
-    await state.clear()
+        await state.clear()
 
 def register_registration_handlers(dispatcher):
     dispatcher.include_router(router) 
\ No newline at end of file
@@ -1,9 +1,12 @@
+import uuid
 from utils.scene_manager import SceneManager
+from utils.scene_bundle import current_version
+from utils.scoring import get_scoring_model
 from utils.states import TestStates
 from aiogram.types import Message, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
 from utils.messages import get_user_lang, normalize_lang
-from database import UserManager
+from database import UserManager, TestProgressManager
 
 async def get_user_data_from_db(telegram_id: int):
     return await UserManager.get_user(telegram_id)
@@ -14,22 +17,23 @@ async def start_test_flow(message: Message, state: FSMContext):
     user_data = await get_user_data_from_db(message.from_user.id)
     lang = normalize_lang(user_data.get("language", "ru")) if user_data else "ru"
     gender = user_data.get("gender", "male") if user_data else "male"
-    scene_manager = SceneManager(language=lang, gender=gender)
-    # Формируем маршрут: 6 базовых сцен + сцена артефакта (id=7)
-    basic_scenes = scene_manager.get_basic_scenes()
-    artifact_scene = scene_manager.get_scene_by_id(7)
-    all_scenes = basic_scenes.copy()
-    if artifact_scene:
-        all_scenes.append(artifact_scene)
+    # Сессия привязывается к версии каталога сцен на момент старта (горячая перезагрузка её не меняет)
+    scene_version = current_version()
+    scene_manager = SceneManager(language=lang, gender=gender, version=scene_version)
+    all_scenes = get_main_route(scene_manager)
+    # Ответы сессии пишутся в журнал test_answers (utils.answer_log) под этим id
+    session_id = uuid.uuid4().hex
+    await TestProgressManager.save_session(message.from_user.id, session_id, lang, gender, scene_version)
     # Сохраняем только первые 6 + артефакт, персональные добавим после 7-й сцены
     await state.update_data(
         scene_index=0,
         answers=[],
-        profile_scores={},
+        session_id=session_id,
         all_scenes=all_scenes,
         lang=lang,
         gender=gender,
-        scene_manager_params={"language": lang, "gender": gender}
+        scene_version=scene_version,
+        scene_manager_params={"language": lang, "gender": gender, "version": scene_version}
     )
     # Удаляем reply-клавиатуру при старте теста
     # await message.answer("Тест начинается!", reply_markup=ReplyKeyboardRemove())
@@ -38,6 +42,60 @@ async def start_test_flow(message: Message, state: FSMContext):
     await state.set_state(TestStates.main_scene)
     await send_scene(message, all_scenes[0], scene_type='main')
 
+def get_main_route(scene_manager: SceneManager) -> list:
+    """Маршрут основного теста: 6 базовых сцен + сцена артефакта (id=7)"""
+    all_scenes = scene_manager.get_basic_scenes().copy()
+    artifact_scene = scene_manager.get_scene_by_id(7)
+    if artifact_scene:
+        all_scenes.append(artifact_scene)
+    return all_scenes
+
+async def resume_test_flow(message: Message, state: FSMContext, progress: dict) -> bool:
+    """
+    Восстанавливает незавершённую сессию из журнала ответов: маршрут строится заново
+    по языку, полу и ветке, баллы — прогоном записанных ответов через модель баллов.
+    False — продолжать нечего (ответов нет или маршрут уже пройден).
+    """
+    answers = progress.get('answers') or []
+    if not answers:
+        return False
+    lang, gender, branch = progress['lang'], progress.get('gender') or 'male', progress.get('branch')
+    # версия, к которой была привязана сессия, после рестарта может быть недоступна — тогда текущая
+    scene_version = progress.get('scene_version')
+    scene_manager = SceneManager(language=lang, gender=gender, version=scene_version)
+    model = get_scoring_model(lang, scene_version)
+    scores = model.new_vector()
+    for scene_id, option_id in answers:
+        model.apply(scores, scene_id, option_id)
+    if branch:
+        all_scenes = scene_manager.get_personal_scenes_by_branch(branch)
+        personal_ids = {scene['id'] for scene in all_scenes}
+        scene_index = sum(1 for scene_id, _ in answers if scene_id in personal_ids)
+        scene_type = 'personal'
+        test_state = TestStates.personal_scene
+    else:
+        all_scenes = get_main_route(scene_manager)
+        scene_index = len(answers)
+        scene_type = 'main'
+        test_state = TestStates.main_scene
+    if scene_index >= len(all_scenes):
+        return False
+    await state.update_data(
+        scene_index=scene_index,
+        answers=answers,
+        scores=scores,
+        session_id=progress['session_id'],
+        all_scenes=all_scenes,
+        branch=branch,
+        lang=lang,
+        gender=gender,
+        scene_version=scene_version,
+    )
+    from handlers.test import send_scene
+    await state.set_state(test_state)
+    await send_scene(message, all_scenes[scene_index], scene_type=scene_type, state=state)
+    return True
+
 async def send_scene(message_or_callback, scene, scene_type='main', state=None, creative_prefix=None, only_option_id=None, extra_buttons=None):
     # ... реализация из test.py ...
     pass 
\ No newline at end of file
@@ -0,0 +1,22 @@
+from .logging_context import LoggingContextMiddleware
+from .throttling import ThrottlingMiddleware
+from .tracing import HandlerNameMiddleware, TelegramTimingMiddleware, UpdateTracingMiddleware
+
+
+def register_middlewares(dispatcher):
+    """Регистрация middleware."""
+    dispatcher.update.outer_middleware(LoggingContextMiddleware())
+    dispatcher.update.outer_middleware(UpdateTracingMiddleware())
+    throttling = ThrottlingMiddleware()
+    # outer-middleware срабатывает до фильтров роутеров — дубль отбрасывается без лишней работы
+    dispatcher.message.outer_middleware(throttling)
+    dispatcher.callback_query.outer_middleware(throttling)
+    # inner-middleware наследуются вложенными роутерами и видят выбранный обработчик
+    handler_name = HandlerNameMiddleware()
+    dispatcher.message.middleware(handler_name)
+    dispatcher.callback_query.middleware(handler_name)
+
+
+def register_request_middlewares(bot):
+    """Регистрация middleware сессии бота (запросы к Telegram API)."""
+    bot.session.middleware(TelegramTimingMiddleware())
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Защита от двойных нажатий и флуда:
+    - per-user asyncio.Lock — апдейты одного пользователя обрабатываются строго по очереди;
+    - одинаковый callback_data в пределах окна dedup_window отбрасывается;
+    - token bucket (rate_limit апдейтов в секунду, burst — запас) на пользователя.
+    Отброшенный callback сразу получает пустой answer() и дальше не обрабатывается.
+    """
+
+    def __init__(self, rate_limit: float = None, burst: int = None, dedup_window: float = None):
+        self.rate_limit = settings.THROTTLE_RATE_LIMIT if rate_limit is None else rate_limit
+        self.burst = settings.THROTTLE_BURST if burst is None else burst
+        self.dedup_window = settings.THROTTLE_DEDUP_WINDOW if dedup_window is None else dedup_window
+        # user_id -> [lock, количество ожидающих/держащих]
+        self._locks: Dict[int, list] = {}
+        # user_id -> (callback_data, время)
+        self._last_callback: Dict[int, Tuple[str, float]] = {}
+        # user_id -> (токены, время последнего пополнения)
+        self._buckets: Dict[int, Tuple[float, float]] = {}
+        self._last_cleanup = time.monotonic()
+        self.dropped = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = getattr(event, "from_user", None)
+        if user is None:
+            return await handler(event, data)
+        user_id = user.id
+        now = time.monotonic()
+        self._cleanup(now)
+
+        is_callback = isinstance(event, CallbackQuery)
+        if is_callback and self._is_duplicate(user_id, event.data, now):
+            return await self._drop(event, "duplicate")
+        if not self._take_token(user_id, now):
+            return await self._drop(event, "rate_limit")
+
+        entry = self._locks.get(user_id)
+        if entry is None:
+            entry = self._locks[user_id] = [asyncio.Lock(), 0]
+        lock = entry[0]
+        # Пока обрабатывается предыдущее нажатие, новые нажатия не ставим в очередь:
+        # после ответа клавиатура всё равно сменится. Сообщения ждут своей очереди.
+        if is_callback and lock.locked():
+            return await self._drop(event, "busy")
+
+        entry[1] += 1
+        try:
+            async with lock:
+                return await handler(event, data)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._locks.get(user_id) is entry:
+                del self._locks[user_id]
+
+    def _is_duplicate(self, user_id: int, callback_data: Optional[str], now: float) -> bool:
+        """Повтор того же callback_data в пределах окна — дубль."""
+        last = self._last_callback.get(user_id)
+        self._last_callback[user_id] = (callback_data, now)
+        return last is not None and last[0] == callback_data and now - last[1] < self.dedup_window
+
+    def _take_token(self, user_id: int, now: float) -> bool:
+        """Token bucket: True, если у пользователя есть свободный токен."""
+        if self.rate_limit <= 0:
+            return True
+        tokens, updated = self._buckets.get(user_id, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate_limit)
+        if tokens < 1:
+            self._buckets[user_id] = (tokens, now)
+            return False
+        self._buckets[user_id] = (tokens - 1, now)
+        return True
+
+    async def _drop(self, event: TelegramObject, reason: str) -> None:
+        self.dropped += 1
+        logger.debug(f"Апдейт отброшен ({reason}) от пользователя {event.from_user.id}")
+        if isinstance(event, CallbackQuery):
+            try:
+                await event.answer()
+            except Exception as e:
+                logger.debug(f"Не удалось ответить на callback: {e}")
+        return None
+
+    def _cleanup(self, now: float) -> None:
+        """Раз в минуту удаляем устаревшие записи, чтобы память не росла."""
+        if now - self._last_cleanup < 60:
+            return
+        self._last_cleanup = now
+        stale = max(self.dedup_window, 60)
+        self._last_callback = {
+            uid: v for uid, v in self._last_callback.items() if now - v[1] < stale
+        }
+        self._buckets = {
+            uid: v for uid, v in self._buckets.items() if now - v[1] < stale
+        }
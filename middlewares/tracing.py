@@ -0,0 +1,69 @@
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.types import TelegramObject, Update
+
+from config import settings
+from utils.metrics import HANDLER_LATENCY, TELEGRAM_IN_FLIGHT, UPDATES_TOTAL
+from utils.tracing import Trace, current_trace, record_latency, set_handler_name, span, TELEGRAM
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateTracingMiddleware(BaseMiddleware):
+    """
+    Outer-middleware на update: общее время обработки апдейта с разбивкой по span'ам,
+    скользящие перцентили по обработчику и структурированный дамп медленных апдейтов.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if isinstance(event, Update):
+            trace = Trace(event.update_id, event.event_type)
+        else:
+            trace = Trace()
+        token = current_trace.set(trace)
+        try:
+            return await handler(event, data)
+        finally:
+            current_trace.reset(token)
+            duration = trace.finish()
+            record_latency(trace.handler, duration)
+            UPDATES_TOTAL.inc(type=trace.update_type)
+            HANDLER_LATENCY.observe(duration, handler=trace.handler)
+            if duration * 1000 >= settings.SLOW_UPDATE_THRESHOLD_MS:
+                logger.warning(f"Медленный апдейт: {json.dumps(trace.as_dict(), ensure_ascii=False)}")
+
+
+class HandlerNameMiddleware(BaseMiddleware):
+    """Inner-middleware: сообщает трассировке, какой обработчик выбран для апдейта."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        if handler_object is not None:
+            set_handler_name(getattr(handler_object.callback, "__name__", "unknown"))
+        return await handler(event, data)
+
+
+class TelegramTimingMiddleware(BaseRequestMiddleware):
+    """Middleware сессии бота: время запросов к Telegram Bot API попадает в трассировку апдейта."""
+
+    async def __call__(self, make_request, bot, method):
+        TELEGRAM_IN_FLIGHT.inc()
+        try:
+            with span(TELEGRAM, type(method).__name__):
+                return await make_request(bot, method)
+        finally:
+            TELEGRAM_IN_FLIGHT.dec()
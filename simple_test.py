@@ -1,18 +1,13 @@
 import asyncio
 import aiomysql
 
+from database import db_params
+
 async def test_connection():
     print("🔄 Проверка подключения к MySQL...")
     
     try:
-        connection = await aiomysql.connect(
-            host='turntable.proxy.rlwy.net',
-            port=11725,
-            user='root',
-            password='obyRyMEAMtDgJsSxGkontTXPZzwJdtFR',
-            db='railway',
-            charset='utf8mb4'
-        )
+        connection = await aiomysql.connect(**db_params, charset='utf8mb4')
         
         print("✅ Подключение успешно!")
         
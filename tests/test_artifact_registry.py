@@ -0,0 +1,29 @@
+from utils.artifact_registry import ArtifactRegistry
+
+TABLE = {
+    "Программная инженерия": {"branch": "technical", "ru": {"name": "Кодекс", "desc": "..."},
+                              "ky": {"name": "Кодекс КЫ", "desc": "..."}},
+    "Робототехника": {"branch": "technical", "ru": {"name": "Шестерня", "desc": "..."}},
+    "Психология": {"branch": "humanitarian", "ru": {"name": "Зеркало", "desc": "..."}},
+}
+
+
+def test_indexes():
+    registry = ArtifactRegistry(TABLE)
+    assert registry.branch("technical") == ("Программная инженерия", "Робототехника")
+    # без кыргызского перевода — русское название
+    assert registry.localized("Робототехника", "ky")["name"] == "Шестерня"
+    assert registry.owned_ids(["Кодекс КЫ", "Зеркало", "Неизвестный"]) == {"Программная инженерия", "Психология"}
+    # получен на русском — кыргызское название того же артефакта уже не новое
+    assert registry.owns(["Кодекс"], "Кодекс КЫ")
+    assert not registry.owns(["Кодекс"], "Шестерня")
+    assert registry.owns(["Неизвестный"], "Неизвестный")
+
+
+def test_owned_mask_and_version():
+    registry = ArtifactRegistry(TABLE)
+    ids = registry.branch("technical")
+    assert registry.owned_mask(ids, {"Робототехника"}) == 0b10
+    assert registry.owned_mask(ids, set()) == 0
+    # пересобранный реестр не делит ключи кэша с прежним
+    assert ArtifactRegistry(TABLE).version != registry.version
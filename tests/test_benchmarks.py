@@ -0,0 +1,22 @@
+from utils.benchmarks import compare
+
+
+def run_of(calibration, **timings):
+    return {"calibration_ns": calibration,
+            "benchmarks": {name: {"ns_per_op": ns} for name, ns in timings.items()}}
+
+
+def test_compare_scales_by_calibration():
+    baseline = run_of(100, genderize=1000, get_scene_text=1000)
+    # машина вдвое медленнее: 2000 нс — норма, 3000 нс — регрессия больше 25%
+    current = run_of(200, genderize=2000, get_scene_text=3000, scene_keyboard=10)
+    status = {row["name"]: row["status"] for row in compare(current, baseline, threshold=0.25)}
+    assert status == {"genderize": "ok", "get_scene_text": "regression", "scene_keyboard": "new"}
+
+
+def test_compare_skips_other_scene_source():
+    baseline = run_of(100, **{"get_scene_by_id[base]": 1000})
+    current = run_of(100, **{"get_scene_by_id[base]": 50})
+    baseline["benchmarks"]["get_scene_by_id[base]"]["source"] = "json"
+    current["benchmarks"]["get_scene_by_id[base]"]["source"] = "bundle"
+    assert compare(current, baseline)[0]["status"] == "skipped"
@@ -0,0 +1,22 @@
+import pytest
+
+from utils.callback_data import pack_callback, unpack_callback, MAX_CALLBACK_DATA_BYTES
+
+
+def test_pack_unpack_roundtrip():
+    """Упакованные поля разбираются обратно в том же порядке."""
+    data = pack_callback("main", 3, "3B")
+    assert data == "main|3|3B"
+    assert unpack_callback(data) == ("main", ["3", "3B"])
+
+
+def test_unpack_legacy_and_plain():
+    """Старый формат с ':' и callback без полей тоже разбираются."""
+    assert unpack_callback("personal:202:202A") == ("personal", ["202", "202A"])
+    assert unpack_callback("back_to_main") == ("back_to_main", [])
+
+
+def test_pack_respects_telegram_limit():
+    """callback_data длиннее 64 байт не упаковывается."""
+    with pytest.raises(ValueError):
+        pack_callback("portal", "Ж" * MAX_CALLBACK_DATA_BYTES)
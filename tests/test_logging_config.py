@@ -0,0 +1,22 @@
+import json
+import logging
+import queue
+
+from utils.logging_config import JsonFormatter, NonBlockingQueueHandler
+
+
+def test_queued_exception_keeps_exc_field():
+    log_queue = queue.Queue()
+    logger = logging.getLogger("tests.logging_config")
+    handler = NonBlockingQueueHandler(log_queue)
+    logger.addHandler(handler)
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("сбой %s", 42)
+    finally:
+        logger.removeHandler(handler)
+    payload = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert payload["msg"] == "сбой 42"
+    assert "ValueError: boom" in payload["exc"]
@@ -0,0 +1,21 @@
+from utils.metrics import Registry
+
+
+def test_render_prometheus_text():
+    """Счётчики, gauge с callback и гистограмма выводятся в текстовом формате Prometheus."""
+    registry = Registry()
+    updates = registry.counter("updates_total", "Апдейты", ("type",))
+    registry.gauge("pool", "Пул", ("state",), callback=lambda: {("free",): 3})
+    latency = registry.histogram("latency_seconds", "Задержка", ("handler",), buckets=(0.1, 1.0))
+
+    updates.inc(type="message")
+    updates.inc(type="message")
+    latency.observe(0.05, handler='say "hi"')
+    latency.observe(0.5, handler='say "hi"')
+
+    text = registry.render()
+    assert 'updates_total{type="message"} 2' in text
+    assert 'pool{state="free"} 3' in text
+    assert 'latency_seconds_bucket{handler="say \\"hi\\"",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{handler="say \\"hi\\"",le="+Inf"} 2' in text
+    assert 'latency_seconds_count{handler="say \\"hi\\""} 2' in text
@@ -0,0 +1,26 @@
+import json
+
+from utils.rescore import rescore_row, update_rows_query
+from utils.scoring import get_scoring_model
+
+
+def test_rescore_row_from_answers_and_legacy_scores():
+    """Строка с ответами пересчитывается по ним; без изменений — не переписывается."""
+    model = get_scoring_model("ru")
+    scene_id, option_id = next((s, o) for (s, o), (ids, _) in model.options.items()
+                               if any(i in model.artifact_ids for i in ids))
+    details = {"answers": [[scene_id, option_id]], "lang": "ru", "profession_scores": {"Устаревшая": 9}}
+    row_id, profile, score, new_details = rescore_row({"id": 7, "profile": "Устаревшая", "score": 9,
+                                                       "details": json.dumps(details)})
+    assert row_id == 7 and score > 0
+    assert profile in json.loads(new_details)["profession_scores"]
+
+    same = {"id": 7, "profile": profile, "score": score, "details": new_details}
+    assert rescore_row(same) is None
+
+
+def test_update_rows_query_only_updates():
+    """Запись пересчёта — UPDATE по существующим id: удалённые строки не воссоздаются."""
+    query = update_rows_query(3)
+    assert query.lstrip().startswith("UPDATE") and "INSERT" not in query
+    assert query.count("%s") == 3 * 4
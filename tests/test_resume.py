@@ -0,0 +1,88 @@
+import pytest
+import pytest_asyncio
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from database import TestProgressManager, db
+from handlers.test_utils import get_main_route, resume_test_flow
+from utils.answer_log import AnswerLog
+from utils.scene_bundle import current_version
+from utils.scene_manager import BRANCH_CATEGORIES, SceneManager
+from utils.scoring import get_scoring_model
+from utils.sqlite_backend import SQLiteBackend
+from utils.states import TestStates
+
+SESSION = "a" * 32
+
+
+@pytest_asyncio.fixture
+async def backend():
+    backend = SQLiteBackend(latency=0)
+    previous = db.use(backend)
+    await backend.connect()
+    await TestProgressManager.create_tables()
+    yield backend
+    await backend.close()
+    db.use(previous)
+
+
+async def resume(monkeypatch, answers, branch=None):
+    """Пишет ответы через журнал, читает прогресс и восстанавливает по нему сессию."""
+    version = current_version()
+    await TestProgressManager.save_session(1, SESSION, "ru", "male", version, branch)
+    log = AnswerLog(flush_interval=60, batch_size=100)
+    for seq, (scene_id, option_id) in enumerate(answers):
+        log.append(SESSION, seq, scene_id, option_id)
+    await log.flush()
+    sent = []
+
+    async def send_scene(message, scene, scene_type='main', state=None):
+        sent.append((scene['id'], scene_type))
+    monkeypatch.setattr("handlers.test.send_scene", send_scene)
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=1, user_id=1))
+    assert await resume_test_flow(None, state, await TestProgressManager.get_progress(1))
+
+    model = get_scoring_model("ru", version)
+    expected = model.new_vector()
+    for scene_id, option_id in answers:
+        model.apply(expected, scene_id, option_id)
+    data = await state.get_data()
+    assert data["scores"] == expected
+    return data, await state.get_state(), sent
+
+
+@pytest.mark.asyncio
+async def test_answer_log_writes_one_batch(backend):
+    log = AnswerLog(flush_interval=60, batch_size=100)
+    before = backend.round_trips
+    for seq in range(3):
+        log.append(SESSION, seq, 1, "1A")
+    assert backend.round_trips == before
+    await log.flush()
+    assert backend.round_trips == before + 1
+    await TestProgressManager.save_session(1, SESSION, "ru")
+    assert len((await TestProgressManager.get_progress(1))["answers"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_resume_main_route(backend, monkeypatch):
+    route = get_main_route(SceneManager(language="ru"))
+    answers = [[scene["id"], scene["options"][0]["id"]] for scene in route[:3]]
+    data, state, sent = await resume(monkeypatch, answers)
+    assert data["scene_index"] == 3
+    assert state == TestStates.main_scene.state
+    assert sent == [(route[3]["id"], "main")]
+
+
+@pytest.mark.asyncio
+async def test_resume_personal_branch(backend, monkeypatch):
+    manager = SceneManager(language="ru")
+    branch = next(iter(BRANCH_CATEGORIES))
+    personal = manager.get_personal_scenes_by_branch(branch)
+    answers = [[scene["id"], scene["options"][0]["id"]] for scene in get_main_route(manager) + personal[:2]]
+    data, state, sent = await resume(monkeypatch, answers, branch)
+    # в ветке позиция — число ответов на её сцены, а не всех ответов сессии
+    assert data["scene_index"] == 2 and data["branch"] == branch
+    assert state == TestStates.personal_scene.state
+    assert sent == [(personal[2]["id"], "personal")]
@@ -0,0 +1,74 @@
+import json
+
+from utils.scene_bundle import SceneBundle, build_bundle, genderize_text
+
+
+def write_scenes(root, lang="ru"):
+    scenes = [{
+        "id": 1,
+        "title": "Сцена",
+        "description": "Ты пришёл{gender:male||а} в школу",
+        "options": [{"id": "1A", "text": "Да", "profiles": [{"name": "Программист", "weight": 2}],
+                     "next_scene_id": 2, "feedback": "Ок"}],
+    }]
+    (root / lang).mkdir(parents=True, exist_ok=True)
+    (root / lang / f"base_scenes_{lang}.json").write_text(json.dumps(scenes, ensure_ascii=False), encoding="utf-8")
+
+
+def test_genderize_text():
+    assert genderize_text("понял{gender:male||а}", "male") == "понял"
+    assert genderize_text("понял{gender:male||а}", "female") == "поняла"
+
+
+def test_bundle_roundtrip_and_stale_fallback(tmp_path):
+    """Собранный бандл отдаёт сцены по полу и веса; после правки исходников считается устаревшим."""
+    write_scenes(tmp_path)
+    path = tmp_path / "scenes.bundle"
+    build_bundle(path, tmp_path)
+
+    bundle = SceneBundle.open(path, tmp_path)
+    assert bundle.scenes("ru", "female", "base_scenes")[0]["description"] == "Ты пришёла в школу"
+    assert bundle.weights("ru", "base_scenes") == {"1": {"1A": [["Программист", 2]]}}
+    assert bundle.scenes("ky", "male", "base_scenes") is None
+    bundle.close()
+
+    (tmp_path / "ru" / "base_scenes_ru.json").write_text("[]", encoding="utf-8")
+    assert SceneBundle.open(path, tmp_path) is None
+
+
+def test_compiler_rejects_invalid_content(tmp_path):
+    """Дубль id и нецелый вес — ошибки; ссылка в несуществующую сцену — предупреждение."""
+    from utils.scene_compiler import SceneCompileError, compile_scenes
+
+    write_scenes(tmp_path)
+    report = compile_scenes(tmp_path, bundle_path=None)
+    assert not report.errors
+    assert any("несуществующую сцену 2" in w for w in report.warnings)
+
+    scenes = json.loads((tmp_path / "ru" / "base_scenes_ru.json").read_text(encoding="utf-8"))
+    scenes[0]["options"][0]["profiles"][0]["weight"] = "2"
+    scenes.append(dict(scenes[0]))
+    (tmp_path / "ru" / "base_scenes_ru.json").write_text(json.dumps(scenes, ensure_ascii=False), encoding="utf-8")
+    try:
+        compile_scenes(tmp_path, bundle_path=tmp_path / "scenes.bundle")
+    except SceneCompileError as e:
+        assert any("дублирующийся id сцены" in m for m in e.report.errors)
+        assert any("не целое число" in m for m in e.report.errors)
+    else:
+        raise AssertionError("некорректный контент прошёл проверку")
+    assert not (tmp_path / "scenes.bundle").exists()
+
+
+def test_compiler_rejects_scene_id_shared_across_files(tmp_path):
+    """Веса модели баллов хранятся по id сцены без категории: один id в двух файлах языка — ошибка."""
+    from utils.scene_compiler import SceneCompileError, compile_scenes
+
+    write_scenes(tmp_path)
+    base = tmp_path / "ru" / "base_scenes_ru.json"
+    (tmp_path / "ru" / "technical_ru.json").write_text(base.read_text(encoding="utf-8"), encoding="utf-8")
+    try:
+        compile_scenes(tmp_path, bundle_path=None)
+    except SceneCompileError as e:
+        assert any("ru/technical сцена 1: id сцены уже занят в ru/base_scenes" in m for m in e.report.errors)
+    else:
+        raise AssertionError("общий id сцены в двух файлах прошёл проверку")
@@ -0,0 +1,60 @@
+from array import array
+
+from utils.scoring import ScoringModel
+
+
+def make_model(version=None):
+    return ScoringModel({
+        "base_scenes": {"1": {"1A": [["Техническая", 1]], "1B": [["Гуманитарная", 1]]}},
+        "technical": {"202": {"1": [["Программист", 2], ["Робототехник", 1]], "2": [["Робототехник", 3]]}},
+    }, version)
+
+
+def test_apply_and_top_k():
+    model = make_model()
+    scores = model.new_vector()
+    assert model.apply(scores, 1, "1A")
+    assert model.apply(scores, "202", "1")
+    assert model.apply(scores, 202, "2")
+    assert not model.apply(scores, 202, "9")
+
+    assert model.top_k(scores, 1, model.profile_ids) == [("Техническая", 1)]
+    assert model.top_k(scores, 3, model.profession_ids) == [("Робототехник", 4), ("Программист", 2)]
+    assert model.as_dict(scores, model.profile_ids) == {"Техническая": 1}
+
+
+def test_session_vector_from_legacy_dicts():
+    """Сессия со словарями баллов продолжается на векторе; неизвестные имена отбрасываются."""
+    model = make_model()
+    scores = model.session_vector({"profile_scores": {"Гуманитарная": 2}, "profession_scores": {"Нет такой": 5}})
+    assert model.as_dict(scores) == {"Гуманитарная": 2}
+    assert model.session_vector({"scores": scores}) == scores
+
+
+def test_leader_settled():
+    """Лидер окончателен, только если его худший исход не хуже лучшего исхода соперников."""
+    model = make_model()
+    scores = model.new_vector()
+    assert not model.leader_settled(scores, [202], model.profession_ids)
+    model.apply(scores, 202, "2")
+    assert model.leader_settled(scores, [202], model.profession_ids)
+    scores = model.new_vector()
+    model.apply(scores, 202, "1")
+    assert not model.leader_settled(scores, [202], model.profession_ids)
+    assert model.leader_settled(scores, [], model.profession_ids)
+
+
+def test_session_vector_rebuilt_from_answers():
+    """Вектор другой длины (модель другой версии сцен) пересчитывается по журналу ответов, а не обнуляется."""
+    model = make_model()
+    scores = model.session_vector({"scores": [7], "answers": [[1, "1B"], [202, "2"]]})
+    assert model.as_dict(scores) == {"Гуманитарная": 1, "Робототехник": 3}
+
+
+def test_session_vector_replayed_for_other_version():
+    """Вектор той же длины, но от модели другой версии сцен, тоже пересчитывается по ответам."""
+    model = make_model("v2")
+    stale = [9] * model.size
+    scores = model.session_vector({"scores": stale, "scene_version": "v1", "answers": [[202, "1"]]})
+    assert model.as_dict(scores) == {"Программист": 2, "Робототехник": 1}
+    assert model.session_vector({"scores": stale, "scene_version": "v2", "answers": []}) == array("i", stale)
@@ -0,0 +1,68 @@
+import pytest
+
+from database import TestProgressManager, TestResultsManager, UserManager, db
+from utils.sqlite_backend import SQLiteBackend, translate
+
+
+def test_translate_mysql_dialect():
+    assert translate("INSERT IGNORE INTO t (a) VALUES (%s) ON DUPLICATE KEY UPDATE a = VALUES(a)") == (
+        "INSERT OR IGNORE INTO t (a) VALUES (?) ON CONFLICT DO UPDATE SET a = excluded.a",
+    )
+    assert translate("CREATE TABLE IF NOT EXISTS t (id INT AUTO_INCREMENT PRIMARY KEY, u BIGINT, INDEX idx_u (u))") == (
+        "CREATE TABLE IF NOT EXISTS t (id INTEGER PRIMARY KEY AUTOINCREMENT, u BIGINT)",
+        "CREATE INDEX IF NOT EXISTS idx_u ON t (u)",
+    )
+
+
+@pytest.mark.asyncio
+async def test_managers_on_sqlite():
+    backend = SQLiteBackend(latency=0)
+    previous = db.use(backend)
+    try:
+        await backend.connect()
+        await UserManager.create_tables()
+        await TestResultsManager.create_tables()
+        await UserManager.create_user(telegram_id=1, fio="Иванов Иван", school="Школа №1", class_number=8,
+                                      class_letter="А", gender="Мальчик", birth_year=2010, city="Бишкек")
+        user = await UserManager.get_user(1)
+        assert user["fio"] == "Иванов Иван"
+        assert backend.round_trips > 0
+    finally:
+        await backend.close()
+        db.use(previous)
+
+
+@pytest.mark.asyncio
+async def test_summary_rebuilt_when_out_of_sync():
+    backend = SQLiteBackend(latency=0)
+    previous = db.use(backend)
+    try:
+        await backend.connect()
+        await TestResultsManager.create_tables()
+        await TestResultsManager.save_result(1, "IT", 10)
+        # запись в обход сводки, как из старого API
+        await db.execute_query("INSERT INTO test_results (telegram_id, profile, score) VALUES (1, 'IT', 5)")
+        await TestResultsManager.create_tables()
+        assert await TestResultsManager.get_summary(1) == {"IT": 2}
+    finally:
+        await backend.close()
+        db.use(previous)
+
+
+@pytest.mark.asyncio
+async def test_finalize_result_retry_is_idempotent():
+    backend = SQLiteBackend(latency=0)
+    previous = db.use(backend)
+    try:
+        await backend.connect()
+        for manager in (UserManager, TestProgressManager, TestResultsManager):
+            await manager.create_tables()
+        await TestResultsManager.finalize_result(1, "IT", 10, {}, session_id="a" * 32)
+        # пользователь уже начал новый тест, а повтор завершения старого пришёл позже
+        await TestProgressManager.save_session(1, "b" * 32, "ru")
+        await TestResultsManager.finalize_result(1, "IT", 10, {}, session_id="a" * 32)
+        assert await TestResultsManager.get_summary(1) == {"IT": 1}
+        assert (await TestProgressManager.get_progress(1))["session_id"] == "b" * 32
+    finally:
+        await backend.close()
+        db.use(previous)
@@ -0,0 +1,15 @@
+import bot  # noqa: F401  регистрирует обработчики кнопок
+from utils.messages import BUTTONS
+from utils.text_dispatch import TEXT_ACTIONS, TEXT_HANDLERS, normalize_button_text
+
+
+def test_every_language_resolves_to_same_action():
+    """Кнопка на любом языке ведёт к одному и тому же действию."""
+    for action in TEXT_HANDLERS:
+        for buttons in BUTTONS.values():
+            assert TEXT_ACTIONS[normalize_button_text(buttons[action])] == action
+
+
+def test_normalization_ignores_variation_selector():
+    """Эмодзи с вариационным селектором и без него считаются одной кнопкой."""
+    assert normalize_button_text("🗝️ Порталы ") == normalize_button_text("🗝 Порталы")
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from aiogram.types import CallbackQuery, User
+
+from middlewares.throttling import ThrottlingMiddleware
+
+
+def make_callback(data: str, user_id: int = 1) -> CallbackQuery:
+    user = User(id=user_id, is_bot=False, first_name="Test")
+    return CallbackQuery(id="1", from_user=user, chat_instance="1", data=data)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_callback_dropped():
+    """Повторный callback с теми же данными не доходит до хэндлера."""
+    middleware = ThrottlingMiddleware(rate_limit=0, burst=1, dedup_window=10)
+    calls = []
+
+    async def handler(event, data):
+        calls.append(event.data)
+
+    await middleware(handler, make_callback("main:1:1A"), {})
+    await middleware(handler, make_callback("main:1:1A"), {})
+    await middleware(handler, make_callback("main:2:2A"), {})
+    assert calls == ["main:1:1A", "main:2:2A"]
+    assert middleware.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_busy_user_callback_dropped():
+    """Пока обрабатывается нажатие, следующие нажатия пользователя отбрасываются."""
+    middleware = ThrottlingMiddleware(rate_limit=0, burst=1, dedup_window=0)
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(event, data):
+        calls.append(event.data)
+        await release.wait()
+
+    first = asyncio.create_task(middleware(handler, make_callback("main:1:1A"), {}))
+    await asyncio.sleep(0)
+    await middleware(handler, make_callback("main:1:1B"), {})
+    release.set()
+    await first
+    assert calls == ["main:1:1A"]
+    assert middleware._locks == {}
+
+
+@pytest.mark.asyncio
+async def test_rate_limit():
+    """Token bucket пропускает не больше burst апдейтов подряд."""
+    middleware = ThrottlingMiddleware(rate_limit=0.001, burst=2, dedup_window=0)
+    calls = []
+
+    async def handler(event, data):
+        calls.append(event.data)
+
+    for i in range(4):
+        await middleware(handler, make_callback(f"main:1:{i}"), {})
+    assert len(calls) == 2
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from config import settings
+from database import TestProgressManager
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerLog:
+    """
+    Журнал ответов теста с пакетной дозаписью.
+    Обработчик клика только кладёт событие в буфер; фоновая задача раз в flush_interval
+    (или сразу при накоплении batch_size событий) пишет буфер в test_answers одной вставкой.
+    Если запись не удалась, пачка возвращается в буфер и уходит со следующей попыткой.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None, batch_size: Optional[int] = None,
+                 max_pending: int = 50000):
+        self.flush_interval = flush_interval if flush_interval is not None else settings.ANSWER_LOG_FLUSH_MS / 1000
+        self.batch_size = batch_size or settings.ANSWER_LOG_BATCH
+        self.max_pending = max_pending
+        self._pending: List[tuple] = []
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def append(self, session_id: str, seq: int, scene_id: int, option_id: str) -> None:
+        self._pending.append((session_id, seq, scene_id, str(option_id), datetime.now()))
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Записывает всё накопленное (перед чтением прогресса и при остановке)."""
+        async with self._lock:
+            while self._pending:
+                batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                try:
+                    await TestProgressManager.append_answers(batch)
+                except Exception as e:
+                    # вставка идемпотентна, пачку можно повторить целиком
+                    self._pending[:0] = batch
+                    if len(self._pending) > self.max_pending:
+                        dropped = len(self._pending) - self.max_pending
+                        del self._pending[:dropped]
+                        logger.error(f"Журнал ответов переполнен, отброшено событий: {dropped}")
+                    logger.error(f"Не удалось записать ответы ({len(batch)} шт.), повтор позже: {e}")
+                    return
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # без cancel(): в 3.11 отмена, пришедшая вместе с таймаутом wait_for, теряется,
+            # и задача продолжает цикл — stop() ждал бы её вечно
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+answer_log = AnswerLog()
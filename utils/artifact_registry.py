@@ -0,0 +1,88 @@
+"""
+Реестр артефактов: индексы по каталогу data/catalog/artifacts.json, которые строятся один раз
+вместо перебора ARTIFACTS_BY_PROFESSION на каждом показе коллекции, профиля и результата теста.
+
+Идентификатор артефакта — профессия, за которую он выдаётся (ключ каталога).
+У пользователя в users.artifacts хранятся локализованные названия — их переводит name_to_id.
+"""
+import itertools
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.catalog import load_catalog_file
+
+ARTIFACTS_FILE = "artifacts.json"
+
+_versions = itertools.count(1)
+
+
+class ArtifactRegistry:
+    def __init__(self, table: Dict[str, dict]):
+        self.source = table
+        # номер сборки: кэши представлений держат его в ключе и не переживают перечитывание каталога
+        self.version = next(_versions)
+        # порядок каталога сохраняется во всех индексах
+        self.ids: Tuple[str, ...] = tuple(table)
+        self.by_profession: Dict[str, dict] = dict(table)
+        branches: Dict[str, List[str]] = {}
+        self.name_to_id: Dict[str, str] = {}
+        for artifact_id, artifact in table.items():
+            branches.setdefault(artifact.get('branch'), []).append(artifact_id)
+            for key, value in artifact.items():
+                if isinstance(value, dict) and value.get('name'):
+                    self.name_to_id.setdefault(value['name'], artifact_id)
+        self.by_branch: Dict[str, Tuple[str, ...]] = {branch: tuple(ids) for branch, ids in branches.items()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, artifact_id) -> bool:
+        return artifact_id in self.by_profession
+
+    def branch(self, branch: str) -> Tuple[str, ...]:
+        return self.by_branch.get(branch, ())
+
+    def localized(self, artifact_id: str, lang: str) -> Optional[dict]:
+        """{'name', 'desc'} на языке пользователя, при отсутствии перевода — на русском."""
+        artifact = self.by_profession.get(artifact_id)
+        if artifact is None:
+            return None
+        return artifact.get(lang) or artifact.get('ru')
+
+    def owned_ids(self, names: Iterable[str]) -> Set[str]:
+        """Идентификаторы артефактов по сохранённым у пользователя названиям на любом языке."""
+        name_to_id = self.name_to_id
+        return {name_to_id[name] for name in names if name in name_to_id}
+
+    def owns(self, names: Iterable[str], name: str) -> bool:
+        """Есть ли среди сохранённых названий артефакт name на любом языке (вне каталога — точное совпадение)."""
+        artifact_id = self.name_to_id.get(name)
+        if artifact_id is None:
+            return name in names
+        return artifact_id in self.owned_ids(names)
+
+    @staticmethod
+    def owned_mask(artifact_ids: Iterable[str], owned: Set[str]) -> int:
+        """Битовая маска владения: бит i выставлен, если получен i-й артефакт из artifact_ids."""
+        mask = 0
+        for position, artifact_id in enumerate(artifact_ids):
+            if artifact_id in owned:
+                mask |= 1 << position
+        return mask
+
+
+_registry: Optional[ArtifactRegistry] = None
+_lock = threading.Lock()
+
+
+def get_artifact_registry() -> ArtifactRegistry:
+    """Реестр для текущих данных каталога; пересобирается, только если каталог перечитан (reset_catalog)."""
+    global _registry
+    table = load_catalog_file(ARTIFACTS_FILE)
+    registry = _registry
+    if registry is None or registry.source is not table:
+        with _lock:
+            if _registry is None or _registry.source is not table:
+                _registry = ArtifactRegistry(table)
+            registry = _registry
+    return registry
@@ -1,534 +0,0 @@
-ARTIFACTS_BY_PROFESSION = {
-    # Социально-экономическая
-    "Экономика": {
-        "branch": "social_economic",
-        "emoji": "💰",
-        "ru": {
-            "name": "Весы Медного Изобилия",
-            "desc": "Тотем в виде древних весов, на одной чаше — зерно, на другой — слиток золота. Это подношение символизирует равновесие между материальным достатком и справедливым распределением. Народ верит: тот, кто владеет весами, управляет процветанием."
-        },
-        "ky": {
-            "name": "Жезден Береке Таразасы",
-            "desc": "Бир таразасында дан, экинчисинде алтын куймасы бар байыркы тараза. Бул белек материалдык жетишкендик менен адилет бөлүштүрүүнүн тең салмагын билдирет. Эл ишенет: тараза ээси — гүлдөөнүн кожоюну."
-        }
-    },
-    "Менеджмент": {
-        "branch": "social_economic",
-        "emoji": "🧠",
-        "ru": {
-            "name": "Жезл Четырёх Колонн",
-            "desc": "Ритуальный жезл с гравировкой четырёх стихий: Ресурсы, Время, Люди и Цель. Жезл вручается тем, кто умеет направить хаос к порядку, собрать разрозненные элементы в единое дело."
-        },
-        "ky": {
-            "name": "Төрт Тирек Таягы",
-            "desc": "Төрт стихия: Ресурстар, Убакыт, Адамдар жана Максат чегилген ритуалдык таяк. Бул таяк башаламандыкты тартипке келтирип, бөлөк-бөлөк нерселерди бир бүтүн ишке айланта алгандарга берилет."
-        }
-    },
-    "Психология": {
-        "branch": "social_economic",
-        "emoji": "🧠",
-        "ru": {
-            "name": "Кристалл Понимания",
-            "desc": "Кристалл, отражающий чувства и мысли каждого, кто на него смотрит. Символ эмпатии, поддержки и внутренней гармонии."
-        },
-        "ky": {
-            "name": "Түшүнүү кристаллы",
-            "desc": "Ким караса — ошол адамдын сезимдерин жана ойлорун чагылдырган кристалл. Боорукерликтин, колдоонун жана ички гармониянын символу."
-        }
-    },
-    "Политология": {
-        "branch": "social_economic",
-        "emoji": "⚖️",
-        "ru": {
-            "name": "Перо Закона",
-            "desc": "Символ древнего права: перо, написавшее первые слова о свободе и равенстве. Народ подносит его как знак доверия тому, кто создаёт структуры и идеи, формирующие цивилизацию."
-        },
-        "ky": {
-            "name": "Мыйзам Калеми",
-            "desc": "Кылымдар мурасы — эркиндик жана теңдик тууралуу алгачкы сөздөрдү жазган калем. Эл бул белекти коомду түзгөн жана өнүктүргөн инсандарга ишеним белгиси катары берет."
-        }
-    },
-    "Социология": {
-        "branch": "social_economic",
-        "emoji": "🕸️",
-        "ru": {
-            "name": "Сеть Тысячи Голосов",
-            "desc": "Ткань, сотканная из нитей, каждая из которых символизирует отдельную судьбу. Этот тотем вручают исследователям человеческих связей и создателям общества как организма."
-        },
-        "ky": {
-            "name": "Миң Добуштун Тармагы",
-            "desc": "Ар бир жип өзүнчө тагдырды билдирген кездеме. Бул тотем адамзат байланыштарын изилдеген жана коомду бир организм катары жараткан инсандарга берилет."
-        }
-    },
-    "Бизнес-информатика": {
-        "branch": "social_economic",
-        "emoji": "💎",
-        "ru": {
-            "name": "Ядро Архитектора",
-            "desc": "Светящийся куб, внутри которого движутся потоки данных, словно реки света. Это подношение мастерам цифровых миров, которые создают новые структуры мышления и процессов."
-        },
-        "ky": {
-            "name": "Архитектордун Өзөгү",
-            "desc": "Ичинде маалымат агымдары жарык дарыялардай айланган жаркыраган куб. Бул белек санарип дүйнөнүн усталарына — жаңы ой жүгүртүү жана процесстерди түзгөндөргө арналган."
-        }
-    },
-    "Маркетинг": {
-        "branch": "social_economic",
-        "emoji": "🔥",
-        "ru": {
-            "name": "Факел Первоэволюция",
-            "desc": "Огненный символ, зажигаемый при рождении идей. Вручается тем, кто способен вдохновить массы, превратить желание в движение, а движение — в смысл."
-        },
-        "ky": {
-            "name": "Биринчи Эволюциянын Факели",
-            "desc": "Идея жаралганда тутанган оттуу символ. Элди шыктандырып, каалоону кыймылга, кыймылды мааниге айланта алгандарга берилет."
-        }
-    },
-    "Финансы и кредит": {
-        "branch": "social_economic",
-        "emoji": "💰",
-        "ru": {
-            "name": "Монета Вечного Обмена",
-            "desc": "Одна сторона — хлеб, другая — рукопожатие. Это знак доверия к тем, кто движет потоки богатства не ради накопления, а ради развития и поддержки."
-        },
-        "ky": {
-            "name": "Түбөлүк Алмашуунун Теңгеси",
-            "desc": "Бир жагы — нан, экинчиси — кол алышуу. Бул байлыk агымын топтоо үчүн эмес, өнүгүү жана колдоо үчүн багыттаган инсандарга ишеним белгиси."
-        }
-    },
-    "Государственное и муниципальное управление": {
-        "branch": "social_economic",
-        "emoji": "🔑",
-        "ru": {
-            "name": "Ключ от Врат Города",
-            "desc": "Огромный металлический ключ с резьбой в форме карт улиц. Его подносят тем, кто открывает двери для справедливости, порядка и заботы в масштабах сообщества."
-        },
-        "ky": {
-            "name": "Шаар Дарбазасынын Ачкычы",
-            "desc": "Көчө карталары чегилген чоң металл ачкыч. Бул ачкыч коомдук адилеттүүлүк, тартип жана камкордук үчүн эшик ачкандарга берилет."
-        }
-    },
-    "Международные отношения": {
-        "branch": "social_economic",
-        "emoji": "🌏",
-        "ru": {
-            "name": "Чаша Народов",
-            "desc": "Кубок, составленный из частей десяти различных культур, инкрустированный фразами на разных языках. Символ мира, доверия и искусства находить общее между непохожими."
-        },
-        "ky": {
-            "name": "Элдер Чөйчөгү",
-            "desc": "Ар түрдүү маданияттардын бөлүктөрүнөн куралган, ар тилде сөздөр жазылган чөйчөк. Бул — тынчтыктын, ишенимдин жана окшоштукту табуу өнөрүнүн символу."
-        }
-    },
-    # Естественно-научная
-    "Биология": {
-        "branch": "natural_science",
-        "emoji": "🧬",
-        "ru": {
-            "name": "Костяной гербарий",
-            "desc": "Изогнутая коробка из слоновой кости мутанта, внутри которой — засушенные, но живые образцы флоры Зоны. Говорят, если положить туда семя — оно оживёт. Символ: Знание жизни среди смерти."
-        },
-        "ky": {
-            "name": "Сөөк гербарийи",
-            "desc": "Мутанттын сөөгүнөн ийри жасалган куту, ичинде кургап, бирок тирүү өсүмдүктөр бар. Айтышат: урукту салса — тирилет. Символу: Өлүмдүн ичинде жашоону билүү."
-        }
-    },
-    "Химия": {
-        "branch": "natural_science",
-        "emoji": "🧪",
-        "ru": {
-            "name": "Аурохим",
-            "desc": "Фляжка из облучённого стекла, вечно наполненная голубым раствором. При встряхивании испускает фосфоресцирующий дым. Символ: Чистая формула среди хаоса вещества."
-        },
-        "ky": {
-            "name": "Аурохим",
-            "desc": "Сугарылган айнектен жасалган, ар дайым көк суюктукка толгон фляга. Чайкаганда фосфорлуу түтүн чыгат. Символу: Заттардын башаламандыгында таза формула."
-        }
-    },
-    "Физика": {
-        "branch": "natural_science",
-        "emoji": "⚛️",
-        "ru": {
-            "name": "Резонатор Грома",
-            "desc": "Портативная катушка с древними формулами, вырезанными на корпусе. Когда Зона вибрирует — он поёт. Символ: Управление силами, что рвут реальность."
-        },
-        "ky": {
-            "name": "Күркүрө Резонатору",
-            "desc": "Эски формулалар чегилген көчмө катушка. Зона термелгенде — ырдайт. Символу: Чындыкты жараткан күчтөрдү башкаруу."
-        }
-    },
-    "Экология": {
-        "branch": "natural_science",
-        "emoji": "🌿",
-        "ru": {
-            "name": "Корень Последнего Леса",
-            "desc": "Узловатая древесная спираль, проросшая через сталь. Удерживает баланс даже в кислоте. Символ: Память природы, что отомстила и выжила."
-        },
-        "ky": {
-            "name": "Акыркы Токойдун Тамыры",
-            "desc": "Бугулуу жыгач спираль, болоттон өсүп чыккан. Кислотада да тең салмакты сактайт. Символу: Табияттын өч алуусу жана тирүү калуусу."
-        }
-    },
-    "География": {
-        "branch": "natural_science",
-        "emoji": "🗺️",
-        "ru": {
-            "name": "Карта Живой Земли",
-            "desc": "Кожа титана, вытравленная координатами, меняющимися при приближении к новым аномалиям. Символ: Путь через изменившийся мир."
-        },
-        "ky": {
-            "name": "Жандуу Жердин Картасы",
-            "desc": "Титан терисине түшүрүлгөн координаттар, жаңы аномалияга жакындаганда өзгөрөт. Символу: Өзгөргөн дүйнө аркылуу жол."
-        }
-    },
-    "Геология": {
-        "branch": "natural_science",
-        "emoji": "🗿",
-        "ru": {
-            "name": "Осколок Сердца Плиты",
-            "desc": "Камень, найденный на глубине 12 км. Он пульсирует. Его нельзя нагреть, нельзя разбить. Символ: Вечность материи и глубины."
-        },
-        "ky": {
-            "name": "Плитанын Жүрөк Чачырандысы",
-            "desc": "12 км тереңдиктен табылган таш. Ал согот. Ысыта да, сындыра да албайсың. Символу: Заттын жана тереңдиктин түбөлүктүүлүгү."
-        }
-    },
-    "Фармация": {
-        "branch": "natural_science",
-        "emoji": "💊",
-        "ru": {
-            "name": "Ампула Ковчега",
-            "desc": "Последняя сыворотка до-катастрофной эпохи. Противоядие, лекарство, яд — никто точно не знает. Символ: Сила исцелять или уничтожать одним касанием."
-        },
-        "ky": {
-            "name": "Ковчоктун Ампуласы",
-            "desc": "Кырсыктан мурунку акыркы сыворотка. Каршы дарыбы, дарыбы, уу — эч ким билбейт. Символу: Бир тийүү менен айыктыруу же жок кылуу күчү."
-        }
-    },
-    "Медицина": {
-        "branch": "natural_science",
-        "emoji": "🏥",
-        "ru": {
-            "name": "Шприц Возрождения",
-            "desc": "Инструмент, выкованный из титанового ребра павшего гиганта. В его полости — сыворотка второй жизни. Символ: Возвращение надежды сквозь боль."
-        },
-        "ky": {
-            "name": "Жаңылануу Шприци",
-            "desc": "Кулап калган алптын титан кабыргасынан жасалган аспап. Ичинде — экинчи өмүрдүн сывороткасы. Символу: Оору аркылуу үмүттү кайтаруу."
-        }
-    },
-    "Ветеринария": {
-        "branch": "natural_science",
-        "emoji": "🐾",
-        "ru": {
-            "name": "Зуб Древнего",
-            "desc": "Клык хищника до-человеческой эпохи. Привязывается к тому, кто спасает животных. Символ: Связь с дикой природой, даже у мутировавших."
-        },
-        "ky": {
-            "name": "Байыркынын Тиши",
-            "desc": "Адамга чейинки доордун жырткыч тиши. Жаныбарларды сактагандарга байланат. Символу: Жапайы табият менен байланыш, мутанттарда да."
-        }
-    },
-    "Математика (теоретическая)": {
-        "branch": "natural_science",
-        "emoji": "📐",
-        "ru": {
-            "name": "Куб Несходимости",
-            "desc": "Геометрическая конструкция, нарушающая перспективу. Похоже, она существует в четырёх измерениях. Символ: Разум, способный видеть сквозь законы Вселенной."
-        },
-        "ky": {
-            "name": "Айкалышпаган Куб",
-            "desc": "Перспективага баш ийбеген геометриялык түзүлүш. Төрт өлчөмдө бардай. Символу: Аалам мыйзамдарын көрө билген акыл."
-        }
-    },
-    # Техническая (инженерно-техническая)
-    "Программная инженерия": {
-        "branch": "technical",
-        "emoji": "🖥️",
-        "ru": {"name": "Чёрный кодекс Обнуления", "desc": "Книга в стальном переплёте, исписанная исцеляющими и разрушающими алгоритмами. При её открытии можно отключить любой враждебный ИИ — или воскресить обломки цивилизации из цифровой пыли."},
-        "ky": {"name": "Обнулоо Кара кодекси", "desc": "Болоттон жасалган, айыктыруучу жана кыйратуучу алгоритмдер менен толтурулган китеп. Аны ачсаң — душман ИИ өчөт же санарип урандылар тирилет."}
-    },
-    "Информатика и вычислительная техника": {
-        "branch": "technical",
-        "emoji": "💻",
-        "ru": {"name": "Сердце ЦП — Кремниевый Разум", "desc": "Пульсирующий процессор, окружённый сетью кабелей, как нейронной сетью. Он способен хранить разум погибшего учёного — и отвечать, если ты задашь правильный вопрос."},
-        "ky": {"name": "ЦП Жүрөгү — Кремний Акылы", "desc": "Кабелдер менен курчалган, согуп турган процессор. Илимпоздун акылын сактап, туура суроо берсең — жооп берет."}
-    },
-    "Механика и машиностроение": {
-        "branch": "technical",
-        "emoji": "🔧",
-        "ru": {"name": "Ключ Гиганта", "desc": "Огромный, покрытый ржавчиной гаечный ключ, который может чинить любую машину... или стать оружием против стальных зверей пустоши."},
-        "ky": {"name": "Алыптын ачкычы", "desc": "Ири, дат баскан ачкыч — каалаган машинаны оңдойт же темир жырткычтарга каршы курал болот."}
-    },
-    "Электроника и наноэлектроника": {
-        "branch": "technical",
-        "emoji": "⚡",
-        "ru": {"name": "Искровой Символ", "desc": "Микросхема, заключённая в стекло, испускает вспышки энергии, когда её поднести к артефактам. Может запустить мёртвые устройства... или вызвать бурю."},
-        "ky": {"name": "Учкун Белгиси", "desc": "Шишкеге салынган микросхема — артефактка жакындаганда учкун чачат. Өлгөн аппаратты жандандырат же бороон чыгарат."}
-    },
-    "Архитектура": {
-        "branch": "technical",
-        "emoji": "🏛️",
-        "ru": {"name": "Метр Молчащих Башен", "desc": "Линейка из окаменевшего стекла, по легенде — из руин первой башни Нового Города. Тот, кто владеет ею, может начертить путь через развалины и построить неприступный форт."},
-        "ky": {"name": "Дымсыз Мурас Метр", "desc": "Катып калган айнектен жасалган сызгыч — алгачкы мунаранын урандыларынан. Ээси урандылардан жол чийип, бекем чеп сала алат."}
-    },
-    "Строительство": {
-        "branch": "technical",
-        "emoji": "🧱",
-        "ru": {"name": "Камень Основателя", "desc": "Грубый, трещнувший кирпич, взятый из первого убежища, что выдержало Очищающее Пламя. На его поверхности — чертёж спасения."},
-        "ky": {"name": "Негиздөөчүнүн ташы", "desc": "Жарылган, орой кыш — биринчи башпаанектен алынган. Үстүндө — куткаруунун чиймеси."}
-    },
-    "Системотехника": {
-        "branch": "technical",
-        "emoji": "🖥️",
-        "ru": {"name": "Консоль Единого Контроля", "desc": "Устройство на запястье, которое соединяется со всеми работающими машинами. Если системы мира разрознены — ты тот, кто может заставить их снова работать в унисон."},
-        "ky": {"name": "Бирдиктүү Башкаруу Консолу", "desc": "Билекке тагылган аппарат — бардык машиналарга туташат. Дүйнө системалары ажыраса — сен аларды кайра бириктиресиң."}
-    },
-    "Автоматизация и управление": {
-        "branch": "technical",
-        "emoji": "🤖",
-        "ru": {"name": "Пульт Протокола Р", "desc": "Потёртый блок управления с одной красной кнопкой и экраном, на котором когда-то отражалась судьба целого завода. Он может подчинить себе любую автономную систему."},
-        "ky": {"name": "Р Протоколунун Пульту", "desc": "Эскирген башкаруу блогу — бир кызыл баскычы, экранында бир кезде заводдун тагдыры чагылчу. Ар бир автономдуу системаны баш ийдирет."}
-    },
-    "Робототехника": {
-        "branch": "technical",
-        "emoji": "🦾",
-        "ru": {"name": "Око Меха", "desc": "Одинокий оптический сенсор, извлечённый из павшего робота-защитника. Его свет мерцает, когда рядом тает угроза... или спасение."},
-        "ky": {"name": "Мех Көзү", "desc": "Кулап калган роботтон алынган жалгыз сенсор. Жакында коркунуч же куткаруу болсо — жарыгы жанып турат."}
-    },
-    "Авиа- и ракетостроение": {
-        "branch": "technical",
-        "emoji": "🚀",
-        "ru": {"name": "Оперение Последнего Полёта", "desc": "Обломок стабилизатора с последнего челнока, что покинул Землю. Его ржавый корпус несёт на себе гравировку: 'Только небо — наш предел'. Прикоснись — и вспомни, что ты способен построить путь в звёзды."},
-        "ky": {"name": "Акыркы учуунун канаты", "desc": "Жерди таштап кеткен акыркы кеменин стабилизаторунун сыныгы. Үстүндө: 'Бизге асман гана чегара' деп жазылган. Кол тийсе — жылдыздарга жол сала аларыңды эстейсин."}
-    },
-    # Гуманитарная
-    "История": {
-        "branch": "humanitarian",
-        "emoji": "📜",
-        "ru": {"name": "Свиток Времён", "desc": "Старинный свиток, на котором записаны судьбоносные события. Символ памяти, мудрости и уроков прошлого."},
-        "ky": {"name": "Замандардын түрмөгү", "desc": "Тагдыр чечкен окуялар жазылган эски түрмөк. Эстутумдун, акылмандыктын жана өткөндүн сабактарынын символу."}
-    },
-    "Филология": {
-        "branch": "humanitarian",
-        "emoji": "📚",
-        "ru": {"name": "Книга Слов", "desc": "Том, в котором собраны самые важные слова мира. Символ общения, культуры и силы языка."},
-        "ky": {"name": "Сөздөрдүн китеби", "desc": "Дүйнөдөгү эң маанилүү сөздөр топтолгон китеп. Баарлашуунун, маданияттын жана тилдин күчүнүн символу."}
-    },
-    "Право": {
-        "branch": "humanitarian",
-        "emoji": "⚖️",
-        "ru": {"name": "Весы Справедливости", "desc": "Весы, которые всегда показывают истину. Символ честности, порядка и баланса."},
-        "ky": {"name": "Адилеттик таразасы", "desc": "Ар дайым чындыкты көрсөтчү тараза. Тууралуулуkтун, тартиптин жана тең салмактуулуkтун символу."}
-    },
-    "Социальная работа": {
-        "branch": "humanitarian",
-        "emoji": "💝",
-        "ru": {"name": "Сердце Путеводное", "desc": "Компас Милосердия, не ведающий ни севера, ни границ."},
-        "ky": {"name": "Жүрөктүн компасы", "desc": "Түндүк да, чек да билбеген ырайым компасы. Боорукерликтин жана чексиз жардамдын символу."}
-    },
-    # Прикладно-технологическая рабочие специальности
-    "Слесарное дело": {
-        "branch": "applied_technology",
-        "emoji": "🔧",
-        "ru": {"name": "Ключ Вечного Зазора", "desc": "Легендарный гаечный ключ, вручённый мастеру, чьи руки «закрутили» мост через бурную реку. Символ точности, усилия и крепости узлов."},
-        "ky": {"name": "Түбөлүктүү Боштуктун ачкычы", "desc": "Ташкындаган дарыяга көпүрө курган усталарга берилген уламыш ачкыч. Тактык, эмгек жана бекемдиктин символу."}
-    },
-    "Электромонтаж": {
-        "branch": "applied_technology",
-        "emoji": "⚡",
-        "ru": {"name": "Искра Первородной Сети", "desc": "Осколок первого кабеля, от которого загорелись уличные фонари. Символ энергии, света и управления скрытыми силами."},
-        "ky": {"name": "Түпкү Тармактын учкуну", "desc": "Биринчи көчө чырактарын жандырган кабелдин сыныгы. Энергиянын, жарыктын жана жашыруун күчтөрдү башкаруунун символу."}
-    },
-    "Автомеханика": {
-        "branch": "applied_technology",
-        "emoji": "🚗",
-        "ru": {"name": "Коленвал Мира", "desc": "Часть двигателя, запустившего первую машину великого кочевника. Символ движения, надёжности и ритма железного сердца."},
-        "ky": {"name": "Тынчтыктын коленвалы", "desc": "Улуу көчмөндүн алгачкы машинасын иштеткен кыймылдаткычтын бөлүгү. Кыймылдын, ишенимдүүлүктүн жана темир жүрөктүн ритминин символу."}
-    },
-    "Сварочные технологии": {
-        "branch": "applied_technology",
-        "emoji": "🔥",
-        "ru": {"name": "Пламя Скрепляющего Братства", "desc": "Огонь, что сплавил воедино броню древних машин. Символ единства, мастерства и горячего сердца."},
-        "ky": {"name": "Биримдик Отунун жалыны", "desc": "Көөнө машиналардын бронясын бириктирген от. Биримдиктин, чеберчиликтин жана ысык жүрөктүн символу."}
-    },
-    "Токарное и фрезерное дело": {
-        "branch": "applied_technology",
-        "emoji": "⚙️",
-        "ru": {
-            "name": "Ось Вечной Точности",
-            "desc": "Сверло, выточенное вручную до абсолютной симметрии. Символ геометрии, сосредоточенности и бесконечного вращения."
-        }
-    },
-    "Поварское дело": {
-        "branch": "applied_technology",
-        "emoji": "🍳",
-        "ru": {"name": "Сковорода Великого Пира", "desc": "Чугунная сковорода, на которой готовили угощения для целого города. Символ гостеприимства, заботы и радости."},
-        "ky": {"name": "Улуу Даамдын табасы", "desc": "Бүтүндөй шаарга тамак жасалган чоюн таба. Конокчулдуктун, камкордуктун жана кубанычтын символу."}
-    },
-    "Техническое обслуживание транспорта": {
-        "branch": "applied_technology",
-        "emoji": "🔩",
-        "ru": {
-            "name": "Ремень Перехода Пути",
-            "desc": "Фрагмент транспортного ремня, спасшего колонну в бурю. Символ надёжности, скрытой работы и бдительности."
-        }
-    },
-    "Столярное дело": {
-        "branch": "applied_technology",
-        "emoji": "🪚",
-        "ru": {"name": "Стружка Вечной Мастерской", "desc": "Древесная стружка, не теряющая запаха даже через века. Символ ремесла, памяти и уюта."},
-        "ky": {"name": "Түбөлүк устакананын жондуру", "desc": "Кылымдар өтсө да жытын жоготпогон жыгач жондуру. Кол өнөрчүлүктүн, эстутумдун жана жылуулуkтун символу."}
-    },
-    "Обслуживание зданий и сооружений": {
-        "branch": "applied_technology",
-        "emoji": "🏗️",
-        "ru": {
-            "name": "Уровень Основателя",
-            "desc": "Бронзовый строительный уровень, которым выровняли основание ратуши. Символ устойчивости, контроля и скрытой архитектуры."
-        }
-    },
-    "Машинист подъёмных машин": {
-        "branch": "applied_technology",
-        "emoji": "🏗️",
-        "ru": {
-            "name": "Штурвал Стального Великана",
-            "desc": "Руль первого подъёмного крана, поднявшего колокол собора. Символ мощи, высоты и точного управления тяжестью."
-        }
-    },
-    "Парикмахерское искусство": {
-        "branch": "applied_technology",
-        "emoji": "✂️",
-        "ru": {"name": "Ножницы Преображения", "desc": "Старинные ножницы, которыми меняли судьбы героев. Символ перемен, красоты и уверенности."},
-        "ky": {"name": "Өзгөрүүнүн кайчысы", "desc": "Баатырлардын тагдырын өзгөрткөн эски кайчы. Өзгөрүүнүн, сулуулуkтун жана ишенимдин символу."}
-    },
-    "Технология моды": {
-        "branch": "applied_technology",
-        "emoji": "👗",
-        "ru": {"name": "Игла Судьбы", "desc": "Золотая игла, которой сшиты наряды для великих праздников. Символ вдохновения, стиля и тонкой работы."},
-        "ky": {"name": "Тагдыр Ийнеси", "desc": "Улуу майрамдарга кийим тиккен алтын ийне. Шыктын, стилдин жана назик эмгектин символу."}
-    },
-    "Садово-парковое строительство": {
-        "branch": "applied_technology",
-        "emoji": "🌳",
-        "ru": {"name": "Семя Возрождения", "desc": "Семечко, из которого выросли сады на месте руин. Символ надежды, заботы о природе и новых начал."},
-        "ky": {"name": "Кайра жаралуу уругу", "desc": "Урандылардын ордуна бак өстүргөн уруkтун данеги. Үмүттүн, жаратылышка камкордуктун жана жаңы башаттын символу."}
-    },
-    # Творческо-художественная
-    "Дизайн (графический, промышленный, одежды)": {
-        "branch": "creative_art",
-        "emoji": "🎨",
-        "ru": {"name": "Палитра Перемен", "desc": "Дощечка с пятнами красок, на которой смешивались цвета для новых миров. Символ вдохновения, смелости и поиска красоты."},
-        "ky": {"name": "Өзгөрүү Палитрасы", "desc": "Жаңы дүйнөлөрдүн түстөрү аралашкан тактайча. Шыктын, тайманбастыктын жана сулуулуkту издөөнүн символу."}
-    },
-    "Живопись и изобразительное искусство": {
-        "branch": "creative_art",
-        "emoji": "🖌️",
-        "ru": {"name": "Кисть Рассвета", "desc": "Кисть, которой был нарисован первый рассвет после долгой ночи. Символ надежды, света и новых начинаний."},
-        "ky": {"name": "Таңдын Кисти", "desc": "Узак түндөн кийин алгачкы таң сүрөттөлгөн кисть. Үмүттүн, жарыктын жана жаңы башаттын символу."}
-    },
-    "Музыка и сценическое искусство": {
-        "branch": "creative_art",
-        "emoji": "🎵",
-        "ru": {"name": "Струна Вдохновения", "desc": "Оборванная струна, на которой играли гимн Возрождения. Символ гармонии, силы звука и единства сердец."},
-        "ky": {"name": "Шыктын кылдары", "desc": "Кайра жаралуу гимни ойнолгон үзүлгөн кыл. Ынтымактын, үндүн күчүнүн жана жүрөктөрдүн биримдигинин символу."}
-    },
-    "Театр и кино": {
-        "branch": "creative_art",
-        "emoji": "🎭",
-        "ru": {"name": "Маска Чистой Эмоции", "desc": "Маска, на которой отражаются все чувства мира. Символ искренности, перевоплощения и силы искусства."},
-        "ky": {"name": "Таза Сезим Маскасы", "desc": "Дүйнөдөгү бардык сезимдер чагылдырылган маска. Чын ыкластын, түрлөнүүнүн жана искусствонун күчүнүн символу."}
-    },
-    "Литературное творчество": {
-        "branch": "creative_art",
-        "emoji": "📜",
-        "ru": {"name": "Первоисточник", "desc": "Свиток, на котором записана первая история нового мира. Символ памяти, мудрости и силы слова."},
-        "ky": {"name": "Баштапкы Булак", "desc": "Жаңы дүйнөнүн алгачкы окуясы жазылган түрмөк. Эстутумдун, акылмандыктын жана сөздүн күчүнүн символу."}
-    },
-    "Фотография и видеосъёмка": {
-        "branch": "creative_art",
-        "emoji": "📷",
-        "ru": {"name": "Объектив Времени", "desc": "Линза, в которой застыли мгновения прошлого и будущего. Символ памяти, наблюдательности и умения видеть невидимое."},
-        "ky": {"name": "Убакыт Объективи", "desc": "Өткөн жана келечек учурлар тоңгон линза. Эстутумдун, байкоочулуктун жана көрүнбөгөндү көрө билүүнүн символу."}
-    },
-    "Декоративно-прикладное искусство": {
-        "branch": "creative_art",
-        "emoji": "🧵",
-        "ru": {"name": "Нить Судьбы", "desc": "Золотая нить, вплетённая в узор великого ковра. Символ связи времён, традиций и мастерства."},
-        "ky": {"name": "Тагдыр Жиби", "desc": "Улуу килемдин оюусуна киргизилген алтын жип. Замандардын, салттын жана чеберчиликтин символу."}
-    },
-    "Архитектура и пространственный дизайн": {
-        "branch": "creative_art",
-        "emoji": "🏰",
-        "ru": {"name": "Камень Мечты", "desc": "Камень из основания самого красивого здания нового мира. Символ мечты, созидания и гармонии."},
-        "ky": {"name": "Кыял Ташы", "desc": "Жаңы дүйнөдөгү эң кооз имараттын пайдубалынан алынган таш. Кыялдын, жаратуунун жана гармониянын символу."}
-    },
-    "Актёрское мастерство": {
-        "branch": "creative_art",
-        "emoji": "🎭",
-        "ru": {
-            "name": "Маска Тысячи Ликов",
-            "desc": "Маска, способная принимать любой облик. Символ перевоплощения, искренности и силы эмоций."
-        },
-        "ky": {"name": "Миң Келбет Маскасы", "desc": "Каалаган түргө айлана алган маска. Түрлөнүүнүн, чын ыкластын жана сезим күчүнүн символу."}
-    },
-    "Режиссура": {
-        "branch": "creative_art",
-        "emoji": "🎬",
-        "ru": {
-            "name": "Око Великой Сцены",
-            "desc": "Линза в оправе, похожей на театральный прожектор, в центре которой — вечный круговорот света и тени. Это тотем режиссёра, что соединяет хаос в сюжет."
-        }
-    },
-    "Фотография": {
-        "branch": "creative_art",
-        "emoji": "📷",
-        "ru": {
-            "name": "Объектив Времени",
-            "desc": "Легендарный объектив, внутри которого вращаются образы прошедших эпох. Он показывает не то, что есть — а то, что осталось. Народ дарит его тому, кто ловит мгновение в вечность."
-        }
-    },
-    "Хореография": {
-        "branch": "creative_art",
-        "emoji": "💃",
-        "ru": {
-            "name": "Сандалии Ветра",
-            "desc": "Танцевальная обувь, сплетённая из шёлка и мифической травы. Лёгкие как дыхание, они дарят чувство движения даже в покое. Народ вручает их тем, кто говорит телом."
-        },
-        "ky": {"name": "Шамалдын туфлиси", "desc": "Булетке бийлегенде булуттарда да бийлей ала турган туфли. Жеңилдиктин, кыймылдын жана шыктын символу."}
-    },
-    "Мода и текстиль": {
-        "branch": "creative_art",
-        "emoji": "🧵",
-        "ru": {
-            "name": "Нить Преображения",
-            "desc": "Бесконечная серебряная нить, из которой были сотканы первые образцы стиля. Считается, что она может переписать судьбу человека, если вплести её в ткань. Дар стилисту-создателю."
-        }
-    },
-    "Арт-менеджмент": {
-        "branch": "creative_art",
-        "emoji": "🎨",
-        "ru": {
-            "name": "Скипетр Вдохновения",
-            "desc": "Посох, инкрустированный символами искусств: кисть, маска, камертон. Его держит тот, кто направляет художников, не вмешиваясь в их пороки. Народ вручил его проводнику великих идей."
-        }
-    },
-    "Сценография и костюм": {
-        "branch": "creative_art",
-        "emoji": "👘",
-        "ru": {"name": "Плащ Перевоплощения", "desc": "Плащ, в котором можно стать кем угодно на сцене. Символ фантазии, свободы и творческого поиска."},
-        "ky": {"name": "Түрлөнүү Кийими", "desc": "Сахнада каалаган образга айланта турган плащ. Кыялдын, эркиндиктин жана чыгармачылык изденүүнүн символу."}
-    },
-    "Декоративное искусство": {
-        "branch": "creative_art",
-        "emoji": "🪡",
-        "ru": {"name": "Игла Мастера", "desc": "Игла, которой создаются самые изысканные узоры. Символ мастерства, терпения и красоты."},
-        "ky": {"name": "Уста Ийнеси", "desc": "Эң кооз оймо-чиймелерди жараткан ийне. Чеберчиликтин, чыдамкайлыктын жана сулуулуkтун символу."}
-    },
-    "Дизайн среды": {
-        "branch": "creative_art",
-        "emoji": "🏡",
-        "ru": {"name": "Ключ Пространства", "desc": "Ключ, открывающий двери в самые гармоничные пространства. Символ уюта, гармонии и вдохновения."},
-        "ky": {"name": "Мейкиндик ачкычы", "desc": "Эң гармониялуу мейкиндиктерге эшик ачкан ачкыч. Жайлуулуkтун, гармониянын жана шыктын символу."}
-    },
-} 
\ No newline at end of file
@@ -0,0 +1,418 @@
+"""
+Микробенчмарки горячих путей сцен: текст и клавиатура сцены, подсчёт баллов, карточка результата,
+история тестов, загрузка сцен. Нужны, чтобы каждое изменение движка сцен можно было измерить
+и чтобы замедление не проходило незамеченным.
+
+Время бенчмарка — минимум из коротких серий timeit, в наносекундах на вызов. Вперемешку с ним
+меряется калибровка — эталонная чисто питоновская нагрузка; при сравнении время базовой линии
+масштабируется отношением калибровок, поэтому базовая линия, снятая на другой машине
+или в момент другой загрузки, остаётся пригодной. Замедление больше порога бенчмарка
+(по умолчанию --threshold), подтверждённое повторным замером, — регрессия, код выхода 1.
+
+    python -m utils.benchmarks                              # прогон и сравнение с базовой линией
+    python -m utils.benchmarks --save-baseline              # записать новую базовую линию
+    python -m utils.benchmarks --filter stats --json out.json
+    python -m utils.benchmarks --compare old.json new.json  # сравнить два сохранённых прогона
+"""
+import os
+
+# config требует токен при импорте обработчиков
+os.environ.setdefault("BOT_TOKEN", "0:benchmarks")
+
+import argparse
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+from utils.scene_bundle import SCENES_DIR, get_bundle, source_path, sources_hash
+
+BASELINE_PATH = Path(__file__).parent.parent / "data" / "benchmarks" / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+# имя -> (фабрика замеряемой функции, порог регрессии или None — общий)
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, threshold: Optional[float] = None):
+    """Регистрирует фабрику: она готовит данные и возвращает функцию без аргументов, время которой меряется."""
+    def register(factory: Callable[[], Callable[[], Any]]):
+        BENCHMARKS[name] = (factory, threshold)
+        return factory
+    return register
+
+
+# --- Данные ---
+
+@lru_cache(maxsize=None)
+def raw_scenes(category: str) -> List[Dict[str, Any]]:
+    """Сцены из исходного JSON (ru) — с гендерными шаблонами, как их видит genderize."""
+    return json.loads(source_path("ru", category).read_text(encoding="utf-8"))
+
+
+@lru_cache(maxsize=None)
+def scoring_model():
+    from utils.scoring import get_scoring_model
+    return get_scoring_model("ru")
+
+
+@lru_cache(maxsize=None)
+def finished_vector():
+    """Баллы после полного прохождения: базовые сцены и техническая ветка, варианты — случайные с фиксированным seed."""
+    model = scoring_model()
+    rng = random.Random(1)
+    vector = model.new_vector()
+    for scene in raw_scenes("base_scenes")[:6] + raw_scenes("technical")[:11]:
+        model.apply(vector, scene['id'], rng.choice(scene['options'])['id'])
+    return vector
+
+
+def history(count: int) -> List[Dict[str, Any]]:
+    """Строки test_results одного пользователя (новые первыми), как их отдаёт TestResultsManager."""
+    model = scoring_model()
+    rng = random.Random(count)
+    profiles = [model.names[i] for i in model.profile_ids]
+    professions = [model.names[i] for i in model.artifact_ids]
+    started = datetime(2025, 1, 1)
+    rows = []
+    for i in range(count, 0, -1):
+        details = {
+            "profile_scores": {name: rng.randint(0, 30) for name in profiles},
+            "profession_scores": {name: rng.randint(0, 20) for name in rng.sample(professions, 8)},
+            "answers": [[scene_id, str(rng.randint(1, 4))] for scene_id in range(1, 18)],
+            "scene_version": "0123456789ab",
+            "artifact": rng.choice(professions),
+            "lang": "ru",
+        }
+        rows.append({
+            "id": i, "telegram_id": 1, "finished_at": started + timedelta(hours=i),
+            "profile": rng.choice(profiles), "score": rng.randint(5, 60),
+            "details": json.dumps(details, ensure_ascii=False),
+        })
+    return rows
+
+
+def summary_of(rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    summary: Dict[str, int] = {}
+    for row in rows:
+        summary[row['profile']] = summary.get(row['profile'], 0) + 1
+    return summary
+
+
+def scenes_source() -> str:
+    """Откуда SceneManager читает сцены: замеры бандла и JSON между собой не сравниваются."""
+    return "bundle" if get_bundle() is not None else "json"
+
+
+# --- Рендер сцены ---
+
+@benchmark("genderize")
+def bench_genderize():
+    from handlers.test import genderize
+    scene = raw_scenes("base_scenes")[0]
+    text = "\n".join([scene.get('title', ''), scene.get('description', '')] + [opt['text'] for opt in scene['options']])
+    return lambda: genderize(text, 'female')
+
+
+@benchmark("get_scene_text")
+def bench_scene_text():
+    from handlers.test import get_scene_text
+    scene = raw_scenes("base_scenes")[0]
+    return lambda: get_scene_text(scene, 3, 17, gender='female')
+
+
+@benchmark("scene_keyboard")
+def bench_scene_keyboard():
+    from handlers.test import build_scene_keyboard
+    # последняя сцена ветки — самая длинная клавиатура (10 вариантов)
+    scene = raw_scenes("technical")[10]
+    return lambda: build_scene_keyboard(scene, 'personal', 'female')
+
+
+# --- Подсчёт баллов (handle_scene_callback) ---
+
+@benchmark("scene_scoring")
+def bench_scene_scoring():
+    model = scoring_model()
+    scene = raw_scenes("technical")[4]
+    option_id = str(scene['options'][2]['id'])
+    data = {"scores": list(finished_vector())}
+
+    def step():
+        scores = model.session_vector(data)
+        model.apply(scores, scene['id'], option_id)
+        return scores
+    return step
+
+
+@benchmark("scene_scoring[branch]")
+def bench_branch_choice():
+    model = scoring_model()
+    scores = finished_vector()
+    return lambda: model.top_k(scores, 1, model.profile_ids)
+
+
+# --- Карточка результата (show_test_result) ---
+
+@benchmark("result_text")
+def bench_result_text():
+    from handlers.test import compute_outcome, render_result_card
+    model = scoring_model()
+    scores = finished_vector()
+    return lambda: render_result_card(compute_outcome(model, scores, 'ru'), 'ru')
+
+
+@benchmark("result_text[cold]")
+def bench_result_text_cold():
+    from handlers.test import compute_outcome, render_result_card, result_cards
+    model = scoring_model()
+    scores = finished_vector()
+
+    def build():
+        result_cards.invalidate()
+        return render_result_card(compute_outcome(model, scores, 'ru'), 'ru')
+    return build
+
+
+# --- История тестов ---
+
+def _stats_full(count: int):
+    from utils.messages import format_test_stats
+    rows = history(count)
+    summary = summary_of(rows)
+    return lambda: format_test_stats(summary, rows, 'ru')
+
+
+def _stats_page(count: int):
+    from utils.messages import format_test_stats
+    rows = history(count)
+    summary = summary_of(rows)
+    page = rows[:settings.STATS_PAGE_SIZE]
+    pages = -(-count // settings.STATS_PAGE_SIZE)
+    return lambda: format_test_stats(summary, page, 'ru', 0, pages)
+
+
+for _count in (10, 100, 1000):
+    # вся история одним сообщением — масштабирование форматтера по строкам
+    benchmark(f"format_test_stats[{_count}]")(lambda count=_count: _stats_full(count))
+    # то, что реально делает бот: сводка по всей истории и одна страница
+    benchmark(f"format_test_stats[{_count},page]")(lambda count=_count: _stats_page(count))
+
+
+# --- Загрузка сцен ---
+
+@benchmark("load_scenes_file[base_scenes]", threshold=0.5)
+def bench_load_base():
+    from utils.scene_manager import SceneManager
+    manager = SceneManager(language='ru', gender='female')
+    return lambda: manager._load_scenes_file("base_scenes")
+
+
+@benchmark("load_scenes_file[technical]", threshold=0.5)
+def bench_load_branch():
+    from utils.scene_manager import SceneManager
+    manager = SceneManager(language='ru', gender='female')
+    return lambda: manager._load_scenes_file("technical")
+
+
+@benchmark("get_scene_by_id[base]", threshold=0.5)
+def bench_scene_by_id_base():
+    from utils.scene_manager import SceneManager
+    manager = SceneManager(language='ru')
+    scene_id = raw_scenes("base_scenes")[-1]['id']
+    return lambda: manager.get_scene_by_id(scene_id)
+
+
+@benchmark("get_scene_by_id[branch]", threshold=0.5)
+def bench_scene_by_id_branch():
+    from utils.scene_bundle import CATEGORIES
+    from utils.scene_manager import SceneManager
+    manager = SceneManager(language='ru')
+    # сцена последней ветки: без индекса бандла перебираются все файлы
+    scene_id = raw_scenes(CATEGORIES[-1])[-1]['id']
+    return lambda: manager.get_scene_by_id(scene_id)
+
+
+# --- Замер ---
+
+def _calibration_workload():
+    data = {f"key{i}": [i, str(i) * 3] for i in range(200)}
+    return json.dumps(data) + "".join(f"{key}={value[1]}" for key, value in data.items())
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Лучшее время вызова func и калибровки, замеренных короткими сериями вперемешку:
+    если машина на время замедлилась (соседние процессы, частота CPU), это видно в обоих.
+    """
+    timer, calibration = timeit.Timer(func), timeit.Timer(_calibration_workload)
+    # autorange подбирает число вызовов на ~0.2 с; серии в четыре раза короче
+    number = max(1, timer.autorange()[0] // 4)
+    calibration_number = max(1, calibration.autorange()[0] // 4)
+    best, best_calibration = float("inf"), float("inf")
+    for _ in range(repeat):
+        best_calibration = min(best_calibration, calibration.timeit(calibration_number))
+        best = min(best, timer.timeit(number))
+    return {
+        "ns_per_op": round(best / number * 1e9, 1),
+        "number": number,
+        "calibration_ns": round(best_calibration / calibration_number * 1e9, 1),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names: List[str], repeat: int) -> Dict[str, Any]:
+    results = {}
+    source = scenes_source()
+    for name in names:
+        factory, _ = BENCHMARKS[name]
+        result = measure(factory(), repeat)
+        if name.startswith(("load_scenes_file", "get_scene_by_id")):
+            result["source"] = source
+        results[name] = result
+        print(f"  {name:<36} {format_ns(result['ns_per_op']):>12}", flush=True)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "scenes_version": sources_hash(SCENES_DIR).hex()[:12],
+        "calibration_ns": min(result["calibration_ns"] for result in results.values()),
+        "benchmarks": results,
+    }
+
+
+def format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} µs"
+    return f"{ns:.0f} ns"
+
+
+# --- Сравнение ---
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Строки сравнения с базовой линией. status: ok, faster, regression,
+    new (нет в базовой линии) или skipped (сцены читаются из другого источника).
+    """
+    rows = []
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        row = {"name": name, "ns_per_op": result["ns_per_op"], "expected_ns": None, "ratio": None}
+        if base is None:
+            row["status"] = "new"
+        elif base.get("source") != result.get("source"):
+            row["status"] = "skipped"
+        else:
+            limit = BENCHMARKS[name][1] if name in BENCHMARKS and BENCHMARKS[name][1] is not None else threshold
+            # калибровка, замеренная вместе с бенчмарком; в старых файлах — общая на прогон
+            scale = (result.get("calibration_ns") or current["calibration_ns"]) / \
+                (base.get("calibration_ns") or baseline["calibration_ns"])
+            expected = base["ns_per_op"] * scale
+            ratio = result["ns_per_op"] / expected
+            row.update(expected_ns=round(expected, 1), ratio=round(ratio, 3))
+            if ratio > 1 + limit:
+                row["status"] = "regression"
+            elif ratio < 1 / (1 + limit):
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    print(f"\nСравнение с базовой линией (коммит {baseline.get('commit') or '-'}, {baseline.get('created', '-')}):")
+    marks = {"ok": "", "faster": "быстрее", "regression": "⚠️ РЕГРЕССИЯ", "new": "новый", "skipped": "другой источник сцен"}
+    for row in rows:
+        ratio = f"×{row['ratio']:.2f}" if row["ratio"] is not None else "—"
+        print(f"  {row['name']:<36} {format_ns(row['ns_per_op']):>12} {ratio:>7}  {marks[row['status']]}")
+
+
+def load_json(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def write_json(path: Path, data: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Микробенчмарки рендера сцен и подсчёта баллов")
+    parser.add_argument("--filter", help="только бенчмарки, в имени которых есть эта подстрока")
+    parser.add_argument("--repeat", type=int, default=15, help="повторов замера (берётся лучший)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое замедление относительно базовой линии (0.25 = 25%%)")
+    parser.add_argument("--retries", type=int, default=2, help="повторных замеров для подтверждения регрессии")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="записать результаты как базовую линию")
+    parser.add_argument("--json", type=Path, help="записать результаты в JSON")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"),
+                        help="сравнить два сохранённых прогона без замеров")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.compare:
+        old, new = (load_json(path) for path in args.compare)
+        rows = compare(new, old, args.threshold)
+        print_comparison(rows, old)
+        return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+    if args.save_baseline and args.filter:
+        # калибровка общая на файл — базовая линия снимается только целиком
+        print("--save-baseline нельзя сочетать с --filter")
+        return 1
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    if not names:
+        print(f"Нет бенчмарков по фильтру {args.filter!r}")
+        return 1
+    print(f"Бенчмарков: {len(names)}, повторов: {args.repeat}, сцены: {scenes_source()}")
+    current = run(names, args.repeat)
+    baseline = None
+    if not args.save_baseline and args.baseline.exists():
+        baseline = load_json(args.baseline)
+        rows = compare(current, baseline, args.threshold)
+        # регрессия засчитывается, только если подтверждается повторными замерами
+        for _ in range(args.retries):
+            suspects = [row["name"] for row in rows if row["status"] == "regression"]
+            if not suspects:
+                break
+            print(f"\nПовторный замер: {', '.join(suspects)}")
+            for name in suspects:
+                retry = measure(BENCHMARKS[name][0](), args.repeat)
+                result = current["benchmarks"][name]
+                if retry["ns_per_op"] / retry["calibration_ns"] < result["ns_per_op"] / result["calibration_ns"]:
+                    result.update(retry)
+            rows = compare(current, baseline, args.threshold)
+    if args.json:
+        write_json(args.json, current)
+    if args.save_baseline:
+        write_json(args.baseline, current)
+        print(f"\nБазовая линия записана: {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"\nБазовой линии нет ({args.baseline}) — запишите её: python -m utils.benchmarks --save-baseline")
+        return 0
+    print_comparison(rows, baseline)
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
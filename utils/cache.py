@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from utils.metrics import record_cache
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Ограниченный по числу записей кэш с вытеснением давно не использованных.
+    Попадания и промахи учитываются в метрике skillpath_cache_requests_total{cache=name}.
+    Рассчитан на event loop (без блокировок): get/put не уступают управление.
+    """
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            record_cache(self.name, False)
+            return default
+        self._data.move_to_end(key)
+        record_cache(self.name, True)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Удаляет записи, ключ которых подходит под predicate (без него — все). Возвращает число удалённых."""
+        if predicate is None:
+            count = len(self._data)
+            self._data.clear()
+            return count
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,75 @@
+from typing import Callable, Dict, List, Tuple
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.types import CallbackQuery
+
+from utils.tracing import set_handler_name
+
+# Формат callback_data: "prefix|field1|field2" (например, "main|3|3B")
+SEPARATOR = "|"
+# Старые кнопки в уже отправленных сообщениях используют ":" ("main:3:3B")
+LEGACY_SEPARATOR = ":"
+# Ограничение Telegram на длину callback_data в байтах
+MAX_CALLBACK_DATA_BYTES = 64
+
+# Префиксы callback_data
+MAIN_SCENE = "main"
+PERSONAL_SCENE = "personal"
+ARTIFACT_BRANCH = "artifact_branch"
+PORTAL = "portal"
+STATS_PAGE = "stats_page"
+
+
+def pack_callback(prefix: str, *fields) -> str:
+    """Упаковывает префикс и поля в callback_data с проверкой лимита в 64 байта."""
+    data = SEPARATOR.join([prefix, *(str(f) for f in fields)])
+    if len(data.encode("utf-8")) > MAX_CALLBACK_DATA_BYTES:
+        raise ValueError(f"callback_data длиннее {MAX_CALLBACK_DATA_BYTES} байт: {data}")
+    return data
+
+
+def unpack_callback(data: str) -> Tuple[str, List[str]]:
+    """Разбирает callback_data на префикс и список полей."""
+    if not data:
+        return "", []
+    separator = SEPARATOR if SEPARATOR in data else LEGACY_SEPARATOR
+    prefix, *fields = data.split(separator)
+    return prefix, fields
+
+
+# --- Таблица диспетчеризации: префикс -> обработчик ---
+CALLBACK_HANDLERS: Dict[str, CallableObject] = {}
+
+
+def callback_handler(*prefixes: str) -> Callable:
+    """
+    Регистрирует обработчик callback-запросов для указанных префиксов.
+    Обработчик получает те же аргументы, что и обычный хэндлер aiogram (state, bot, ...),
+    а префикс и разобранные поля callback_data — в аргументах callback_prefix и callback_args.
+    """
+    def decorator(func):
+        handler = CallableObject(func)
+        for prefix in prefixes:
+            if prefix in CALLBACK_HANDLERS:
+                raise ValueError(f"Префикс callback_data уже зарегистрирован: {prefix}")
+            CALLBACK_HANDLERS[prefix] = handler
+        return func
+    return decorator
+
+
+async def dispatch_callback(callback: CallbackQuery, **data):
+    """Единая точка входа: выбор обработчика по префиксу за один поиск в словаре."""
+    prefix, fields = unpack_callback(callback.data)
+    handler = CALLBACK_HANDLERS.get(prefix)
+    if handler is None:
+        raise SkipHandler()
+    set_handler_name(handler.callback.__name__)
+    data["callback_prefix"] = prefix
+    data["callback_args"] = fields
+    return await handler.call(callback, **data)
+
+
+callback_router = Router(name="callback_dispatch")
+callback_router.callback_query.register(dispatch_callback)
@@ -0,0 +1,86 @@
+"""
+Справочники контента (профили, профессии, артефакты) из data/catalog/*.json.
+Файл читается при первом обращении к таблице, а не при импорте модуля —
+импорт обработчиков и холодный старт не платят за разбор данных, которые могут не понадобиться.
+"""
+import json
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "catalog")
+
+_files: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def load_catalog_file(filename: str) -> Any:
+    """Разобранный JSON-файл каталога; читается один раз за процесс."""
+    data = _files.get(filename)
+    if data is None:
+        with _lock:
+            data = _files.get(filename)
+            if data is None:
+                with open(os.path.join(CATALOG_DIR, filename), encoding="utf-8") as f:
+                    data = _files[filename] = json.load(f)
+    return data
+
+
+class LazyTable(Mapping):
+    """Словарь только для чтения, данные которого загружаются при первом обращении."""
+
+    __slots__ = ("_filename", "_section", "_data")
+
+    def __init__(self, filename: str, section: Optional[str] = None):
+        self._filename = filename
+        self._section = section
+        self._data: Optional[dict] = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            data = load_catalog_file(self._filename)
+            self._data = data[self._section] if self._section else data
+        return self._data
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __contains__(self, key):
+        return key in self._load()
+
+    def get(self, key, default=None):
+        return self._load().get(key, default)
+
+    def __repr__(self):
+        state = "loaded" if self._data is not None else "not loaded"
+        return f"<LazyTable {self._filename}:{self._section or '*'} ({state})>"
+
+
+def reset_catalog() -> None:
+    """Сбрасывает загруженные файлы (для тестов и перечитывания контента)."""
+    with _lock:
+        _files.clear()
+    for table in (PROFILE_DESCRIPTIONS, PROFILE_EMOJIS, PROFILE_JOBS, RECOMMENDATION,
+                  PROFILE_TRANSLATIONS, KY_TO_RU_PROFILE, ARTIFACTS_BY_PROFESSION):
+        table._data = None
+
+
+# --- Профили ---
+PROFILE_DESCRIPTIONS = LazyTable("profiles.json", "descriptions")
+PROFILE_EMOJIS = LazyTable("profiles.json", "emojis")
+PROFILE_JOBS = LazyTable("profiles.json", "jobs")
+RECOMMENDATION = LazyTable("profiles.json", "recommendation")
+# Переводы названий профилей для локализации
+PROFILE_TRANSLATIONS = LazyTable("profiles.json", "translations")
+# Соответствие кыргызских и русских профилей
+KY_TO_RU_PROFILE = LazyTable("profiles.json", "ky_to_ru")
+
+# --- Артефакты по профессиям ---
+ARTIFACTS_BY_PROFESSION = LazyTable("artifacts.json")
@@ -0,0 +1,90 @@
+"""
+Замер времени холодного старта: стоимость импорта каждого модуля (по данным python -X importtime)
+для bot.py и API.
+
+    python utils/import_benchmark.py                  # bot и api.main, 5 прогонов
+    python utils/import_benchmark.py --cold           # без готового байткода (как в свежем контейнере)
+    python utils/import_benchmark.py --top 30 bot
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = ["bot", "api.main"]
+PROJECT_PACKAGES = ("bot", "config", "database", "handlers", "middlewares", "utils", "api")
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once(module: str, cold: bool) -> dict:
+    """Один прогон в отдельном процессе: {модуль: (self_us, cumulative_us)}."""
+    env = dict(os.environ)
+    env.setdefault("BOT_TOKEN", "0:benchmark")
+    with tempfile.TemporaryDirectory() as pycache:
+        if cold:
+            # пустой каталог байткода — каждый прогон компилирует исходники заново
+            env["PYTHONPYCACHEPREFIX"] = pycache
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"Импорт {module} завершился ошибкой:\n{result.stderr[-2000:]}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            timings[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return timings
+
+
+def is_project_module(name: str) -> bool:
+    return name.split(".")[0] in PROJECT_PACKAGES
+
+
+def benchmark(module: str, runs: int, cold: bool, top: int) -> None:
+    totals = []
+    self_times = defaultdict(list)
+    cumulative_times = defaultdict(list)
+    for _ in range(runs):
+        timings = run_once(module, cold)
+        totals.append(timings[module][1])
+        for name, (self_us, cumulative_us) in timings.items():
+            self_times[name].append(self_us)
+            cumulative_times[name].append(cumulative_us)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"\n=== import {module}: медиана {median_ms:.1f} мс "
+          f"(мин {min(totals) / 1000:.1f}, макс {max(totals) / 1000:.1f}, прогонов {runs}, "
+          f"{'холодный' if cold else 'с байткодом'}) ===")
+    project_total = sum(statistics.median(v) for k, v in self_times.items() if is_project_module(k))
+    print(f"собственное время модулей проекта: {project_total / 1000:.1f} мс")
+
+    print(f"\n{'модуль':<45} {'self, мс':>10} {'cumul, мс':>10}")
+    ranked = sorted(self_times, key=lambda k: statistics.median(self_times[k]), reverse=True)
+    for name in ranked[:top]:
+        marker = "*" if is_project_module(name) else " "
+        print(f"{marker}{name[:44]:<44} {statistics.median(self_times[name]) / 1000:>10.2f} "
+              f"{statistics.median(cumulative_times[name]) / 1000:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стоимость импорта модулей при старте")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--cold", action="store_true", help="без кэша байткода")
+    args = parser.parse_args()
+    for module in args.modules:
+        benchmark(module, args.runs, args.cold, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Нагрузочный прогон бота без сети и без MySQL.
+
+N виртуальных пользователей одновременно проходят полный путь: /test → регистрация →
+базовые сцены → персональная ветка → результат. Апдейты подаются в настоящий Dispatcher
+(Dispatcher.feed_update) со всеми обработчиками и middleware бота; ответы бота принимает
+фейковая сессия Telegram — она собирает запрос так же, как боевая (build_form_data),
+разбирает синтетический ответ через check_response и запоминает клавиатуры по чатам.
+Виртуальный пользователь каждый раз нажимает случайную кнопку из последней присланной ему сцены.
+
+База (--db sqlite): настоящие менеджеры database.py и их SQL поверх встроенной SQLite в памяти
+(utils.sqlite_backend). В отчёте — вызовы менеджеров и обращения к хранилищу на тест;
+--db-latency-ms — задержка каждого обращения, как сетевой round trip до MySQL.
+
+    python -m utils.load_test                               # 200 пользователей
+    python -m utils.load_test --users 2000 --concurrency 500
+    python -m utils.load_test --telegram-latency-ms 80 --db-latency-ms 2 --json load.json
+"""
+import os
+
+# config требует токен при импорте; сеть не используется
+os.environ.setdefault("BOT_TOKEN", "0:loadtest")
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import CallbackQuery, Chat, InlineKeyboardMarkup, Message, Update, User
+
+from config import settings
+from database import TestProgressManager, TestResultsManager, UserManager, db
+from utils.answer_log import answer_log
+from utils.persistence import persistence
+from utils.sqlite_backend import SQLiteBackend
+from utils.tracing import latency_report, percentile, reset_latencies
+
+logger = logging.getLogger(__name__)
+
+BOT_ID = 1
+SCENE_PREFIXES = ("main", "personal")
+
+
+# --- Фейковая сессия Telegram ---
+
+class FakeTelegramSession(AiohttpSession):
+    """
+    Сессия без сети: запрос сериализуется как в AiohttpSession, ответ синтезируется.
+    Для каждого чата хранится последнее отправленное/изменённое сообщение с клавиатурой.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.keyboards: Dict[int, tuple] = {}
+        self._message_ids = defaultdict(int)
+
+    async def make_request(self, bot, method, timeout=None):
+        self.build_form_data(bot=bot, method=method)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        name = type(method).__name__
+        self.calls[name] += 1
+        # методы вроде AnswerCallbackQuery возвращают True, отправка и правка — сообщение
+        result = True
+        if getattr(method, "chat_id", None) is not None:
+            chat_id = int(method.chat_id)
+            message_id = getattr(method, "message_id", None)
+            if message_id is None:
+                self._message_ids[chat_id] += 1
+                message_id = self._message_ids[chat_id]
+            markup = getattr(method, "reply_markup", None)
+            if isinstance(markup, InlineKeyboardMarkup):
+                buttons = [button.callback_data for row in markup.inline_keyboard for button in row
+                           if button.callback_data]
+                self.keyboards[chat_id] = (message_id, buttons)
+            result = {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": BOT_ID, "is_bot": True, "first_name": "SkillPath"},
+                "text": getattr(method, "text", None) or "",
+            }
+        response = self.check_response(bot=bot, method=method, status_code=200,
+                                       content=json.dumps({"ok": True, "result": result}))
+        return response.result
+
+    async def close(self) -> None:
+        pass
+
+
+# --- БД ---
+
+class SQLiteStore:
+    """
+    Настоящие менеджеры database.py поверх SQLite в памяти: прогон меряет тот же код, что работает в боте.
+    Вызовы менеджеров только считаются; install() возвращает корутину-функцию, которая всё возвращает назад.
+    """
+
+    COUNTED = {
+        UserManager: ("create_user", "get_user", "update_user"),
+        TestProgressManager: ("save_session", "append_answers", "get_progress", "delete_progress"),
+        TestResultsManager: ("save_result", "finalize_result", "get_user_results",
+                             "get_summary", "get_results_page", "get_latest_result"),
+    }
+
+    def __init__(self, latency: float = 0.0):
+        self.backend = SQLiteBackend(":memory:", latency)
+        self.calls: Counter = Counter()
+
+    async def install(self) -> Callable[[], Awaitable[None]]:
+        previous = db.use(self.backend)
+        await self.backend.connect()
+        for manager in (UserManager, TestProgressManager, TestResultsManager):
+            await manager.create_tables()
+        saved = []
+        for manager, names in self.COUNTED.items():
+            for name in names:
+                original = manager.__dict__[name]
+                saved.append((manager, name, original))
+                setattr(manager, name, staticmethod(self._count(f"{manager.__name__}.{name}", original.__func__)))
+
+        async def restore():
+            for manager, name, original in saved:
+                setattr(manager, name, original)
+            await self.backend.close()
+            db.use(previous)
+        return restore
+
+    def _count(self, label: str, method):
+        async def call(*args, **kwargs):
+            self.calls[label] += 1
+            return await method(*args, **kwargs)
+        return call
+
+    async def completed_tests(self) -> int:
+        row = await db.fetch_one("SELECT COUNT(DISTINCT telegram_id) AS users FROM test_results")
+        return row['users']
+
+
+DB_BACKENDS = {"sqlite": SQLiteStore}
+
+
+# --- Виртуальные пользователи ---
+
+class LoadTest:
+    def __init__(self, users: int, concurrency: int, think_time: float, telegram_latency: float,
+                 db: str, db_latency: float, seed: int):
+        self.users = users
+        self.concurrency = concurrency
+        self.think_time = think_time
+        self.random = random.Random(seed)
+        self.session = FakeTelegramSession(telegram_latency)
+        self.bot = Bot(token=os.environ["BOT_TOKEN"], session=self.session)
+        self.store = DB_BACKENDS[db](db_latency)
+        self.dispatcher = Dispatcher(storage=MemoryStorage())
+        self._update_ids = iter(range(1, 10 ** 12))
+        self.update_times: List[float] = []
+        self.completed = 0
+        self.failed: Counter = Counter()
+
+    def setup(self) -> None:
+        # импорт здесь: роутеры обработчиков подключаются к одному диспетчеру на процесс
+        from bot import register_handlers
+        from middlewares import register_middlewares, register_request_middlewares
+        # виртуальные пользователи не нажимают дважды — ограничение частоты только исказит замер
+        settings.THROTTLE_RATE_LIMIT = 10 ** 9
+        settings.THROTTLE_BURST = 10 ** 9
+        settings.THROTTLE_DEDUP_WINDOW = 0
+        register_middlewares(self.dispatcher)
+        register_request_middlewares(self.bot)
+        register_handlers(self.dispatcher)
+
+    async def feed(self, update: Update) -> None:
+        started = time.perf_counter()
+        await self.dispatcher.feed_update(self.bot, update)
+        self.update_times.append(time.perf_counter() - started)
+        if self.think_time:
+            await asyncio.sleep(self.random.uniform(0.5, 1.5) * self.think_time)
+
+    async def send_text(self, user: User, text: str) -> None:
+        chat = Chat(id=user.id, type="private")
+        message = Message(message_id=0, date=datetime.now(), chat=chat, from_user=user, text=text)
+        await self.feed(Update(update_id=next(self._update_ids), message=message))
+
+    async def click(self, user: User, message_id: int, data: str) -> None:
+        chat = Chat(id=user.id, type="private")
+        message = Message(message_id=message_id, date=datetime.now(), chat=chat,
+                          from_user=User(id=BOT_ID, is_bot=True, first_name="SkillPath"), text="")
+        callback = CallbackQuery(id=uuid.uuid4().hex, from_user=user, chat_instance=str(user.id),
+                                 message=message, data=data)
+        await self.feed(Update(update_id=next(self._update_ids), callback_query=callback))
+
+    async def run_user(self, telegram_id: int) -> None:
+        user = User(id=telegram_id, is_bot=False, first_name=f"user{telegram_id}", language_code="ru")
+        for text in ("/test", f"Ученик {telegram_id}", "Школа №1", "8", "А", "Мальчик", "2010", "Бишкек"):
+            await self.send_text(user, text)
+        # сцены: пока бот присылает клавиатуру сцены, выбираем случайный вариант
+        for _ in range(100):
+            message_id, buttons = self.session.keyboards.get(telegram_id, (0, []))
+            options = [data for data in buttons if data.split("|")[0] in SCENE_PREFIXES]
+            if not options:
+                break
+            self.session.keyboards.pop(telegram_id, None)
+            await self.click(user, message_id, self.random.choice(options))
+        else:
+            self.failed["endless_test"] += 1
+
+    async def run(self) -> float:
+        restore = await self.store.install()
+        answer_log.start()
+        reset_latencies()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def limited(telegram_id: int) -> None:
+            async with semaphore:
+                try:
+                    await self.run_user(telegram_id)
+                except Exception as e:
+                    self.failed[type(e).__name__] += 1
+                    logger.exception(f"Виртуальный пользователь {telegram_id}: {e}")
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(limited(100000 + i) for i in range(self.users)))
+            await persistence.drain()
+            await answer_log.stop()
+            elapsed = time.perf_counter() - started
+            # результат пишется в фоне, поэтому пройденные тесты считаются после drain()
+            self.completed = await self.store.completed_tests()
+        finally:
+            await restore()
+        return elapsed
+
+    def report(self, elapsed: float) -> dict:
+        tests = max(self.completed, 1)
+        ordered = sorted(self.update_times)
+        return {
+            "users": self.users,
+            "concurrency": self.concurrency,
+            "elapsed_s": round(elapsed, 2),
+            "updates": len(ordered),
+            "updates_per_s": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+            "tests_completed": self.completed,
+            "tests_per_s": round(self.completed / elapsed, 2) if elapsed else 0.0,
+            "failures": dict(self.failed),
+            "update_ms": {f"p{q}": round(percentile(ordered, q) * 1000, 2) for q in (50, 95, 99)},
+            "handlers": latency_report(),
+            "db_calls_per_test": {k: round(v / tests, 2) for k, v in sorted(self.store.calls.items())},
+            "db_round_trips_per_test": round(self.store.backend.round_trips / tests, 2),
+            "telegram_calls_per_test": {k: round(v / tests, 2) for k, v in sorted(self.session.calls.items())},
+        }
+
+
+def print_report(report: dict) -> None:
+    print(f"Пользователей {report['users']} (одновременно до {report['concurrency']}), "
+          f"{report['elapsed_s']} с")
+    print(f"Апдейтов {report['updates']} — {report['updates_per_s']}/с; "
+          f"тестов пройдено {report['tests_completed']} — {report['tests_per_s']}/с")
+    update_ms = report['update_ms']
+    print(f"Апдейт: p50 {update_ms['p50']} мс, p95 {update_ms['p95']} мс, p99 {update_ms['p99']} мс")
+    if report['failures']:
+        print(f"Сбои: {report['failures']}")
+    print("\nОбработчик                          count      p50      p95      p99 (мс)")
+    for handler, stats in sorted(report['handlers'].items(), key=lambda item: -item[1]['count']):
+        print(f"{handler:<32} {stats['count']:>8} {stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}")
+    print("\nВызовов БД на тест:")
+    for name, count in report['db_calls_per_test'].items():
+        print(f"    {name:<40} {count}")
+    print(f"    {'обращений к хранилищу':<40} {report['db_round_trips_per_test']}")
+    print("Запросов к Telegram на тест:")
+    for name, count in report['telegram_calls_per_test'].items():
+        print(f"    {name:<40} {count}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон бота без сети")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=None, help="одновременно активных (по умолчанию все)")
+    parser.add_argument("--think-ms", type=float, default=0, help="пауза пользователя между действиями")
+    parser.add_argument("--telegram-latency-ms", type=float, default=0, help="задержка каждого запроса к Telegram")
+    parser.add_argument("--db", choices=sorted(DB_BACKENDS), default="sqlite")
+    parser.add_argument("--db-latency-ms", type=float, default=0, help="задержка каждого обращения к БД")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=argparse.FileType("w", encoding="utf-8"), help="записать отчёт в JSON")
+    parser.add_argument("--verbose", action="store_true", help="логи бота (по умолчанию только ошибки)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    test = LoadTest(args.users, args.concurrency or args.users, args.think_ms / 1000,
+                    args.telegram_latency_ms / 1000, args.db, args.db_latency_ms / 1000, args.seed)
+    test.setup()
+    elapsed = asyncio.run(test.run())
+    report = test.report(elapsed)
+    print_report(report)
+    if args.json:
+        json.dump(report, args.json, ensure_ascii=False, indent=2)
+    return 0 if not report['failures'] and report['tests_completed'] == args.users else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import settings
+
+# Контекст текущего апдейта — подставляется в каждую запись лога
+user_id_var: ContextVar[Optional[int]] = ContextVar("user_id", default=None)
+update_id_var: ContextVar[Optional[int]] = ContextVar("update_id", default=None)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+# traceback форматируется до постановки в очередь — фрейм исключения в фоновый поток не уходит
+_traceback_formatter = logging.Formatter()
+
+
+class ContextFilter(logging.Filter):
+    """Добавляет user_id/update_id из contextvars в запись (выполняется в потоке вызывающего)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.user_id = user_id_var.get()
+        record.update_id = update_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Пропускает только каждую N-ю DEBUG-запись с одного места вызова."""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._counters = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        key = (record.pathname, record.lineno)
+        count = self._counters.get(key, 0)
+        self._counters[key] = count + 1
+        return count % self.every == 0
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler с ограниченной очередью: при переполнении запись отбрасывается, а не блокирует цикл."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Копия записи для очереди: аргументы подставлены в msg, traceback — текстом в exc_text.
+        В отличие от QueueHandler.prepare traceback не вклеивается в msg — форматтер выводит его отдельно.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Структурированные записи: одна JSON-строка на событие."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in ("user_id", "update_id"):
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # запись из очереди: traceback уже отформатирован в NonBlockingQueueHandler.prepare
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Настраивает логирование по Settings.LOG_LEVEL/LOG_FILE:
+    обработчики лога получают записи через очередь, запись на диск и в stdout — в фоновом потоке.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    if settings.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [user=%(user_id)s update=%(update_id)s] %(message)s"
+        )
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if settings.LOG_FILE:
+        handlers.append(logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSamplingFilter(settings.LOG_DEBUG_SAMPLE_EVERY))
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+    # aiogram пишет строку на каждый апдейт — это шум даже в DEBUG
+    logging.getLogger("aiogram.event").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Дописывает оставшиеся в очереди записи и останавливает фоновый поток."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
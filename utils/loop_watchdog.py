@@ -0,0 +1,100 @@
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+from typing import Counter, Optional
+
+from config import settings
+from utils.metrics import LOOP_BLOCKS, LOOP_LAG
+from utils.profiler import collapse_stack
+
+logger = logging.getLogger(__name__)
+
+# Сколько кадров стека сохранять в одном сэмпле
+MAX_STACK_DEPTH = 30
+
+
+class LoopWatchdog:
+    """
+    Сторож event loop.
+    Корутина-пульс просыпается каждые interval и меряет задержку цикла.
+    Фоновый поток следит за пульсом: если цикл не отвечает дольше порога,
+    он снимает стек потока event loop — это и есть код, который блокирует цикл.
+    Когда цикл оживает, длительность блокировки и самый частый стек уходят в метрики и лог.
+    """
+
+    def __init__(self, interval: Optional[float] = None, threshold: Optional[float] = None):
+        self.interval = interval if interval is not None else settings.LOOP_WATCHDOG_INTERVAL_MS / 1000
+        self.threshold = threshold if threshold is not None else settings.LOOP_BLOCK_THRESHOLD_MS / 1000
+        self.blocks = 0
+        self._last_beat = time.perf_counter()
+        self._loop_thread_id: Optional[int] = None
+        self._samples: Counter[str] = collections.Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Запуск из работающего event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        if self.threshold > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag = max(0.0, now - expected)
+            LOOP_LAG.set(lag)
+            if self.threshold > 0 and lag >= self.threshold:
+                self._report(lag)
+
+    def _watch(self) -> None:
+        # Сэмплируем чаще, чем бьётся пульс, чтобы поймать даже короткую блокировку
+        period = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(period):
+            stalled = time.perf_counter() - self._last_beat - self.interval
+            if stalled < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = collapse_stack(frame, MAX_STACK_DEPTH)
+            with self._lock:
+                self._samples[stack] += 1
+
+    def _report(self, lag: float) -> None:
+        with self._lock:
+            samples, self._samples = self._samples, collections.Counter()
+        self.blocks += 1
+        LOOP_BLOCKS.observe(lag)
+        if not samples:
+            logger.warning(f"Event loop заблокирован на {lag * 1000:.0f} мс (стек не снят)")
+            return
+        stack, hits = samples.most_common(1)[0]
+        frames = "\n".join(f"  {frame}" for frame in stack.split(";"))
+        logger.warning(
+            f"Event loop заблокирован на {lag * 1000:.0f} мс, "
+            f"сэмплов: {sum(samples.values())}, самый частый стек ({hits}):\n{frames}"
+        )
+
+
+watchdog = LoopWatchdog()
@@ -1,6 +1,6 @@
 import json
 from database import UserManager
-from utils.artifacts import ARTIFACTS_BY_PROFESSION
+from utils.catalog import ARTIFACTS_BY_PROFESSION, PROFILE_TRANSLATIONS
 
 MESSAGES = {
     "ru": {
@@ -35,6 +35,9 @@ MESSAGES = {
         "stats_details": "Детали",
         "stats_none": "У вас пока нет пройденных тестов.",
         "stats_separator": "---",
+        "stats_page": "Страница {page} из {pages}",
+        "stats_newer": "⬅️ Новее",
+        "stats_older": "Раньше ➡️",
         "goal_enter_title": "🎯 Введите название вашей цели:",
         "goal_title_empty": "❌ Название цели не может быть пустым. Введите название:",
         "goal_enter_description": "📝 Опишите вашу цель подробнее:",
@@ -108,6 +111,9 @@ MESSAGES = {
         "stats_details": "Деталдар",
         "stats_none": "Сизде тесттердин жыйынтыгы жок.",
         "stats_separator": "---",
+        "stats_page": "{pages} беттин {page}-бети",
+        "stats_newer": "⬅️ Жаңыраак",
+        "stats_older": "Мурунку ➡️",
         "goal_enter_title": "🎯 Максатыңыздын атын жазыңыз:",
         "goal_title_empty": "❌ Максаттын аты бош болбошу керек. Атын жазыңыз:",
         "goal_enter_description": "📝 Максатыңызды кеңири сүрөттөп бериңиз:",
@@ -192,20 +198,6 @@ BUTTONS = {
     }
 }
 
-# Словарь переводов профилей для статистики (можно расширять)
-PROFILE_TRANSLATIONS = {
-    "ru": {},  # Русские профили не переводим
-    "ky": {
-        "Техническая": "Техникалыk",
-        "Творческо-художественная": "Творчестволуk-өнөr",
-        "Гуманитарная": "Гуманитардыk",
-        "Социально-экономическая": "Социалдыk-экономикалыk",
-        "Прикладно-технологическая": "Колдонмо-технологиялыk",
-        "Естественно-научная": "Жаратылыш таанu",
-        # ... можно добавить остальные ...
-    }
-}
-
 def get_message(key, lang="ru", **kwargs):
     text = MESSAGES.get(lang, MESSAGES["ru"]).get(key, "")
     if kwargs:
@@ -220,25 +212,34 @@ def normalize_lang(lang):
         return "ru"
     return "ru"
 
-async def get_user_lang(user_id: int) -> str:
-    """Получить язык пользователя из базы по telegram_id. Возвращает 'ru' по умолчанию."""
-    user = await UserManager.get_user(user_id)
+def user_lang(user) -> str:
+    """Язык по уже загруженной строке пользователя. Возвращает 'ru' по умолчанию."""
     if user and user.get("language"):
-                    return normalize_lang(user.get("language", "ru"))
+        return normalize_lang(user.get("language", "ru"))
     return "ru"
 
-def format_test_stats(results, lang="ru"):
-    """Форматирует историю тестов мультиязычно, красиво и вдохновляюще."""
+async def get_user_lang(user_id: int) -> str:
+    """Получить язык пользователя из базы по telegram_id. Возвращает 'ru' по умолчанию."""
+    return user_lang(await UserManager.get_user(user_id))
+
+# Служебные поля details, которые в истории не показываются (журнал ответов раздувает сообщение)
+STATS_HIDDEN_DETAILS = frozenset({"answers", "scene_version"})
+
+def format_test_stats(summary, results, lang="ru", page=0, pages=1):
+    """
+    Форматирует историю тестов мультиязычно, красиво и вдохновляюще.
+    summary — число тестов по профилям (вся история), results — только текущая страница:
+    размер сообщения не зависит от длины истории.
+    """
     profile_tr = PROFILE_TRANSLATIONS.get(lang, {})
-    total_tests = len(results)
+    total_tests = sum(summary.values())
     profiles_counter = {}
-    for r in results:
-        profile = r.get('profile', '-')
+    for profile, tests in summary.items():
         profile_disp = profile_tr.get(profile, profile)
-        profiles_counter[profile_disp] = profiles_counter.get(profile_disp, 0) + 1
-    # --- Прогресс-бар по тестам ---
-    max_tests = 10 if total_tests < 10 else total_tests
-    progress_bar = f"{'🟩'*total_tests}{'⬜️'*(max_tests-total_tests)}"
+        profiles_counter[profile_disp] = profiles_counter.get(profile_disp, 0) + tests
+    # --- Прогресс-бар по тестам (до 10 клеток) ---
+    filled = min(total_tests, 10)
+    progress_bar = f"{'🟩'*filled}{'⬜️'*(10-filled)}"
     # --- Шапка ---
     if lang == 'ky':
         msg = [
@@ -303,6 +304,8 @@ def format_test_stats(results, lang="ru"):
                 details_dict = json.loads(details) if isinstance(details, str) else details
                 details_lines = []
                 for k, v in details_dict.items():
+                    if k in STATS_HIDDEN_DETAILS:
+                        continue
                     k_tr = profile_tr.get(k, k)
                     details_lines.append(f"• {k_tr}: {v}")
                 details_str = "\n".join(details_lines)
@@ -310,6 +313,8 @@ def format_test_stats(results, lang="ru"):
                 details_str = str(details)
             msg.append(f"<b>{MESSAGES[lang]['stats_details']}:</b>\n{details_str}")
     msg.append("<b>━━━━━━━━━━━━━━━━━━━━━━</b>")
+    if pages > 1:
+        msg.append(f"<i>{get_message('stats_page', lang, page=page + 1, pages=pages)}</i>")
     # --- Мотивация ---
     if lang == 'ky':
         msg.append("\n✨ <i>Ар бир тест — кыялга карай кадам! Порталдарды изилде, жаңы кесиптерди ач жана бардык артефакттарды чогулт. Сен туура жолдосуң!</i>")
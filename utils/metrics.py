@@ -0,0 +1,239 @@
+"""
+Лёгкий реестр метрик в текстовом формате Prometheus.
+Общий для бота и FastAPI: каждый процесс отдаёт свой экземпляр REGISTRY по /metrics.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, float] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, _format_labels(self.labelnames, key), value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Gauge; значение можно задавать вручную или вычислять при каждом scrape через callback."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 callback: Optional[Callable] = None):
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+
+    def set_function(self, callback: Callable) -> None:
+        """callback возвращает число либо словарь {кортеж значений меток: число}."""
+        self._callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        if self._callback is None:
+            yield from super().samples()
+            return
+        try:
+            result = self._callback()
+        except Exception as e:
+            logger.warning(f"Ошибка вычисления метрики {self.name}: {e}")
+            return
+        if isinstance(result, dict):
+            for key, value in result.items():
+                key = key if isinstance(key, tuple) else (key,)
+                yield self.name, _format_labels(self.labelnames, key), value
+        else:
+            yield self.name, "", result
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # ключ меток -> [счётчики по бакетам..., сумма, количество]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, key, le), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, state[-2]
+            yield f"{self.name}_count", labels, state[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика уже зарегистрирована: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- Метрики бота ---
+UPDATES_TOTAL = REGISTRY.counter("skillpath_updates_total", "Обработанные апдейты по типу", ("type",))
+HANDLER_LATENCY = REGISTRY.histogram(
+    "skillpath_handler_latency_seconds", "Время обработки апдейта по обработчику", ("handler",)
+)
+DB_POOL_CONNECTIONS = REGISTRY.gauge(
+    "skillpath_db_pool_connections", "Соединения пула БД: size/free/in_use/waiting", ("state",)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "skillpath_cache_requests_total", "Обращения к кэшам: hit/miss", ("cache", "result")
+)
+FSM_SESSIONS = REGISTRY.gauge("skillpath_fsm_sessions", "Активные FSM-сессии по состоянию", ("state",))
+TELEGRAM_IN_FLIGHT = REGISTRY.gauge(
+    "skillpath_telegram_requests_in_flight", "Исходящие запросы к Telegram API в обработке"
+)
+LOOP_LAG = REGISTRY.gauge("skillpath_event_loop_lag_seconds", "Задержка event loop при последнем замере")
+LOOP_BLOCKS = REGISTRY.histogram(
+    "skillpath_event_loop_block_seconds", "Блокировки event loop дольше порога",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+TELEGRAM_IN_FLIGHT.set(0)
+LOOP_LAG.set(0)
+SCENE_RELOADS = REGISTRY.counter(
+    "skillpath_scene_reloads_total", "Горячие перезагрузки каталога сцен", ("result",)
+)
+BACKGROUND_WRITES = REGISTRY.counter(
+    "skillpath_background_writes_total", "Фоновые записи в БД: ok/retry/failed", ("job", "result")
+)
+TEST_EARLY_STOPS = REGISTRY.counter(
+    "skillpath_test_early_stops_total", "Персональные ветки, завершённые досрочно (адаптивный режим)", ("branch",)
+)
+TEST_SCENES_SKIPPED = REGISTRY.counter(
+    "skillpath_test_scenes_skipped_total", "Сцены, не показанные благодаря досрочному завершению", ("branch",)
+)
+
+# --- Метрики FastAPI ---
+API_REQUESTS = REGISTRY.counter("skillpath_api_requests_total", "Запросы к API", ("method", "path", "status"))
+API_LATENCY = REGISTRY.histogram("skillpath_api_latency_seconds", "Время обработки запроса API", ("path",))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def register_fsm_metrics(storage) -> None:
+    """Число FSM-сессий по состояниям (для MemoryStorage)."""
+    def collect():
+        counts: Dict[tuple, int] = {}
+        records = getattr(storage, "storage", {})
+        for record in list(records.values()):
+            state = record.state or "none"
+            counts[(state,)] = counts.get((state,), 0) + 1
+        return counts
+    FSM_SESSIONS.set_function(collect)
+
+
+async def start_metrics_server(host: str, port: int):
+    """HTTP-сервер /metrics внутри процесса бота (aiohttp уже есть в зависимостях aiogram)."""
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Метрики доступны на http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,266 @@
+"""
+Пространство исходов персональных веток.
+
+Персональная ветка — фиксированная цепочка из 11 сцен по 4–10 вариантов, а итог теста
+(первое место среди профессий с артефактом) зависит только от ответов в ветке: базовые сцены
+начисляют баллы направлениям, а не профессиям. Поэтому все пути можно перебрать офлайн —
+не по одному (их ~10 млн на ветку), а по различным векторам баллов на каждом шаге.
+
+Анализатор для каждого языка и ветки считает:
+  * распределение исходов — сколько путей ответов дают каждую профессию;
+  * недостижимые артефакты — профессии ветки, которые не выходят на первое место ни на одном пути;
+  * таблицу «состояние → гарантированный итог»: состояния (номер шага + баллы профессий ветки),
+    из которых любое продолжение даёт один и тот же итог. Адаптивный режим теста
+    (settings.ADAPTIVE_TEST) по ней завершает ветку в момент, когда итог уже известен.
+
+    python -m utils.outcome_space                    # анализ, отчёт и сборка таблицы
+    python -m utils.outcome_space --check            # только отчёт
+    python -m utils.outcome_space --report out.json  # отчёт ещё и в JSON
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.artifact_registry import get_artifact_registry
+from utils.scene_bundle import LANGS, SCENES_DIR, sources_hash
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES_PATH = SCENES_DIR / "outcomes.json"
+# итог «ни одной профессии с баллами» и «итог ещё не определён»
+NO_OUTCOME = -1
+MIXED = -2
+
+
+def branch_categories() -> Dict[str, str]:
+    """Ветка (категория сцен) -> имя профиля, по которому SceneManager её выдаёт."""
+    from utils.scene_manager import BRANCH_CATEGORIES
+    categories = {}
+    for profile_name, category in BRANCH_CATEGORIES.items():
+        categories.setdefault(category, profile_name)
+    return categories
+
+
+def analyze_branch(lang: str, category: str) -> Dict:
+    """Перебор всех путей ответов одной ветки (выполняется в отдельном процессе)."""
+    from utils.scene_manager import SceneManager
+    from utils.scoring import get_scoring_model
+
+    model = get_scoring_model(lang)
+    scenes = SceneManager(language=lang).get_personal_scenes_by_branch(branch_categories()[category])
+    # профессии, которых касается ветка, в порядке id модели: так же top_k разрешает равенство
+    indexes = sorted({i for scene in scenes for ix, _ in model.scene_options.get(scene['id'], ()) for i in ix})
+    position = {index: k for k, index in enumerate(indexes)}
+    candidates = set(model.artifact_ids)
+    artifact_positions = [k for k, index in enumerate(indexes) if index in candidates]
+    options = []
+    for scene in scenes:
+        choices = []
+        for option in scene['options']:
+            entry = model.options.get((scene['id'], str(option['id'])))
+            choices.append(tuple((position[i], w) for i, w in zip(*entry)) if entry else ())
+        options.append(choices)
+
+    def apply(state, gains):
+        values = list(state)
+        for k, weight in gains:
+            values[k] += weight
+        return tuple(values)
+
+    def top(state) -> int:
+        best, best_score = NO_OUTCOME, 0
+        for k in artifact_positions:
+            if state[k] > best_score:
+                best, best_score = k, state[k]
+        return best
+
+    # вперёд: достижимые состояния каждого шага и число путей в каждое
+    root = tuple([0] * len(indexes))
+    levels: List[Dict[tuple, int]] = [{root: 1}]
+    for choices in options:
+        following: Dict[tuple, int] = {}
+        for state, paths in levels[-1].items():
+            for gains in choices:
+                child = apply(state, gains)
+                following[child] = following.get(child, 0) + paths
+        levels.append(following)
+
+    # назад: итог каждого состояния или MIXED, если продолжения расходятся
+    def mark_children(level, state, following):
+        # ребёнок с уже определённым итогом — первая точка остановки для путей через state
+        if level + 1 < len(options):
+            for gains in options[level]:
+                child = apply(state, gains)
+                if following[child] != MIXED:
+                    settled[f"{level + 1}|{','.join(map(str, child))}"] = following[child]
+
+    outcome = {state: top(state) for state in levels[-1]}
+    settled: Dict[str, int] = {}
+    settled_prefixes = [0] * len(options) + [sum(levels[-1].values())]
+    for level in range(len(options) - 1, -1, -1):
+        current, following = {}, outcome
+        for state in levels[level]:
+            results = {following[apply(state, gains)] for gains in options[level]}
+            current[state] = results.pop() if len(results) == 1 else MIXED
+            if current[state] == MIXED:
+                mark_children(level, state, following)
+        settled_prefixes[level] = sum(paths for state, paths in levels[level].items() if current[state] != MIXED)
+        if level == 0 and current[root] != MIXED:
+            # у ветки один итог при любых ответах: останавливаемся после первого же
+            mark_children(0, root, following)
+        outcome = current
+
+    names = [model.names[index] for index in indexes]
+    distribution: Dict[str, int] = {}
+    for state, paths in levels[-1].items():
+        result = top(state)
+        name = names[result] if result != NO_OUTCOME else "-"
+        distribution[name] = distribution.get(name, 0) + paths
+    total = settled_prefixes[-1]
+    # полных путей, итог которых известен после k ответов: префиксы шага k × число их продолжений
+    determined, tail = [0] * (len(options) + 1), 1
+    for level in range(len(options), -1, -1):
+        determined[level] = settled_prefixes[level] * tail
+        if level:
+            tail *= len(options[level - 1])
+    # останавливаемся не раньше первого ответа
+    determined[0] = 0
+    expected = sum(level * (determined[level] - determined[level - 1])
+                   for level in range(1, len(determined))) / total if total else 0
+    return {
+        "lang": lang,
+        "category": category,
+        "scenes": [scene['id'] for scene in scenes],
+        "professions": names,
+        "paths": total,
+        "states": sum(len(level) for level in levels),
+        "distribution": dict(sorted(distribution.items(), key=lambda item: -item[1])),
+        "unreachable": [names[k] for k in artifact_positions if names[k] not in distribution],
+        "expected_scenes": round(expected, 2),
+        "settled": {key: (names[value] if value != NO_OUTCOME else None) for key, value in settled.items()},
+    }
+
+
+# --- Таблица для бота ---
+
+class OutcomeTable:
+    """Состояния персональных веток с уже определённым итогом, собранные для одной версии сцен."""
+
+    def __init__(self, data: Dict):
+        self.version: str = data["version"]
+        self.branches: Dict[str, Dict[str, Dict]] = data["branches"]
+
+    def is_settled(self, model, lang: str, category: str, scene_ids: List[int], answered: int, vector) -> bool:
+        """Итог ветки известен после answered ответов при баллах vector (модель той же версии сцен)."""
+        branch = self.branches.get(lang, {}).get(category)
+        # ветка в сессии должна совпадать с той, что перебиралась
+        if branch is None or branch["scenes"] != scene_ids:
+            return False
+        ids = model.ids
+        values = [vector[ids[name]] if name in ids else 0 for name in branch["professions"]]
+        return f"{answered}|{','.join(map(str, values))}" in branch["settled"]
+
+
+_table: Optional[OutcomeTable] = None
+_table_checked = False
+_table_lock = threading.Lock()
+
+
+def get_outcome_table(version: Optional[str] = None) -> Optional[OutcomeTable]:
+    """
+    Таблица, если она собрана из текущих исходников сцен (читается и проверяется один раз).
+    Для сессии, начатой на другой версии сцен, — None.
+    """
+    global _table, _table_checked
+    if not _table_checked:
+        with _table_lock:
+            if not _table_checked:
+                _table = _load_table()
+                _table_checked = True
+    table = _table
+    if table is None or (version is not None and version != table.version):
+        return None
+    return table
+
+
+def _load_table(path: Path = OUTCOMES_PATH) -> Optional[OutcomeTable]:
+    try:
+        table = OutcomeTable(json.loads(path.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError) as e:
+        logger.warning(f"Таблица исходов {path} повреждена ({e}), не используется")
+        return None
+    if table.version != scenes_version():
+        logger.warning(f"Таблица исходов {path} собрана для сцен {table.version}, не используется")
+        return None
+    logger.info(f"Таблица исходов персональных веток загружена (версия сцен {table.version})")
+    return table
+
+
+def scenes_version() -> str:
+    # тот же отпечаток, что версия бандла сцен
+    return sources_hash().hex()[:12]
+
+
+# --- Отчёт ---
+
+def print_report(results: List[Dict]) -> None:
+    registry = get_artifact_registry()
+    for lang in LANGS:
+        reachable = set()
+        for result in (r for r in results if r["lang"] == lang):
+            reachable.update(result["distribution"])
+            print(f"\n[{lang}] {result['category']}: путей {result['paths']:,}, состояний {result['states']:,}, "
+                  f"в среднем до итога {result['expected_scenes']} из {len(result['scenes'])} сцен")
+            for name, paths in result["distribution"].items():
+                print(f"    {name:<40} {paths / result['paths']:7.2%}")
+            if result["unreachable"]:
+                print(f"    ⚠️  артефакты ветки недостижимы: {', '.join(result['unreachable'])}")
+        never = [artifact_id for artifact_id in registry.ids if artifact_id not in reachable]
+        print(f"\n[{lang}] артефактов в каталоге {len(registry)}, не выдаются ни в одной ветке: {len(never)}")
+        for artifact_id in never:
+            print(f"    {artifact_id} ({registry.localized(artifact_id, lang)['name']})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Перебор исходов персональных веток")
+    parser.add_argument("--check", action="store_true", help="только отчёт, таблицу не записывать")
+    parser.add_argument("--report", type=Path, help="записать отчёт (без таблицы состояний) в JSON")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    jobs = [(lang, category) for lang in LANGS for category in sorted(branch_categories())]
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(jobs)))) as pool:
+        results = list(pool.map(analyze_branch, *zip(*jobs)))
+    print_report(results)
+
+    if args.report:
+        report = [{k: v for k, v in result.items() if k != "settled"} for result in results]
+        args.report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if not args.check:
+        branches: Dict[str, Dict[str, Dict]] = {}
+        for result in results:
+            branches.setdefault(result["lang"], {})[result["category"]] = {
+                "scenes": result["scenes"],
+                "professions": result["professions"],
+                "settled": result["settled"],
+            }
+        tmp_path = OUTCOMES_PATH.with_name(OUTCOMES_PATH.name + ".tmp")
+        tmp_path.write_text(json.dumps({"version": scenes_version(), "branches": branches},
+                                       ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, OUTCOMES_PATH)
+        states = sum(len(result["settled"]) for result in results)
+        print(f"\nТаблица исходов: {OUTCOMES_PATH} ({states:,} состояний, "
+              f"{OUTCOMES_PATH.stat().st_size / 1024:.0f} КБ)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, Set
+
+from utils.metrics import BACKGROUND_WRITES
+
+logger = logging.getLogger(__name__)
+
+
+class PersistencePipeline:
+    """
+    Фоновые записи в БД, которые не должны задерживать ответ пользователю.
+    Задание — фабрика корутины (её можно вызвать повторно): при ошибке оно повторяется
+    с экспоненциальной паузой, после последней неудачи ошибка логируется и вызывается on_failure.
+    """
+
+    def __init__(self, attempts: int = 4, base_delay: float = 0.5):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, job: str, write: Callable[[], Awaitable], on_success: Optional[Callable] = None,
+               on_failure: Optional[Callable[[Exception], Awaitable]] = None) -> asyncio.Task:
+        task = asyncio.create_task(self._run(job, write, on_success, on_failure))
+        # держим ссылку до завершения, иначе задачу может собрать GC
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, job, write, on_success, on_failure) -> None:
+        for attempt in range(1, self.attempts + 1):
+            try:
+                result = await write()
+            except Exception as e:
+                if attempt < self.attempts:
+                    BACKGROUND_WRITES.inc(job=job, result="retry")
+                    logger.warning(f"Фоновая запись {job}: попытка {attempt} не удалась ({e}), повтор")
+                    await asyncio.sleep(self.base_delay * 2 ** (attempt - 1))
+                    continue
+                BACKGROUND_WRITES.inc(job=job, result="failed")
+                logger.error(f"Фоновая запись {job} не удалась после {attempt} попыток: {e}")
+                if on_failure is not None:
+                    await self._callback(job, on_failure, e)
+                return
+            BACKGROUND_WRITES.inc(job=job, result="ok")
+            if on_success is not None:
+                await self._callback(job, on_success, result)
+            return
+
+    @staticmethod
+    async def _callback(job, callback, value) -> None:
+        try:
+            await callback(value)
+        except Exception as e:
+            logger.error(f"Фоновая запись {job}: ошибка в обработчике результата: {e}")
+
+    async def drain(self, timeout: float = 10) -> None:
+        """Дожидается незавершённых записей (при остановке бота)."""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+
+
+persistence = PersistencePipeline()
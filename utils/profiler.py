@@ -0,0 +1,102 @@
+"""
+Сэмплирующий профайлер процесса по запросу.
+Пока профилирование не запущено, не существует ни потока, ни хуков — накладных расходов нет.
+Модуль не зависит от config, поэтому используется и ботом, и FastAPI.
+"""
+import collections
+import json
+import sys
+import threading
+import time
+from typing import Counter, Optional
+
+# Сколько кадров стека сохранять в одном сэмпле
+MAX_STACK_DEPTH = 64
+MAX_DURATION = 60.0
+DEFAULT_INTERVAL = 0.005
+FORMATS = ("collapsed", "speedscope")
+
+_running = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    """Профилирование уже идёт — одновременно допускается только одно."""
+
+
+def collapse_stack(frame, limit: int = MAX_STACK_DEPTH) -> str:
+    """Стек в формате collapsed-stack: кадры от внешнего к текущему через ';'."""
+    frames = []
+    while frame is not None and len(frames) < limit:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+def sample_stacks(duration: float, interval: float = DEFAULT_INTERVAL,
+                  thread_id: Optional[int] = None) -> Counter[str]:
+    """
+    Блокирующий сбор сэмплов в вызывающем потоке: раз в interval снимает стеки
+    всех потоков процесса (кроме своего) либо только потока thread_id.
+    """
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusy("Профилирование уже запущено")
+    try:
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks: Counter[str] = collections.Counter()
+        deadline = time.perf_counter() + min(duration, MAX_DURATION)
+        while time.perf_counter() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own_id or (thread_id is not None and ident != thread_id):
+                    continue
+                thread = names.get(ident, str(ident))
+                stacks[f"{thread};{collapse_stack(frame)}"] += 1
+            time.sleep(interval)
+        return stacks
+    finally:
+        _running.release()
+
+
+def to_collapsed(stacks: Counter[str]) -> str:
+    """Формат для flamegraph.pl / speedscope / inferno: 'кадр;кадр;кадр count'."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def to_speedscope(stacks: Counter[str], interval: float = DEFAULT_INTERVAL, name: str = "skillpath") -> str:
+    """Профиль в формате https://www.speedscope.app (тип sampled, веса в секундах)."""
+    frame_index = {}
+    frames = []
+    samples = []
+    weights = []
+    for stack, count in stacks.most_common():
+        indexes = []
+        for frame in stack.split(";"):
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                frames.append({"name": frame})
+            indexes.append(frame_index[frame])
+        samples.append(indexes)
+        weights.append(count * interval)
+    profile = {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+        "name": name,
+        "exporter": "skillpath-profiler",
+    }
+    return json.dumps(profile, ensure_ascii=False)
+
+
+def render_profile(stacks: Counter[str], fmt: str, interval: float = DEFAULT_INTERVAL) -> str:
+    if fmt == "speedscope":
+        return to_speedscope(stacks, interval)
+    return to_collapsed(stacks)
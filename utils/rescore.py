@@ -0,0 +1,254 @@
+"""
+Пересчёт сохранённых результатов теста (test_results) по текущему каталогу сцен.
+
+После правки весов в data/scenes профиль, балл и детализация старых результатов расходятся
+с моделью. Скрипт делит диапазон id на шарды и обрабатывает их в отдельных процессах:
+каждый читает строки порциями (keyset по id), пересчитывает баллы на векторах utils.scoring
+и пишет изменившиеся строки одним многострочным UPDATE в транзакции на порцию.
+После каждой порции шард сохраняет чекпоинт — прерванный запуск продолжается с места остановки.
+
+Результаты с записанными ответами (details.answers) пересчитываются по ответам;
+у старых строк есть только итоговые словари баллов — для них заново выбирается топ
+среди профессий текущего каталога (имён, которых больше нет, отбрасываются).
+
+    python -m utils.rescore                      # все строки, процессов по числу CPU
+    python -m utils.rescore --workers 8 --chunk 5000
+    python -m utils.rescore --dry-run            # только посчитать, сколько строк изменится
+    python -m utils.rescore --reset              # начать заново, забыв чекпоинты
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.catalog import ARTIFACTS_BY_PROFESSION
+from utils.scene_bundle import current_version, sources_hash
+from utils.scoring import get_scoring_model
+
+CHECKPOINT_DIR = Path(__file__).parent.parent / "data" / "rescore"
+DEFAULT_CHUNK = 2000
+
+SELECT_CHUNK = """
+SELECT id, profile, score, details FROM test_results
+WHERE id > %s AND id <= %s
+ORDER BY id
+LIMIT %s
+"""
+# многострочный UPDATE через JOIN с пачкой новых значений: один запрос на чанк,
+# строки, удалённые после чтения чанка, не создаются заново
+UPDATE_ROWS = """
+UPDATE test_results AS t JOIN ({rows}) AS rescored ON t.id = rescored.id
+SET t.profile = rescored.profile, t.score = rescored.score, t.details = rescored.details
+"""
+FIRST_ROW = "SELECT %s AS id, %s AS profile, %s AS score, %s AS details"
+NEXT_ROW = " UNION ALL SELECT %s, %s, %s, %s"
+
+
+def update_rows_query(count: int) -> str:
+    """UPDATE_ROWS для count строк (параметры — id, profile, score, details подряд)."""
+    return UPDATE_ROWS.format(rows=FIRST_ROW + NEXT_ROW * (count - 1))
+
+
+def rescore_details(details: Dict) -> Tuple[str, int, Dict]:
+    """Профиль, балл и детализация результата по текущей модели баллов."""
+    lang = details.get('lang') or 'ru'
+    model = get_scoring_model(lang)
+    answers = details.get('answers')
+    if answers:
+        scores = model.new_vector()
+        for scene_id, option_id in answers:
+            model.apply(scores, scene_id, option_id)
+    else:
+        scores = model.from_dict(details.get('profile_scores'), details.get('profession_scores'))
+    top = model.top_k(scores, 1, model.artifact_ids)
+    profession, score = top[0] if top else ("-", 0)
+    artifact = ARTIFACTS_BY_PROFESSION.get(profession, {})
+    artifact = artifact.get(lang) or artifact.get('ru')
+    details = dict(details)
+    details.update(
+        profile_scores=model.as_dict(scores, model.profile_ids),
+        profession_scores=model.as_dict(scores, model.profession_ids),
+        artifact=artifact['name'] if artifact else None,
+        scene_version=current_version(),
+    )
+    return profession, score, details
+
+
+def rescore_row(row: Dict) -> Optional[tuple]:
+    """Параметры UPDATE_ROWS для строки или None, если пересчёт ничего не меняет."""
+    try:
+        details = json.loads(row['details'] or '{}')
+    except ValueError:
+        return None
+    if not isinstance(details, dict):
+        return None
+    profile, score, new_details = rescore_details(details)
+    # версия каталога сама по себе не повод переписывать строку
+    compared = {k: v for k, v in new_details.items() if k != 'scene_version'}
+    if profile == row['profile'] and score == row['score'] and compared == {
+            k: v for k, v in details.items() if k != 'scene_version'}:
+        return None
+    return row['id'], profile, score, json.dumps(new_details, ensure_ascii=False)
+
+
+# --- Чекпоинты ---
+
+def checkpoint_path(shard: int) -> Path:
+    return CHECKPOINT_DIR / f"shard-{shard}.json"
+
+
+def read_json(path: Path) -> Optional[Dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_json(path: Path, value: Dict) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(value), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+# --- Работа шарда (в отдельном процессе) ---
+
+def connect():
+    # драйвер и параметры БД — только в процессах, которые ходят в базу
+    import pymysql
+    from database import db_params
+    return pymysql.connect(
+        host=db_params["host"], port=db_params["port"], user=db_params["user"],
+        password=db_params["password"], database=db_params["db"], charset="utf8mb4",
+        cursorclass=pymysql.cursors.DictCursor, autocommit=False,
+    )
+
+
+def run_shard(shard: int, low: int, high: int, chunk: int, dry_run: bool) -> Dict[str, int]:
+    """Пересчитывает строки с low < id <= high, продолжая с чекпоинта шарда."""
+    state = (None if dry_run else read_json(checkpoint_path(shard))) or {"last_id": low, "rows": 0, "changed": 0}
+    stats = {"rows": 0, "changed": 0}
+    conn = connect()
+    try:
+        last_id = state["last_id"]
+        while last_id < high:
+            with conn.cursor() as cursor:
+                cursor.execute(SELECT_CHUNK, (last_id, high, chunk))
+                rows = cursor.fetchall()
+            if not rows:
+                break
+            updates = [params for params in map(rescore_row, rows) if params is not None]
+            if updates and not dry_run:
+                with conn.cursor() as cursor:
+                    cursor.execute(update_rows_query(len(updates)),
+                                   [value for params in updates for value in params])
+                conn.commit()
+            else:
+                conn.rollback()
+            last_id = rows[-1]['id']
+            stats["rows"] += len(rows)
+            stats["changed"] += len(updates)
+            if not dry_run:
+                state.update(last_id=last_id, rows=state["rows"] + len(rows),
+                             changed=state["changed"] + len(updates))
+                write_json(checkpoint_path(shard), state)
+    finally:
+        conn.close()
+    return stats
+
+
+def rebuild_summary() -> None:
+    """Пересчёт меняет профили строк — сводка по профилям собирается заново одной транзакцией."""
+    from database import TestResultsManager
+    conn = connect()
+    try:
+        with conn.cursor() as cursor:
+            for query in TestResultsManager.SUMMARY_REBUILD:
+                cursor.execute(query)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# --- Планирование ---
+
+def split_ids(workers: int) -> List[Tuple[int, int, int]]:
+    """Диапазон id таблицы, разбитый на шарды (номер, id от, id до]."""
+    conn = connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT MIN(id) AS low, MAX(id) AS high FROM test_results")
+            bounds = cursor.fetchone()
+    finally:
+        conn.close()
+    if bounds["low"] is None:
+        return []
+    low, high = bounds["low"] - 1, bounds["high"]
+    step = max(1, -(-(high - low) // workers))
+    return [(i, start, min(start + step, high)) for i, start in enumerate(range(low, high, step))]
+
+
+def plan_shards(workers: int, reset: bool) -> List[Tuple[int, int, int]]:
+    """
+    Шарды с учётом прерванного запуска. План сохраняется вместе с версией каталога:
+    продолжить можно только тот же пересчёт, при смене сцен он начинается заново.
+    """
+    CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    manifest_path = CHECKPOINT_DIR / "manifest.json"
+    manifest = None if reset else read_json(manifest_path)
+    # отпечаток исходников, а не версия бандла: бандла может не быть
+    version = sources_hash().hex()
+    if manifest is not None and manifest.get("scene_version") != version:
+        print(f"Каталог сцен изменился ({manifest.get('scene_version')} → {version}), пересчёт начинается заново")
+        manifest = None
+    if manifest is not None:
+        return [tuple(shard) for shard in manifest["shards"]]
+
+    for path in CHECKPOINT_DIR.glob("shard-*.json"):
+        path.unlink()
+    shards = split_ids(workers)
+    write_json(manifest_path, {"scene_version": version, "shards": shards})
+    return shards
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Пересчёт test_results по текущим сценам")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="строк на чтение и транзакцию")
+    parser.add_argument("--dry-run", action="store_true", help="ничего не записывать")
+    parser.add_argument("--reset", action="store_true", help="игнорировать сохранённые чекпоинты")
+    args = parser.parse_args()
+
+    workers = max(1, args.workers)
+    # пробный прогон не трогает чекпоинты незавершённого пересчёта
+    shards = split_ids(workers) if args.dry_run else plan_shards(workers, args.reset)
+    if not shards:
+        print("test_results пуста")
+        return 0
+    started = time.perf_counter()
+    totals = {"rows": 0, "changed": 0}
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        futures = {pool.submit(run_shard, shard, low, high, args.chunk, args.dry_run): shard
+                   for shard, low, high in shards}
+        for future in as_completed(futures):
+            stats = future.result()
+            print(f"шард {futures[future]}: строк {stats['rows']}, изменено {stats['changed']}")
+            for key in totals:
+                totals[key] += stats[key]
+    elapsed = time.perf_counter() - started
+    print(f"Готово за {elapsed:.1f} с: строк {totals['rows']}, "
+          f"{'изменилось бы' if args.dry_run else 'обновлено'} {totals['changed']}")
+    if not args.dry_run:
+        if totals["changed"]:
+            rebuild_summary()
+            print("Сводка test_result_summary пересобрана")
+        for path in CHECKPOINT_DIR.glob("*.json"):
+            path.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
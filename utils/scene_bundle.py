@@ -0,0 +1,311 @@
+"""
+Предкомпилированный бандл сцен.
+
+Все файлы data/scenes/{lang}/{category}_{lang}.json собираются в один бинарный файл:
+сцены уже с подставленным родом (отдельно для male/female) и таблицы весов опция → профессия.
+Бот отображает бандл в память (mmap) — несколько процессов делят одну копию в page cache,
+а каждая выборка декодирует только нужный кусок без чтения и разбора исходного JSON.
+
+Формат (little-endian):
+    заголовок: magic "SPSB", версия формата (u16), резерв (u16),
+               sha256 исходников (32 байта), sha256 полезной нагрузки (32 байта), длина индекса (u32)
+    индекс:    JSON {ключ: [смещение, длина]} — смещения от начала блока данных
+    данные:    компактный JSON каждой записи
+
+Если бандл отсутствует, повреждён или собран из других исходников, SceneManager
+читает JSON напрямую. Сборка с проверкой контента: python -m utils.scene_compiler
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCENES_DIR = Path(__file__).parent.parent / "data" / "scenes"
+BUNDLE_PATH = SCENES_DIR / "scenes.bundle"
+
+BUNDLE_MAGIC = b"SPSB"
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<4sHH32s32sI")
+
+LANGS = ("ru", "ky")
+GENDERS = ("male", "female")
+# Базовые сцены и ветки персональных сцен
+CATEGORIES = (
+    "base_scenes", "technical", "social_economic", "natural_science",
+    "applied_technology", "creative_art", "humanitarian",
+)
+
+FEMALE_VALUES = {"female", "девочка", "кыз", "girl"}
+_GENDER_PATTERN = re.compile(r"\{gender:([^}]*)\}")
+
+
+def normalize_gender(gender: Optional[str]) -> str:
+    """Пол пользователя ('девочка', 'кыз', ...) → 'male' / 'female'."""
+    return "female" if str(gender or "").strip().lower() in FEMALE_VALUES else "male"
+
+
+def genderize_text(text: str, gender: str) -> str:
+    """Подставляет род в шаблоны {gender:male|муж|жен} (и старый вид {gender:муж|жен})."""
+    if not text or "{gender:" not in text:
+        return text
+
+    def replace(match):
+        parts = match.group(1).split("|")
+        if len(parts) == 3 and parts[0] == "male":
+            parts = parts[1:]
+        if len(parts) < 2:
+            return parts[0]
+        return parts[1] if gender == "female" else parts[0]
+    return _GENDER_PATTERN.sub(replace, text)
+
+
+def genderize_scenes(scenes: List[Dict[str, Any]], gender: str) -> List[Dict[str, Any]]:
+    """Копия списка сцен с подставленным родом в заголовках, описаниях, вариантах и отзывах."""
+    result = []
+    for scene in scenes:
+        scene = dict(scene)
+        for field in ("title", "description"):
+            if isinstance(scene.get(field), str):
+                scene[field] = genderize_text(scene[field], gender)
+        options = []
+        for option in scene.get("options", []):
+            option = dict(option)
+            for field in ("text", "feedback"):
+                if isinstance(option.get(field), str):
+                    option[field] = genderize_text(option[field], gender)
+            options.append(option)
+        scene["options"] = options
+        result.append(scene)
+    return result
+
+
+def weight_table(scenes: List[Dict[str, Any]]) -> Dict[str, Dict[str, list]]:
+    """{id сцены: {id опции: [[профессия, вес], ...]}} — для подсчёта баллов без обхода сцен."""
+    table = {}
+    for scene in scenes:
+        table[str(scene.get("id"))] = {
+            str(option.get("id")): [[p.get("name"), p.get("weight", 1)] for p in option.get("profiles", [])]
+            for option in scene.get("options", [])
+        }
+    return table
+
+
+def source_path(lang: str, category: str, root: Path = SCENES_DIR) -> Path:
+    return root / lang / f"{category}_{lang}.json"
+
+
+def source_files(root: Path = SCENES_DIR) -> List[Path]:
+    return [source_path(lang, category, root) for lang in LANGS for category in CATEGORIES
+            if source_path(lang, category, root).exists()]
+
+
+def read_sources(root: Path = SCENES_DIR) -> Dict[Tuple[str, str], bytes]:
+    """Содержимое исходных файлов: {(язык, категория): байты}."""
+    return {
+        (lang, category): source_path(lang, category, root).read_bytes()
+        for lang in LANGS for category in CATEGORIES
+        if source_path(lang, category, root).exists()
+    }
+
+
+def digest_sources(sources: Dict[Tuple[str, str], bytes]) -> bytes:
+    """sha256 по именам и содержимому исходных файлов сцен."""
+    digest = hashlib.sha256()
+    for (lang, category), data in sorted(sources.items()):
+        digest.update(f"{lang}/{category}_{lang}.json".encode("utf-8") + b"\0")
+        digest.update(data)
+    return digest.digest()
+
+
+def sources_hash(root: Path = SCENES_DIR) -> bytes:
+    return digest_sources(read_sources(root))
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build_bundle(path: Path = BUNDLE_PATH, root: Path = SCENES_DIR,
+                 corpus: Optional[Dict[Tuple[str, str], list]] = None,
+                 source_digest: Optional[bytes] = None) -> Dict[str, int]:
+    """
+    Собирает бандл и атомарно заменяет файл (процессы, уже отобразившие старый файл, продолжают читать его).
+    corpus/source_digest — уже разобранные и проверенные исходники (см. utils.scene_compiler);
+    без них файлы читаются заново.
+    """
+    if corpus is None:
+        sources = read_sources(root)
+        source_digest = digest_sources(sources)
+        corpus = {key: json.loads(data) for key, data in sources.items()}
+
+    entries: Dict[str, list] = {}
+    chunks: List[bytes] = []
+    offset = 0
+
+    def add(key: str, value: Any) -> None:
+        nonlocal offset
+        data = _encode(value)
+        entries[key] = [offset, len(data)]
+        chunks.append(data)
+        offset += len(data)
+
+    for lang in LANGS:
+        # id сцены -> категория файла, чтобы искать сцену по id без перебора веток
+        scene_index: Dict[str, str] = {}
+        for category in CATEGORIES:
+            scenes = corpus.get((lang, category))
+            if scenes is None:
+                continue
+            if not isinstance(scenes, list) or not all(isinstance(x, dict) and "id" in x for x in scenes):
+                raise ValueError(f"{lang}/{category}: ожидается список сцен с полем id")
+            for gender in GENDERS:
+                add(f"scenes/{lang}/{gender}/{category}", genderize_scenes(scenes, gender))
+            add(f"weights/{lang}/{category}", weight_table(scenes))
+            for scene in scenes:
+                scene_index.setdefault(str(scene["id"]), category)
+        add(f"index/{lang}", scene_index)
+
+    index = _encode(entries)
+    payload = index + b"".join(chunks)
+    header = HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, 0, source_digest,
+                         hashlib.sha256(payload).digest(), len(index))
+    # уникальный временный файл: бандл одновременно собирают релоадеры всех процессов бота и компилятор
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return {"entries": len(entries), "bytes": HEADER.size + len(payload)}
+
+
+class SceneBundle:
+    """Отображённый в память бандл; записи декодируются при каждом обращении (вызывающий получает свою копию)."""
+
+    def __init__(self, mapped: mmap.mmap, index: Dict[str, list], data_start: int, version: str):
+        self._mmap = mapped
+        self._index = index
+        self._data_start = data_start
+        self._indexes: Dict[str, Dict[str, str]] = {}
+        # короткий отпечаток исходников — версия каталога сцен
+        self.version = version
+
+    @classmethod
+    def open(cls, path: Path = BUNDLE_PATH, root: Path = SCENES_DIR) -> Optional["SceneBundle"]:
+        """Бандл или None, если он отсутствует, повреждён или устарел относительно исходников."""
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                logger.warning(f"Бандл сцен пуст: {path}")
+                return None
+        try:
+            if len(mapped) < HEADER.size:
+                raise ValueError("файл короче заголовка")
+            magic, version, _, source_digest, payload_digest, index_length = HEADER.unpack_from(mapped, 0)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(f"неподдерживаемый формат {magic!r} v{version}")
+            if hashlib.sha256(memoryview(mapped)[HEADER.size:]).digest() != payload_digest:
+                raise ValueError("контрольная сумма не совпадает")
+            if source_digest != sources_hash(root):
+                raise ValueError("исходные JSON изменились после сборки")
+            index = json.loads(mapped[HEADER.size:HEADER.size + index_length])
+        except ValueError as e:
+            mapped.close()
+            logger.warning(f"Бандл сцен {path} не используется ({e}), читаю JSON")
+            return None
+        return cls(mapped, index, HEADER.size + index_length, source_digest.hex()[:12])
+
+    def _read(self, key: str) -> Optional[Any]:
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        start = self._data_start + entry[0]
+        return json.loads(self._mmap[start:start + entry[1]])
+
+    def scenes(self, lang: str, gender: str, category: str) -> Optional[List[Dict[str, Any]]]:
+        return self._read(f"scenes/{lang}/{gender}/{category}")
+
+    def weights(self, lang: str, category: str) -> Optional[Dict[str, Dict[str, list]]]:
+        return self._read(f"weights/{lang}/{category}")
+
+    def scene_category(self, lang: str, scene_id) -> Optional[str]:
+        """Категория файла, в котором лежит сцена с данным id."""
+        index = self._indexes.get(lang)
+        if index is None:
+            index = self._indexes[lang] = self._read(f"index/{lang}") or {}
+        return index.get(str(scene_id))
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+# Текущий бандл и несколько предыдущих версий: сессии, начатые до перезагрузки контента,
+# дочитывают сцены из своей версии
+MAX_PINNED_VERSIONS = 5
+_bundle: Optional[SceneBundle] = None
+_bundle_checked = False
+_versions: "OrderedDict[str, SceneBundle]" = OrderedDict()
+_bundle_lock = threading.Lock()
+
+
+def _install(bundle: SceneBundle) -> None:
+    global _bundle
+    _versions[bundle.version] = bundle
+    _versions.move_to_end(bundle.version)
+    while len(_versions) > MAX_PINNED_VERSIONS:
+        # не закрываем явно: старую версию может читать другой поток, mmap закроется вместе с объектом
+        _versions.popitem(last=False)
+    _bundle = bundle
+
+
+def get_bundle(version: Optional[str] = None) -> Optional[SceneBundle]:
+    """Бандл указанной версии (если ещё хранится) либо текущий; открывается и проверяется один раз."""
+    global _bundle_checked
+    if not _bundle_checked:
+        with _bundle_lock:
+            if not _bundle_checked:
+                bundle = SceneBundle.open()
+                _bundle_checked = True
+                if bundle is not None:
+                    _install(bundle)
+                    logger.info(f"Сцены загружаются из бандла {BUNDLE_PATH} (версия {bundle.version})")
+    if version is not None:
+        pinned = _versions.get(version)
+        if pinned is not None:
+            return pinned
+    return _bundle
+
+
+def current_version() -> Optional[str]:
+    """Версия каталога сцен, которую получит новая сессия (None — чтение напрямую из JSON)."""
+    bundle = get_bundle()
+    return bundle.version if bundle is not None else None
+
+
+def reload_bundle() -> SceneBundle:
+    """
+    Открывает заново собранный бандл и атомарно делает его текущим.
+    Если он не прошёл проверку, бросает исключение, а текущая версия остаётся в работе.
+    """
+    bundle = SceneBundle.open()
+    if bundle is None:
+        raise ValueError("собранный бандл не прошёл проверку")
+    with _bundle_lock:
+        _install(bundle)
+    return bundle
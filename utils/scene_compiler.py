@@ -0,0 +1,265 @@
+"""
+Компилятор сцен: проверяет весь корпус data/scenes (все языки и ветки) за один проход
+и собирает из него бандл, который загружает бот (utils.scene_bundle).
+
+Ошибки — контент, на котором бот сломается (битый JSON, нет обязательных полей, дубли id,
+нечисловые веса); с ними бандл не собирается. Предупреждения — расхождения контента
+(неизвестные профили, различия ru/ky, недостижимые сцены); с --strict они тоже считаются ошибками.
+
+    python -m utils.scene_compiler            # проверка и сборка бандла
+    python -m utils.scene_compiler --check    # только проверка
+    python -m utils.scene_compiler --strict   # предупреждения = ошибки
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.catalog import ARTIFACTS_BY_PROFESSION, PROFILE_TRANSLATIONS
+from utils.scene_bundle import (
+    BUNDLE_PATH, CATEGORIES, LANGS, SCENES_DIR, build_bundle, digest_sources, read_sources,
+)
+
+ALLOWED_PROFILES = {
+    'Исследователь', 'Аналитик', 'Творец', 'Технарь', 'Коммуникатор', 'Организатор',
+    'Визуальный художник', 'Цифровой художник', 'Писатель', 'Эколог', 'Ученый-естественник',
+    'Социолог', 'Историк', 'Психолог', 'Инженер-системотехник', 'Программист', 'Инженер данных',
+    'Робототехник', 'Инженер-конструктор', 'Электронщик', 'Программист-интерфейсов',
+    'Программист серверных систем', 'Системный инженер', 'Организатор мероприятий', 'Фасилитатор',
+    'PR-специалист', 'Маркетолог', 'Аналитик данных', 'Системный аналитик', 'Финансовый аналитик',
+    'Логик', 'Дизайнер пространства', 'Исполнительский художник'
+}
+
+SCENE_FIELDS = ('id', 'title', 'description', 'options')
+OPTION_FIELDS = ('id', 'text', 'profiles', 'next_scene_id', 'feedback')
+
+
+class SceneCompileError(ValueError):
+    """Контент сцен не прошёл проверку."""
+
+    def __init__(self, report: "CompileReport"):
+        super().__init__(f"ошибок в сценах: {len(report.errors)}; первая: {report.errors[0] if report.errors else '-'}")
+        self.report = report
+
+
+class CompileReport:
+    def __init__(self):
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    def error(self, where: str, message: str) -> None:
+        self.errors.append(f"{where}: {message}")
+
+    def warning(self, where: str, message: str) -> None:
+        self.warnings.append(f"{where}: {message}")
+
+    def ok(self, strict: bool = False) -> bool:
+        return not self.errors and not (strict and self.warnings)
+
+
+def allowed_profiles(lang: str, category: str) -> Optional[Set[str]]:
+    """
+    Допустимые имена в option.profiles. Базовые сцены начисляют баллы направлениям,
+    ветки — профессиям и артефактам. Для кыргызских веток словаря профессий нет — не проверяем.
+    """
+    branches_ky = PROFILE_TRANSLATIONS['ky']
+    if category == 'base_scenes':
+        return set(branches_ky) | (set(branches_ky.values()) if lang == 'ky' else set())
+    if lang == 'ru':
+        artifact_names = {a['ru']['name'] for a in ARTIFACTS_BY_PROFESSION.values() if 'ru' in a}
+        return ALLOWED_PROFILES | set(ARTIFACTS_BY_PROFESSION) | artifact_names
+    return None
+
+
+def _check_file(lang: str, category: str, scenes, report: CompileReport) -> None:
+    where = f"{lang}/{category}"
+    if not isinstance(scenes, list):
+        report.error(where, "файл должен содержать список сцен")
+        return
+    allowed = allowed_profiles(lang, category)
+    seen_ids = set()
+    for position, scene in enumerate(scenes):
+        if not isinstance(scene, dict):
+            report.error(where, f"элемент #{position} не является объектом сцены")
+            continue
+        scene_id = scene.get('id', f"#{position}")
+        scene_where = f"{where} сцена {scene_id}"
+        for field in SCENE_FIELDS:
+            if field not in scene:
+                report.error(scene_where, f"нет обязательного поля '{field}'")
+        if not isinstance(scene.get('id'), int):
+            report.error(scene_where, "id сцены должен быть целым числом")
+        elif scene_id in seen_ids:
+            report.error(scene_where, "дублирующийся id сцены")
+        seen_ids.add(scene_id)
+        options = scene.get('options')
+        if not isinstance(options, list) or not options:
+            report.error(scene_where, "нет вариантов ответа")
+            continue
+        option_ids = set()
+        for option in options:
+            option_id = option.get('id') if isinstance(option, dict) else None
+            option_where = f"{scene_where} опция {option_id}"
+            if not isinstance(option, dict):
+                report.error(scene_where, "вариант ответа не является объектом")
+                continue
+            for field in OPTION_FIELDS:
+                if field not in option:
+                    report.error(option_where, f"нет обязательного поля '{field}'")
+            if option_id in option_ids:
+                report.error(option_where, "дублирующийся id опции в сцене")
+            option_ids.add(option_id)
+            profiles = option.get('profiles', [])
+            if not isinstance(profiles, list):
+                report.error(option_where, "profiles должен быть списком")
+                continue
+            for profile in profiles:
+                if not isinstance(profile, dict) or not profile.get('name'):
+                    report.error(option_where, f"профиль без имени: {profile!r}")
+                    continue
+                weight = profile.get('weight', 1)
+                if not isinstance(weight, int) or isinstance(weight, bool):
+                    report.error(option_where, f"вес профиля '{profile['name']}' не целое число: {weight!r}")
+                if allowed is not None and profile['name'] not in allowed:
+                    report.warning(option_where, f"неизвестный профиль '{profile['name']}'")
+            report.stats['options'] += 1
+        report.stats['scenes'] += 1
+
+
+def _check_unique_ids(lang: str, files: Dict[str, list], report: CompileReport) -> None:
+    """id сцены уникален во всём языке: модель баллов хранит веса по (id сцены, id опции) без категории."""
+    owners: Dict[int, str] = {}
+    for category, scenes in files.items():
+        for scene_id in {s.get('id') for s in scenes if isinstance(s, dict) and isinstance(s.get('id'), int)}:
+            owner = owners.setdefault(scene_id, category)
+            if owner != category:
+                report.error(f"{lang}/{category} сцена {scene_id}", f"id сцены уже занят в {lang}/{owner}")
+
+
+def _check_reachability(lang: str, files: Dict[str, list], report: CompileReport) -> None:
+    """Переходы next_scene_id: ссылка на существующую сцену языка, все сцены файла достижимы с первой."""
+    all_ids = {s.get('id') for scenes in files.values() for s in scenes if isinstance(s, dict)}
+    for category, scenes in files.items():
+        by_id = {s.get('id'): s for s in scenes if isinstance(s, dict)}
+        if not by_id:
+            continue
+        for scene in by_id.values():
+            for option in scene.get('options') or []:
+                target = option.get('next_scene_id') if isinstance(option, dict) else None
+                if target is not None and target not in all_ids:
+                    report.warning(f"{lang}/{category} сцена {scene.get('id')}",
+                                   f"опция {option.get('id')} ведёт в несуществующую сцену {target}")
+        start = next(iter(by_id))
+        reachable, stack = {start}, [start]
+        while stack:
+            for option in by_id[stack.pop()].get('options') or []:
+                target = option.get('next_scene_id') if isinstance(option, dict) else None
+                if target in by_id and target not in reachable:
+                    reachable.add(target)
+                    stack.append(target)
+        unreachable = [sid for sid in by_id if sid not in reachable]
+        if unreachable:
+            report.warning(f"{lang}/{category}", f"сцены недостижимы из {start}: {unreachable}")
+
+
+def _check_parity(corpus: Dict[Tuple[str, str], list], report: CompileReport) -> None:
+    """ru и ky должны совпадать по структуре: те же сцены, опции и веса профилей."""
+    base_lang, other_langs = LANGS[0], LANGS[1:]
+    for category in CATEGORIES:
+        base = corpus.get((base_lang, category))
+        for lang in other_langs:
+            other = corpus.get((lang, category))
+            where = f"{lang}/{category}"
+            if base is None or other is None:
+                missing = base_lang if base is None else lang
+                if base is not None or other is not None:
+                    report.warning(where, f"нет файла для языка {missing}")
+                continue
+            if not isinstance(base, list) or not isinstance(other, list):
+                continue
+            base_scenes = {s.get('id'): s for s in base if isinstance(s, dict)}
+            other_scenes = {s.get('id'): s for s in other if isinstance(s, dict)}
+            if list(base_scenes) != list(other_scenes):
+                report.warning(where, f"сцены отличаются от {base_lang}: "
+                                      f"{list(base_scenes)} != {list(other_scenes)}")
+            for scene_id in base_scenes.keys() & other_scenes.keys():
+                base_options = _option_shape(base_scenes[scene_id])
+                other_options = _option_shape(other_scenes[scene_id])
+                if base_options != other_options:
+                    report.warning(f"{where} сцена {scene_id}",
+                                   f"варианты/веса отличаются от {base_lang}")
+
+
+def _option_shape(scene: dict) -> list:
+    return [
+        (str(o.get('id')), [p.get('weight', 1) for p in o.get('profiles') or [] if isinstance(p, dict)])
+        for o in scene.get('options') or [] if isinstance(o, dict)
+    ]
+
+
+def validate_corpus(corpus: Dict[Tuple[str, str], list], report: Optional[CompileReport] = None) -> CompileReport:
+    report = report or CompileReport()
+    for (lang, category), scenes in sorted(corpus.items()):
+        _check_file(lang, category, scenes, report)
+    for lang in LANGS:
+        files = {c: s for (l, c), s in corpus.items() if l == lang and isinstance(s, list)}
+        _check_unique_ids(lang, files, report)
+        _check_reachability(lang, files, report)
+    _check_parity(corpus, report)
+    return report
+
+
+def compile_scenes(root: Path = SCENES_DIR, bundle_path: Optional[Path] = BUNDLE_PATH,
+                   strict: bool = False) -> CompileReport:
+    """
+    Проверяет корпус и, если ошибок нет, собирает бандл (bundle_path=None — только проверка).
+    Проверяется и упаковывается одно и то же прочитанное содержимое файлов.
+    """
+    report = CompileReport()
+    sources = read_sources(root)
+    corpus = {}
+    for (lang, category), data in sources.items():
+        try:
+            corpus[(lang, category)] = json.loads(data)
+        except ValueError as e:
+            report.error(f"{lang}/{category}", f"некорректный JSON: {e}")
+    report.stats['files'] = len(sources)
+    validate_corpus(corpus, report)
+    if not report.ok(strict):
+        raise SceneCompileError(report)
+    if bundle_path is not None:
+        stats = build_bundle(bundle_path, root, corpus=corpus, source_digest=digest_sources(sources))
+        report.stats['bundle_bytes'] = stats['bytes']
+    return report
+
+
+def print_report(report: CompileReport) -> None:
+    for message in report.errors:
+        print(f"ОШИБКА  {message}")
+    for message in report.warnings:
+        print(f"ВНИМАНИЕ {message}")
+    stats = ", ".join(f"{k}: {v}" for k, v in report.stats.items())
+    print(f"Ошибок: {len(report.errors)}, предупреждений: {len(report.warnings)} ({stats})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Проверка и сборка сцен")
+    parser.add_argument("--check", action="store_true", help="только проверка, без сборки бандла")
+    parser.add_argument("--strict", action="store_true", help="предупреждения считаются ошибками")
+    args = parser.parse_args()
+    try:
+        report = compile_scenes(bundle_path=None if args.check else BUNDLE_PATH, strict=args.strict)
+    except SceneCompileError as e:
+        print_report(e.report)
+        return 1
+    print_report(report)
+    if not args.check:
+        print(f"Бандл собран: {BUNDLE_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from config import settings
+from utils.metrics import SCENE_RELOADS
+from utils.scene_bundle import reload_bundle, source_files
+from utils.scene_compiler import SceneCompileError, compile_scenes
+
+logger = logging.getLogger(__name__)
+
+
+class SceneReloader:
+    """
+    Горячая перезагрузка сцен без рестарта бота.
+    Фоновый поток раз в interval сверяет mtime/размер файлов data/scenes/*; при изменении
+    проверяет корпус, пересобирает бандл и атомарно делает его текущим.
+    Новые сессии получают новую версию, начатые — дочитывают свою (см. SceneManager.version).
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval if interval is not None else settings.SCENE_RELOAD_INTERVAL
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def snapshot() -> Dict[str, Tuple[int, int]]:
+        result = {}
+        for path in source_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            result[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        return result
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._snapshot = self.snapshot()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="scene-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            current = self.snapshot()
+            if current == self._snapshot:
+                continue
+            # непрошедший проверку контент повторять бессмысленно до следующей правки файлов,
+            # а после сбоя (I/O, гонка с другой сборкой) перезагрузка повторится на следующем тике
+            if self.reload() != "error":
+                self._snapshot = current
+
+    def reload(self) -> str:
+        """Результат перезагрузки, как в метрике: ok, invalid или error."""
+        try:
+            compile_scenes()
+            bundle = reload_bundle()
+        except SceneCompileError as e:
+            SCENE_RELOADS.inc(result="invalid")
+            errors = "\n".join(f"  {message}" for message in e.report.errors[:20])
+            logger.error(f"Сцены не перезагружены: контент не прошёл проверку, работает прежняя версия\n{errors}")
+            return "invalid"
+        except Exception as e:
+            SCENE_RELOADS.inc(result="error")
+            logger.error(f"Сцены не перезагружены, работает прежняя версия: {e}")
+            return "error"
+        SCENE_RELOADS.inc(result="ok")
+        logger.info(f"Каталог сцен перезагружен, версия {bundle.version}")
+        return "ok"
+
+
+scene_reloader = SceneReloader()
@@ -0,0 +1,206 @@
+"""
+Движок подсчёта баллов теста.
+
+Имена профилей и профессий при загрузке каталога сцен превращаются в целые id,
+веса каждого варианта ответа хранятся разреженно (id + вес), а баллы сессии — один
+массив array('i') фиксированной длины: клик — несколько сложений по индексу,
+топ-k — частичный отбор через heapq, без сортировки всего словаря.
+"""
+import heapq
+import logging
+from array import array
+from functools import cached_property, lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from utils.catalog import ARTIFACTS_BY_PROFESSION
+from utils.scene_bundle import CATEGORIES, get_bundle, weight_table
+
+BASE_CATEGORY = "base_scenes"
+
+logger = logging.getLogger(__name__)
+
+
+class ScoringModel:
+    """Интернированный словарь имён и разреженные веса вариантов ответа для одного языка и версии сцен."""
+
+    def __init__(self, weight_tables: Mapping[str, Mapping[str, Mapping[str, list]]], version: Optional[str] = None):
+        # версия каталога сцен, из которой построены веса (None — JSON без бандла)
+        self.version = version
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        # (id сцены, id опции) -> (индексы, веса)
+        self.options: Dict[Tuple[int, str], Tuple[array, array]] = {}
+        # id сцены -> веса всех её вариантов (для оценки, что ещё может дать оставшаяся часть теста)
+        self.scene_options: Dict[int, List[Tuple[array, array]]] = {}
+        self._bounds: Dict[int, Tuple[Dict[int, int], Dict[int, int]]] = {}
+        profile_ids, profession_ids = set(), set()
+        for category, table in weight_tables.items():
+            target = profile_ids if category == BASE_CATEGORY else profession_ids
+            for scene_id, options in table.items():
+                for option_id, profiles in options.items():
+                    indexes, weights = array("H"), array("i")
+                    for name, weight in profiles:
+                        if not name:
+                            continue
+                        index = self.intern(name)
+                        indexes.append(index)
+                        weights.append(int(weight))
+                        target.add(index)
+                    self.options[(int(scene_id), str(option_id))] = (indexes, weights)
+                    self.scene_options.setdefault(int(scene_id), []).append((indexes, weights))
+        # баллы базовых сцен — направления (профили), персональных — профессии
+        self.profile_ids = array("H", sorted(profile_ids))
+        self.profession_ids = array("H", sorted(profession_ids))
+
+    def intern(self, name: str) -> int:
+        """id имени (новое имя получает следующий свободный id)."""
+        index = self.ids.get(name)
+        if index is None:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+    def new_vector(self) -> array:
+        return array("i", bytes(4 * self.size))
+
+    def apply(self, vector: array, scene_id: int, option_id) -> bool:
+        """Добавляет веса выбранного варианта к баллам; False — вариант не найден в каталоге."""
+        entry = self.options.get((int(scene_id), str(option_id)))
+        if entry is None:
+            return False
+        indexes, weights = entry
+        for index, weight in zip(indexes, weights):
+            vector[index] += weight
+        return True
+
+    def ids_for(self, names: Iterable[str]) -> array:
+        """Индексы известных модели имён (например, профессий, для которых есть артефакт)."""
+        return array("H", sorted(self.ids[name] for name in names if name in self.ids))
+
+    def top_k(self, vector: array, k: int, candidates: Optional[Iterable[int]] = None) -> List[Tuple[str, int]]:
+        """k лучших имён с ненулевыми баллами; при равенстве — раньше встретившееся в каталоге."""
+        indexes = range(len(vector)) if candidates is None else candidates
+        best = heapq.nlargest(k, ((vector[i], -i) for i in indexes if vector[i] > 0))
+        return [(self.names[-negative], score) for score, negative in best]
+
+    def as_dict(self, vector: array, candidates: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """Ненулевые баллы в виде {имя: балл} — для сохранения и отображения."""
+        indexes = range(len(vector)) if candidates is None else candidates
+        return {self.names[i]: vector[i] for i in indexes if vector[i]}
+
+    def scene_bounds(self, scene_id: int) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Наибольшая и наименьшая прибавка каждому имени за ответ на сцену (по всем её вариантам;
+        вариант без имени даёт ему 0). Имена, которых сцена не касается, в словари не входят.
+        """
+        bounds = self._bounds.get(scene_id)
+        if bounds is None:
+            options = [dict(zip(indexes, weights)) for indexes, weights in self.scene_options.get(scene_id, ())]
+            high, low = {}, {}
+            for index in {index for gains in options for index in gains}:
+                gains = [option.get(index, 0) for option in options]
+                high[index], low[index] = max(gains), min(gains)
+            bounds = self._bounds[scene_id] = (high, low)
+        return bounds
+
+    def leader_settled(self, vector: array, remaining: Iterable[int], candidates: Iterable[int]) -> bool:
+        """
+        True, если первое место среди candidates (как его выберет top_k) уже не изменится
+        при любых ответах на сцены remaining: худший исход лидера выше лучшего исхода
+        каждого соперника (при равенстве — с учётом порядка каталога).
+        """
+        candidates = list(candidates)
+        best = self.top_k(vector, 1, candidates)
+        if not best:
+            return False
+        leader = self.ids[best[0][0]]
+        high, low = array("i", vector), array("i", vector)
+        for scene_id in remaining:
+            scene_high, scene_low = self.scene_bounds(int(scene_id))
+            for index, gain in scene_high.items():
+                high[index] += gain
+            for index, gain in scene_low.items():
+                low[index] += gain
+        floor = low[leader]
+        # top_k не выбирает нулевые баллы: лидер должен остаться положительным
+        if floor <= 0:
+            return False
+        for index in candidates:
+            if index != leader and (high[index] > floor or (high[index] == floor and index < leader)):
+                return False
+        return True
+
+    @cached_property
+    def artifact_ids(self) -> array:
+        """Профессии, за которые выдаётся артефакт, — кандидаты в топ результата."""
+        return self.ids_for(ARTIFACTS_BY_PROFESSION)
+
+    def from_dict(self, *score_dicts: Mapping[str, int]) -> array:
+        """Вектор из словарей баллов (прогресс в старом формате); имён, которых нет в каталоге, не учитываем."""
+        vector = self.new_vector()
+        for scores in score_dicts:
+            for name, score in (scores or {}).items():
+                index = self.ids.get(name)
+                if index is not None:
+                    vector[index] += int(score)
+        return vector
+
+    def session_vector(self, data: Mapping) -> array:
+        """
+        Копия вектора баллов из данных FSM; для сессий, начатых со словарями баллов, — собранный из них.
+        Вектор сессии другой версии сцен (её версия больше не хранится) пересчитывается по ответам:
+        индексы имён в другой модели могут не совпадать, даже если длина та же.
+        """
+        scores = data.get('scores')
+        if scores is None:
+            return self.from_dict(data.get('profile_scores'), data.get('profession_scores'))
+        same_model = data.get('scene_version') == self.version or 'answers' not in data
+        if same_model and len(scores) == self.size:
+            return array("i", scores)
+        logger.debug(f"Баллы сессии версии {data.get('scene_version')} пересчитаны по ответам "
+                     f"для модели версии {self.version}")
+        vector = self.new_vector()
+        for scene_id, option_id in data.get('answers') or ():
+            self.apply(vector, scene_id, option_id)
+        return vector
+
+
+def _weight_tables(lang: str, version: Optional[str]) -> Dict[str, Mapping[str, Mapping[str, list]]]:
+    bundle = get_bundle(version)
+    if bundle is not None and bundle.version != version:
+        # версию вытеснили между выбором и сборкой: исключение lru_cache не запоминает
+        raise LookupError(f"версия сцен {version} больше не хранится")
+    tables = {}
+    for category in CATEGORIES:
+        table = bundle.weights(lang, category) if bundle is not None else None
+        if table is None:
+            # без бандла — из JSON (импорт здесь: scene_manager сам зависит от бандла)
+            from utils.scene_manager import SceneManager
+            try:
+                table = weight_table(SceneManager(language=lang, version=version)._load_scenes_file(category))
+            except FileNotFoundError:
+                continue
+        tables[category] = table
+    return tables
+
+
+@lru_cache(maxsize=16)
+def _build_model(lang: str, version: Optional[str]) -> ScoringModel:
+    return ScoringModel(_weight_tables(lang, version), version)
+
+
+def get_scoring_model(lang: str, version: Optional[str] = None) -> ScoringModel:
+    """
+    Модель для языка и версии каталога сцен (строится один раз).
+    Версия, которая больше не хранится, заменяется текущей; в кэше модель лежит под версией,
+    из которой построена.
+    """
+    bundle = get_bundle(version)
+    try:
+        return _build_model(lang, bundle.version if bundle is not None else None)
+    except LookupError:
+        return get_scoring_model(lang)
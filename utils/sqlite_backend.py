@@ -0,0 +1,191 @@
+"""
+Встроенное хранилище SQLite для Database: локальные прогоны без MySQL, тесты и бенчмарки.
+
+Запросы менеджеров database.py написаны для MySQL — translate() переводит те конструкции
+диалекта, что в них встречаются: плейсхолдеры %s, INSERT IGNORE, ON DUPLICATE KEY UPDATE
+и VALUES(col), IF(), FOR UPDATE, AUTO_INCREMENT, индексы внутри CREATE TABLE; NOW() — функция
+соединения. Ошибки, которые менеджеры разбирают по коду MySQL (дубль ключа, существующие индекс и колонка),
+поднимаются как pymysql.err с тем же кодом.
+
+Соединение одно; транзакция держит его целиком, остальные запросы ждут её конца.
+latency — задержка каждого обращения к хранилищу (запрос, BEGIN, COMMIT), как сетевой round trip
+до MySQL; round_trips считает обращения — по нему видно, сколько экономят пакетная запись и кэши.
+"""
+import asyncio
+import re
+import sqlite3
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pymysql import err as mysql_errors
+
+from database import StorageBackend
+
+# DATETIME-колонки читаются как datetime, как из aiomysql (настройка модуля sqlite3 — на весь процесс)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+
+# Коды ошибок MySQL, которые проверяют менеджеры
+ER_DUP_FIELDNAME = 1060
+ER_DUP_KEYNAME = 1061
+ER_DUP_ENTRY = 1062
+ER_BAD_NULL = 1048
+
+_INDEX = re.compile(r",\s*(?:INDEX|KEY)\s+(\w+)\s*\(([^)]*)\)", re.I)
+_REWRITES = (
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.I), r"excluded.\1"),
+    (re.compile(r"\bIF\(", re.I), "IIF("),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), ""),
+    (re.compile(r"\b(?:BIG)?INT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+)
+
+
+@lru_cache(maxsize=256)
+def translate(query: str) -> Tuple[str, ...]:
+    """Запрос MySQL -> один или несколько операторов SQLite (индексы CREATE TABLE — отдельными)."""
+    sql = query
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+    table = re.match(r"\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", sql, re.I)
+    if table is None:
+        return (sql,)
+    indexes = [f"CREATE INDEX IF NOT EXISTS {name} ON {table.group(1)} ({columns})"
+               for name, columns in _INDEX.findall(sql)]
+    return (_INDEX.sub("", sql), *indexes)
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _dict_row(cursor, row) -> Dict:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _mysql_error(e: sqlite3.Error) -> Exception:
+    message = str(e)
+    if isinstance(e, sqlite3.IntegrityError):
+        code = ER_DUP_ENTRY if "UNIQUE" in message else ER_BAD_NULL
+        return mysql_errors.IntegrityError(code, message)
+    if "already exists" in message and "index" in message:
+        return mysql_errors.OperationalError(ER_DUP_KEYNAME, message)
+    if "duplicate column" in message:
+        return mysql_errors.OperationalError(ER_DUP_FIELDNAME, message)
+    return mysql_errors.OperationalError(0, message)
+
+
+class _Cursor:
+    """Курсор транзакции с интерфейсом aiomysql.DictCursor."""
+
+    def __init__(self, backend: "SQLiteBackend"):
+        self._backend = backend
+        self._cursor: Optional[sqlite3.Cursor] = None
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount if self._cursor is not None else -1
+
+    async def execute(self, query: str, params: tuple = None) -> int:
+        await self._backend.round_trip()
+        self._cursor = self._backend.run(query, params)
+        return self._cursor.rowcount
+
+    async def fetchone(self) -> Optional[Dict]:
+        return self._cursor.fetchone()
+
+    async def fetchall(self) -> List[Dict]:
+        return self._cursor.fetchall()
+
+
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, path: str = ":memory:", latency: float = 0.0):
+        self.path = path
+        self.latency = latency
+        self.round_trips = 0
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: автокоммит, как пул aiomysql; транзакции — явным BEGIN
+        self.conn = sqlite3.connect(self.path, detect_types=sqlite3.PARSE_DECLTYPES,
+                                    isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = _dict_row
+        self.conn.create_function("NOW", 0, _now)
+
+    async def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def pool_stats(self) -> Dict[tuple, int]:
+        busy = int(self._lock.locked())
+        return {("size",): 1, ("free",): 1 - busy, ("in_use",): busy}
+
+    async def round_trip(self) -> None:
+        self.round_trips += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def run(self, query: str, params: tuple = None) -> sqlite3.Cursor:
+        statement, *extra = translate(query)
+        try:
+            cursor = self.conn.execute(statement, params or ())
+            for follow_up in extra:
+                self.conn.execute(follow_up)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        return cursor
+
+    async def execute(self, query: str, params: tuple = None) -> int:
+        await self.round_trip()
+        async with self._lock:
+            return self.run(query, params).rowcount
+
+    async def execute_many(self, query: str, params_list: List[tuple]) -> int:
+        # в MySQL это одна многострочная вставка: один round trip, атомарно
+        await self.round_trip()
+        statement, = translate(query)
+        async with self._lock:
+            try:
+                self.conn.execute("BEGIN")
+                cursor = self.conn.executemany(statement, params_list)
+                self.conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                raise _mysql_error(e) from e
+            return cursor.rowcount
+
+    async def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
+        await self.round_trip()
+        async with self._lock:
+            return self.run(query, params).fetchone()
+
+    async def fetch_all(self, query: str, params: tuple = None) -> List[Dict]:
+        await self.round_trip()
+        async with self._lock:
+            return self.run(query, params).fetchall()
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Курсор внутри транзакции: commit при выходе, rollback при исключении"""
+        await self.round_trip()
+        async with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield _Cursor(self)
+                await self.round_trip()
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
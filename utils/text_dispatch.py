@@ -0,0 +1,53 @@
+from typing import Callable, Dict
+
+from aiogram import Router, F
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.types import Message
+
+from utils.messages import BUTTONS
+from utils.tracing import set_handler_name
+
+# --- Таблица диспетчеризации: нормализованный текст кнопки -> действие ---
+TEXT_ACTIONS: Dict[str, str] = {}
+# действие (ключ BUTTONS) -> обработчик
+TEXT_HANDLERS: Dict[str, CallableObject] = {}
+
+
+def normalize_button_text(text: str) -> str:
+    """Приводит текст кнопки к единому виду: без пробелов по краям, без вариационных селекторов эмодзи."""
+    return text.replace("\ufe0f", "").strip().casefold()
+
+
+def text_handler(action: str) -> Callable:
+    """
+    Регистрирует обработчик кнопки reply-клавиатуры.
+    action — ключ из BUTTONS; тексты кнопок берутся для всех языков сразу.
+    """
+    def decorator(func):
+        if action in TEXT_HANDLERS:
+            raise ValueError(f"Действие уже зарегистрировано: {action}")
+        TEXT_HANDLERS[action] = CallableObject(func)
+        for buttons in BUTTONS.values():
+            if action not in buttons:
+                continue
+            key = normalize_button_text(buttons[action])
+            if TEXT_ACTIONS.get(key, action) != action:
+                raise ValueError(f"Текст кнопки '{buttons[action]}' уже занят действием {TEXT_ACTIONS[key]}")
+            TEXT_ACTIONS[key] = action
+        return func
+    return decorator
+
+
+async def dispatch_text(message: Message, **data):
+    """Единая точка входа для кнопок: один поиск в словаре вместо цепочки фильтров."""
+    action = TEXT_ACTIONS.get(normalize_button_text(message.text))
+    if action is None:
+        raise SkipHandler()
+    handler = TEXT_HANDLERS[action]
+    set_handler_name(handler.callback.__name__)
+    return await handler.call(message, **data)
+
+
+text_router = Router(name="text_dispatch")
+text_router.message.register(dispatch_text, F.text)
@@ -0,0 +1,124 @@
+import math
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional
+
+from config import settings
+
+# Категории времени внутри апдейта
+DB = "db"
+TELEGRAM = "telegram"
+RENDER = "render"
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class Trace:
+    """Трассировка одного апдейта: общее время и разбивка по категориям (БД, Telegram API, рендеринг)."""
+
+    __slots__ = ("update_id", "update_type", "handler", "started", "duration", "totals", "spans")
+
+    def __init__(self, update_id: Optional[int] = None, update_type: str = "unknown"):
+        self.update_id = update_id
+        self.update_type = update_type
+        self.handler = "unhandled"
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.totals: Dict[str, float] = defaultdict(float)
+        # (категория, имя, смещение от начала, длительность)
+        self.spans: List[tuple] = []
+
+    def add(self, category: str, name: str, started: float, duration: float) -> None:
+        self.totals[category] += duration
+        if len(self.spans) < 200:
+            self.spans.append((category, name, started - self.started, duration))
+
+    def finish(self) -> float:
+        self.duration = time.perf_counter() - self.started
+        return self.duration
+
+    def as_dict(self) -> dict:
+        return {
+            "update_id": self.update_id,
+            "update_type": self.update_type,
+            "handler": self.handler,
+            "total_ms": _ms(self.duration),
+            "breakdown_ms": {k: _ms(v) for k, v in self.totals.items()},
+            "other_ms": _ms(max(0.0, self.duration - sum(self.totals.values()))),
+            "spans": [
+                {"category": c, "name": n, "offset_ms": _ms(o), "duration_ms": _ms(d)}
+                for c, n, o, d in self.spans
+            ],
+        }
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+class span:
+    """
+    Замер участка кода внутри текущего апдейта:
+        with span(DB, "fetch_one"):
+            ...
+    Без активной трассировки ничего не делает.
+    """
+
+    __slots__ = ("category", "name", "trace", "started")
+
+    def __init__(self, category: str, name: str = ""):
+        self.category = category
+        self.name = name
+
+    def __enter__(self):
+        self.trace = current_trace.get()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.trace is not None:
+            self.trace.add(self.category, self.name, self.started, time.perf_counter() - self.started)
+        return False
+
+
+def set_handler_name(name: str) -> None:
+    """Запоминает имя обработчика для текущего апдейта."""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.handler = name
+
+
+# --- Скользящие перцентили по обработчикам ---
+_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=settings.LATENCY_WINDOW))
+
+
+def record_latency(handler: str, seconds: float) -> None:
+    _latencies[handler].append(seconds)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Перцентиль по отсортированному списку (метод ближайшего ранга)."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+
+def latency_report() -> Dict[str, dict]:
+    """p50/p95/p99 (мс) по каждому обработчику за последние LATENCY_WINDOW апдейтов."""
+    report = {}
+    for handler, values in _latencies.items():
+        ordered = sorted(values)
+        report[handler] = {
+            "count": len(ordered),
+            "p50_ms": _ms(percentile(ordered, 50)),
+            "p95_ms": _ms(percentile(ordered, 95)),
+            "p99_ms": _ms(percentile(ordered, 99)),
+        }
+    return report
+
+
+def reset_latencies() -> None:
+    _latencies.clear()